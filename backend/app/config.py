@@ -233,6 +233,165 @@ class Settings(BaseSettings):
         ge=10,
         le=1000
     )
+    OPERATOR_SCOPE_CACHE_TTL_SECONDS: int = Field(
+        default=60,
+        description="How long a resolved operator scope (assigned districts) is cached per worker",
+        ge=0,
+        le=3600
+    )
+    OPERATOR_SCOPE_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        description="Maximum number of operator scopes cached per worker",
+        ge=1
+    )
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(
+        default=30,
+        description="How long an authenticated principal is cached; bounds how long a deactivated account stays usable on other workers",
+        ge=0,
+        le=600
+    )
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = Field(
+        default=4096,
+        description="Maximum number of principals cached per worker",
+        ge=1
+    )
+    PRINCIPAL_CACHE_REDIS_ENABLED: bool = Field(
+        default=False,
+        description="Share cached principals across workers through Redis"
+    )
+    LOG_QUEUE_MAX_SIZE: int = Field(
+        default=10000,
+        description="Maximum number of system log entries buffered in memory",
+        ge=100
+    )
+    LOG_BATCH_SIZE: int = Field(
+        default=200,
+        description="System log entries written per insert_many",
+        ge=1,
+        le=10000
+    )
+    LOG_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="Maximum delay before buffered system log entries are written",
+        gt=0,
+        le=60
+    )
+    LOG_QUEUE_OVERFLOW_POLICY: str = Field(
+        default="drop_oldest",
+        description="What to do when the log buffer is full: drop_oldest or block"
+    )
+
+    LOG_BODY_SAMPLE_BYTES: int = Field(
+        default=1024,
+        description="Maximum request body prefix captured by the request logging middleware (0 disables)",
+        ge=0,
+        le=65536
+    )
+    LOG_BODY_SAMPLE_RATE: float = Field(
+        default=1.0,
+        description="Fraction of POST/PUT/PATCH requests whose body prefix is logged",
+        ge=0.0,
+        le=1.0
+    )
+    FARMER_STATS_RECONCILE_INTERVAL_SECONDS: int = Field(
+        default=6 * 60 * 60,
+        description="How often Celery beat rebuilds the farmer_stats document from the farmers collection",
+        ge=60
+    )
+    REPORT_EXPORT_BATCH_SIZE: int = Field(
+        default=1000,
+        description="Farmers read per cursor batch (and written per chunk) by streaming report exports",
+        ge=10,
+        le=10000
+    )
+    REPORT_CACHE_TTL_SECONDS: int = Field(
+        default=300,
+        description="How long a cached report is served without recomputing (writes through the API invalidate it sooner)",
+        ge=0,
+        le=86400
+    )
+    REPORT_CACHE_STALE_SECONDS: int = Field(
+        default=3600,
+        description="How long an expired report is kept to be served, marked stale, if recomputing it fails",
+        ge=0,
+        le=86400
+    )
+    REPORT_CACHE_MAX_ENTRIES: int = Field(
+        default=256,
+        description="Maximum number of report results cached per worker",
+        ge=1
+    )
+    REPORT_CACHE_REDIS_ENABLED: bool = Field(
+        default=False,
+        description="Share cached reports and invalidations across workers through Redis"
+    )
+    REPORT_JOB_POLL_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="How often the report job event stream re-reads the job status",
+        ge=0.1,
+        le=60
+    )
+    REPORT_JOB_STREAM_TIMEOUT_SECONDS: int = Field(
+        default=600,
+        description="Maximum lifetime of a report job event stream (clients reconnect or poll after it)",
+        ge=10,
+        le=3600
+    )
+    REPORT_JOB_STALE_SECONDS: int = Field(
+        default=900,
+        description="A queued/running report job without a heartbeat for this long is failed, so identical requests start a new job",
+        ge=60,
+        le=86400
+    )
+
+    GEO_STORE_VERSION_CHECK_SECONDS: float = Field(
+        default=10.0,
+        description="How often each worker checks whether the geographic data version changed (0 = every request)",
+        ge=0,
+        le=3600
+    )
+    GEO_BOUNDARIES_PATH: Optional[str] = Field(
+        default=None,
+        description="GeoJSON file with district / chiefdom boundary polygons used to check farmer GPS (unset = no boundary checks)"
+    )
+    GEO_BOUNDARY_GRID_DEGREES: float = Field(
+        default=0.1,
+        description="Cell size of the in-memory boundary grid index, in degrees",
+        ge=0.01,
+        le=5
+    )
+    GEO_BOUNDARY_CHECK: str = Field(
+        default="enforce",
+        description="What to do when farmer GPS lies outside the chosen district/chiefdom: off, warn or enforce (reject)"
+    )
+    FARMER_GEO_MAX_RADIUS_KM: float = Field(
+        default=200.0,
+        description="Largest radius accepted by the farmers-near-a-point query",
+        gt=0,
+        le=2000
+    )
+    FARMER_GEO_MAX_RESULTS: int = Field(
+        default=1000,
+        description="Maximum farmers returned by one proximity (radius / polygon / bbox) query",
+        ge=1,
+        le=10000
+    )
+
+    @field_validator('GEO_BOUNDARY_CHECK')
+    @classmethod
+    def validate_geo_boundary_check(cls, v: str) -> str:
+        allowed = ['off', 'warn', 'enforce']
+        if v not in allowed:
+            raise ValueError(f"GEO_BOUNDARY_CHECK must be one of: {allowed}")
+        return v
+
+    @field_validator('LOG_QUEUE_OVERFLOW_POLICY')
+    @classmethod
+    def validate_log_overflow_policy(cls, v: str) -> str:
+        allowed = ['drop_oldest', 'block']
+        if v not in allowed:
+            raise ValueError(f"LOG_QUEUE_OVERFLOW_POLICY must be one of: {allowed}")
+        return v
 
 
     # ======================================
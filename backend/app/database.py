@@ -1,6 +1,8 @@
 # backend/app/database.py
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.config import settings
+from app.indexes import ensure_indexes
+from app.services.geo_custom_service import GeoCustomService
 from typing import Optional
 import logging
 
@@ -41,6 +43,20 @@ async def connect_to_database() -> None:
         await _database.command("ping")
         logger.info("✅ Successfully connected to MongoDB")
         
+        # Normalize legacy geo entries before their unique name indexes
+        try:
+            backfilled = await GeoCustomService(_database).backfill_name_keys()
+            if backfilled:
+                logger.info(f"✅ Backfilled name keys on {backfilled} geographic entries")
+        except Exception as e:
+            logger.error(f"❌ Failed to backfill geo name keys: {e}")
+        
+        # Apply declared indexes (idempotent) and report drift
+        try:
+            await ensure_indexes(_database)
+        except Exception as e:
+            logger.error(f"❌ Failed to ensure indexes: {e}")
+        
     except Exception as e:
         logger.error(f"❌ Failed to connect to MongoDB: {e}")
         raise
@@ -0,0 +1,122 @@
+# backend/app/dependencies/operator_scope.py
+"""
+Operator scope resolution for farmer endpoints.
+
+Operators may only see and register farmers in their assigned districts
+(plus the farmers they created themselves). The operator document that
+carries those assignments is resolved once per request by the
+get_operator_scope dependency (FastAPI caches dependency results within a
+request) and kept in a bounded TTL cache across requests.
+
+Usage:
+    from app.dependencies.operator_scope import get_operator_scope
+
+    @router.get("/farmers")
+    async def list_farmers(scope: dict = Depends(get_operator_scope)):
+        allowed_districts = scope["allowed_districts"]
+
+Any code that changes an operator's assignments must call
+invalidate_operator_scope(email) so this worker serves the new scope
+immediately; other workers pick it up within the cache TTL.
+"""
+
+from typing import Any, Dict, Optional
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config import settings
+from app.database import get_db
+from app.dependencies.roles import get_current_user
+from app.models.user import UserRole
+from app.utils.ttl_cache import TTLCache
+
+
+# Only the fields scope resolution needs are cached
+OPERATOR_SCOPE_PROJECTION = {
+    "_id": 0,
+    "operator_id": 1,
+    "email": 1,
+    "assigned_districts": 1,
+    "is_active": 1,
+}
+
+_operator_cache = TTLCache(
+    max_entries=settings.OPERATOR_SCOPE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.OPERATOR_SCOPE_CACHE_TTL_SECONDS,
+)
+
+
+# ============================================
+# Cache Management
+# ============================================
+async def load_operator(db: AsyncIOMotorDatabase, email: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the (projected) operator document for an email, via the cache.
+
+    Missing operators are not cached, so a newly created operator is
+    visible on the next request.
+    """
+    operator = _operator_cache.get(email)
+    if operator is None:
+        operator = await db.operators.find_one({"email": email}, OPERATOR_SCOPE_PROJECTION)
+        if operator is not None:
+            _operator_cache.set(email, operator)
+    return operator
+
+
+def invalidate_operator_scope(email: Optional[str] = None) -> None:
+    """
+    Drop a cached operator scope.
+
+    Args:
+        email: Operator email to invalidate (None clears the whole cache)
+    """
+    if email is None:
+        _operator_cache.clear()
+    else:
+        _operator_cache.invalidate(email)
+
+
+# ============================================
+# Scope Dependency
+# ============================================
+async def get_operator_scope(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Resolve the farmer visibility scope of the current user.
+
+    Returns:
+        dict with:
+        - is_operator: caller has the OPERATOR role
+        - restricted: caller is an operator without ADMIN (scope applies)
+        - operator: projected operator document (None if not an operator
+          or no operator record exists)
+        - allowed_districts: districts the caller may see (None = all)
+        - created_by: email whose created farmers are also visible (None = all)
+        - operator_id: operator_id to record as a farmer's creator (None if unknown)
+    """
+    roles = current_user.get("roles") or []
+    is_operator = UserRole.OPERATOR.value in roles
+    restricted = is_operator and UserRole.ADMIN.value not in roles
+    email = current_user.get("email")
+
+    operator = None
+    if is_operator and email:
+        operator = await load_operator(db, email)
+
+    scope = {
+        "is_operator": is_operator,
+        "restricted": restricted,
+        "operator": operator,
+        "allowed_districts": None,
+        "created_by": None,
+        "operator_id": operator.get("operator_id") if operator else None,
+    }
+    if restricted and operator:
+        # Operator: farmers in their assigned districts OR created by them.
+        # If no districts are assigned they still see what they created.
+        scope["allowed_districts"] = operator.get("assigned_districts", [])
+        scope["created_by"] = email
+    return scope
@@ -18,6 +18,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.utils.security import decode_token
 from app.database import get_db
 from app.models.user import UserInDB, UserRole
+from app.services.principal_cache import principal_cache
 
 
 # ============================================
@@ -34,15 +35,72 @@ security = HTTPBearer(
 # ============================================
 # Current User Extraction
 # ============================================
+# Farmer fields needed to construct a farmer principal
+_FARMER_PRINCIPAL_PROJECTION = {
+    "farmer_id": 1,
+    "is_active": 1,
+    "personal_info.email": 1,
+    "personal_info.first_name": 1,
+    "personal_info.last_name": 1,
+}
+
+
+async def _load_principal(db: AsyncIOMotorDatabase, subject: str) -> dict:
+    """
+    Load the principal for a token subject from MongoDB.
+    
+    Args:
+        db: MongoDB database instance
+        subject: Token subject (user email, or farmer_id for farmers)
+    
+    Returns:
+        dict: User document (without password_hash) or constructed farmer principal
+    
+    Raises:
+        HTTPException: 404 if the user or farmer does not exist
+    """
+    # If subject is not an email, assume it's a farmer_id
+    if "@" not in subject:
+        farmer = await db.farmers.find_one({"farmer_id": subject}, _FARMER_PRINCIPAL_PROJECTION)
+        if not farmer:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Farmer not found",
+            )
+        
+        # Construct a user-like dictionary for the farmer
+        return {
+            "_id": farmer["_id"],
+            "email": farmer.get("personal_info", {}).get("email"),
+            "roles": ["FARMER"],
+            "is_active": farmer.get("is_active", True),
+            "farmer_id": farmer.get("farmer_id"),
+            "full_name": f"{farmer.get('personal_info', {}).get('first_name')} {farmer.get('personal_info', {}).get('last_name')}"
+        }
+
+    # Otherwise, it's a standard user with an email
+    user = await db.users.find_one({"email": subject}, {"password_hash": 0})
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> dict:
     """
     Extract and verify JWT token from Authorization header.
-    Returns the full user document from MongoDB for standard users,
+    Returns the user document from MongoDB for standard users,
     or a constructed user dict for farmers.
     
+    Principals are served from principal_cache when possible, so most
+    requests skip the database lookup. The cached document never contains
+    `password_hash`.
+    
     Args:
         credentials: HTTPBearer credentials (automatically extracted)
         db: MongoDB database instance
@@ -67,33 +125,10 @@ async def get_current_user(
         if subject is None:
             raise credentials_exception
 
-        # If subject is not an email, assume it's a farmer_id
-        if "@" not in subject:
-            farmer = await db.farmers.find_one({"farmer_id": subject})
-            if not farmer:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Farmer not found",
-                )
-            
-            # Construct a user-like dictionary for the farmer
-            user = {
-                "_id": farmer["_id"],
-                "email": farmer.get("personal_info", {}).get("email"),
-                "roles": ["FARMER"],
-                "is_active": True,
-                "farmer_id": farmer.get("farmer_id"),
-                "full_name": f"{farmer.get('personal_info', {}).get('first_name')} {farmer.get('personal_info', {}).get('last_name')}"
-            }
-
-        # Otherwise, it's a standard user with an email
-        else:
-            user = await db.users.find_one({"email": subject})
-            if user is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found",
-                )
+        user = await principal_cache.get(subject)
+        if user is None:
+            user = await _load_principal(db, subject)
+            await principal_cache.set(subject, user)
 
         if not user.get("is_active", True):
             raise HTTPException(
@@ -0,0 +1,291 @@
+# backend/app/indexes.py
+"""
+Declarative MongoDB index registry.
+
+Every index the backend relies on is declared here, per collection, and
+applied idempotently by connect_to_database() at startup. The same registry
+is used to report drift between the declared and the live indexes.
+
+Usage:
+    from app.indexes import ensure_indexes, check_index_drift
+
+    await ensure_indexes(db)
+    drift = await check_index_drift(db)
+"""
+
+from typing import Any, Dict, List
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.errors import OperationFailure
+
+
+logger = logging.getLogger(__name__)
+
+
+# Index options that take part in drift comparison (everything else, such as
+# the server-assigned "v" or "ns", is ignored).
+_COMPARED_OPTIONS = (
+    "unique",
+    "sparse",
+    "partialFilterExpression",
+    "expireAfterSeconds",
+    "weights",
+    "default_language",
+    "2dsphereIndexVersion",
+)
+
+
+def _string_field(field: str) -> Dict[str, Any]:
+    """Partial filter that only indexes documents where `field` is a string.
+
+    Legacy farmer documents may lack farmer_id / nrc_hash entirely; a plain
+    unique index would treat every missing value as a duplicate null.
+    """
+    return {field: {"$type": "string"}}
+
+
+# =======================================================
+# Index Registry
+# =======================================================
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "farmers": [
+        IndexModel(
+            [("farmer_id", ASCENDING)],
+            name="farmer_id_unique",
+            unique=True,
+            partialFilterExpression=_string_field("farmer_id"),
+        ),
+        IndexModel(
+            [("nrc_hash", ASCENDING)],
+            name="nrc_hash_unique",
+            unique=True,
+            partialFilterExpression=_string_field("nrc_hash"),
+        ),
+        # List ordering / keyset pagination: (created_at desc, _id desc),
+        # optionally prefixed by the equality filters used by list_farmers
+        IndexModel(
+            [("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="created_at_id",
+        ),
+        IndexModel(
+            [("address.district_name", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="district_created_at_id",
+        ),
+        IndexModel(
+            [("created_by", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="created_by_created_at_id",
+        ),
+        IndexModel(
+            [("registration_status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id",
+        ),
+        IndexModel([("personal_info.email", ASCENDING)], name="personal_email", sparse=True),
+        # Prefix search over normalized name tokens / phone digits / farmer_id
+        IndexModel([("search.keys", ASCENDING)], name="search_keys"),
+        # Radius / polygon queries on the derived GeoJSON point (farmers
+        # without coordinates have no location and are not indexed). The
+        # server always reports 2dsphereIndexVersion; declared so drift
+        # checks compare like with like
+        IndexModel([("location", GEOSPHERE)], name="location_2dsphere", **{"2dsphereIndexVersion": 3}),
+    ],
+    "users": [
+        IndexModel(
+            [("email", ASCENDING)],
+            name="email_unique",
+            unique=True,
+            partialFilterExpression=_string_field("email"),
+        ),
+    ],
+    "operators": [
+        IndexModel(
+            [("email", ASCENDING)],
+            name="email_unique",
+            unique=True,
+            partialFilterExpression=_string_field("email"),
+        ),
+        IndexModel(
+            [("operator_id", ASCENDING)],
+            name="operator_id_unique",
+            unique=True,
+            partialFilterExpression=_string_field("operator_id"),
+        ),
+    ],
+    "registration_rollups": [
+        # One bucket per (day, district, operator); also serves day-range reads
+        IndexModel(
+            [("day", ASCENDING), ("district", ASCENDING), ("operator", ASCENDING)],
+            name="day_district_operator_unique",
+            unique=True,
+        ),
+        IndexModel([("district", ASCENDING), ("day", ASCENDING)], name="district_day"),
+        IndexModel([("operator", ASCENDING), ("day", ASCENDING)], name="operator_day"),
+    ],
+    "report_jobs": [
+        # active_key only exists while a job is queued/running: identical
+        # in-flight requests collapse onto one job
+        IndexModel(
+            [("active_key", ASCENDING)],
+            name="active_key_unique",
+            unique=True,
+            partialFilterExpression=_string_field("active_key"),
+        ),
+        IndexModel([("created_at", DESCENDING)], name="created_at_desc"),
+    ],
+    "system_logs": [
+        IndexModel([("timestamp", DESCENDING)], name="timestamp_desc"),
+        IndexModel([("level", ASCENDING), ("timestamp", DESCENDING)], name="level_timestamp"),
+    ],
+    # Codes are unique; name_key (normalized name, see geo_custom_service)
+    # is unique within the parent so custom entries cannot be duplicated
+    "provinces": [
+        IndexModel(
+            [("province_id", ASCENDING)],
+            name="province_id_unique",
+            unique=True,
+            partialFilterExpression=_string_field("province_id"),
+        ),
+        IndexModel(
+            [("name_key", ASCENDING)],
+            name="name_key_unique",
+            unique=True,
+            partialFilterExpression=_string_field("name_key"),
+        ),
+    ],
+    "districts": [
+        IndexModel(
+            [("district_id", ASCENDING)],
+            name="district_id_unique",
+            unique=True,
+            partialFilterExpression=_string_field("district_id"),
+        ),
+        IndexModel(
+            [("province_id", ASCENDING), ("name_key", ASCENDING)],
+            name="province_name_key_unique",
+            unique=True,
+            partialFilterExpression=_string_field("name_key"),
+        ),
+        # Districts of a province (the partial name index cannot serve these)
+        IndexModel([("province_id", ASCENDING)], name="province_id"),
+    ],
+    "chiefdoms": [
+        IndexModel(
+            [("chiefdom_id", ASCENDING)],
+            name="chiefdom_id_unique",
+            unique=True,
+            partialFilterExpression=_string_field("chiefdom_id"),
+        ),
+        IndexModel(
+            [("district_id", ASCENDING), ("name_key", ASCENDING)],
+            name="district_name_key_unique",
+            unique=True,
+            partialFilterExpression=_string_field("name_key"),
+        ),
+        # Chiefdoms of a district (the partial name index cannot serve these)
+        IndexModel([("district_id", ASCENDING)], name="district_id"),
+    ],
+}
+
+
+# =======================================================
+# Drift Detection
+# =======================================================
+def _declared_shape(model: IndexModel) -> Dict[str, Any]:
+    """Reduce an IndexModel to the comparable (key, options) shape."""
+    document = model.document
+    shape = {"key": list(document["key"].items())}
+    for option in _COMPARED_OPTIONS:
+        if option in document:
+            shape[option] = document[option]
+    return shape
+
+
+def _live_shape(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an index_information() entry to the comparable shape."""
+    shape = {"key": [(field, direction) for field, direction in info["key"]]}
+    for option in _COMPARED_OPTIONS:
+        if option in info:
+            shape[option] = info[option]
+    return shape
+
+
+def diff_indexes(
+    declared: List[IndexModel],
+    live: Dict[str, Dict[str, Any]],
+) -> Dict[str, List[str]]:
+    """
+    Compare declared indexes with live index_information() output.
+
+    Args:
+        declared: IndexModel list from INDEX_REGISTRY
+        live: Result of collection.index_information()
+
+    Returns:
+        Dict with "missing", "unexpected" and "mismatched" index names
+    """
+    declared_by_name = {m.document["name"]: m for m in declared}
+    missing, mismatched = [], []
+
+    for name, model in declared_by_name.items():
+        if name not in live:
+            missing.append(name)
+        elif _declared_shape(model) != _live_shape(live[name]):
+            mismatched.append(name)
+
+    unexpected = [
+        name for name in live
+        if name != "_id_" and name not in declared_by_name
+    ]
+
+    return {
+        "missing": sorted(missing),
+        "unexpected": sorted(unexpected),
+        "mismatched": sorted(mismatched),
+    }
+
+
+async def check_index_drift(db: AsyncIOMotorDatabase) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Report drift between INDEX_REGISTRY and the live database.
+
+    Returns:
+        Mapping of collection name → drift report (only collections with drift)
+    """
+    report = {}
+    for collection_name, declared in INDEX_REGISTRY.items():
+        live = await db[collection_name].index_information()
+        drift = diff_indexes(declared, live)
+        if any(drift.values()):
+            report[collection_name] = drift
+    return report
+
+
+# =======================================================
+# Bootstrapper
+# =======================================================
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """
+    Create every declared index. Safe to call on every startup: creating an
+    index that already exists with the same spec is a no-op on the server.
+
+    A failure on one collection (e.g. existing duplicates blocking a unique
+    index, or a same-name index with different options) is logged and does
+    not stop the remaining collections or the application startup.
+
+    Returns:
+        Mapping of collection name → created/confirmed index names
+    """
+    applied = {}
+    for collection_name, models in INDEX_REGISTRY.items():
+        try:
+            applied[collection_name] = await db[collection_name].create_indexes(models)
+        except OperationFailure as e:
+            logger.warning(f"⚠️  Index creation failed for '{collection_name}': {e}")
+    logger.info(f"✅ Indexes ensured on {len(applied)}/{len(INDEX_REGISTRY)} collections")
+
+    drift = await check_index_drift(db)
+    for collection_name, report in drift.items():
+        logger.warning(f"⚠️  Index drift on '{collection_name}': {report}")
+
+    return applied
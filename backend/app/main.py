@@ -4,20 +4,21 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 from pathlib import Path
 import logging
 import os
 import traceback
-import time
-import uuid
 
 
 # Import configuration and database
 from app.config import settings
-from app.database import connect_to_database, close_database_connection
+from app.database import connect_to_database, close_database_connection, get_db
 from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.request_pipeline import RequestPipelineMiddleware
+from app.services.geo_boundaries import geo_boundaries
+from app.services.geo_store import geo_store
+from app.services.log_writer import log_writer
 
 
 # Import routers
@@ -75,11 +76,32 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Database connection failed: {e}")
         raise
     
+    await log_writer.start()
+
+    # Geographic reference data is served from memory (reloaded on change)
+    try:
+        await geo_store.load(await get_db())
+    except Exception as e:
+        logger.error(f"❌ Failed to load geo store (will retry on first request): {e}")
+    
+    # Boundary polygons for GPS → district / chiefdom checks (optional)
+    if settings.GEO_BOUNDARIES_PATH:
+        try:
+            geo_boundaries.load_file(settings.GEO_BOUNDARIES_PATH)
+        except Exception as e:
+            logger.error(f"❌ Failed to load geo boundaries, GPS boundary checks disabled: {e}")
+    
     logger.info("✅ Application startup complete")
     
     yield
     
     logger.info("🧹 Shutting down application...")
+    try:
+        # Flush buffered system logs while the database is still connected
+        await log_writer.stop()
+    except Exception as e:
+        logger.error(f"❌ Error flushing system logs: {e}")
+    
     try:
         await close_database_connection()
         logger.info("✅ Database connection closed")
@@ -104,61 +126,6 @@ app = FastAPI(
 )
 
 
-# ============================================
-# Request ID Middleware (Track Every Request)
-# ============================================
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    request_id = str(uuid.uuid4())[:8]
-    request.state.request_id = request_id
-    
-    # Add to response headers for debugging
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    
-    return response
-
-
-# ============================================
-# Comprehensive Request Logging Middleware
-# ============================================
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    request_id = getattr(request.state, "request_id", "unknown")
-    start_time = time.time()
-    
-    # Log incoming request
-    logger.info(f"[{request_id}] 📨 {request.method} {request.url.path}")
-    logger.debug(f"[{request_id}]    Client: {request.client.host if request.client else 'unknown'}")
-    logger.debug(f"[{request_id}]    Origin: {request.headers.get('origin', 'none')}")
-    logger.debug(f"[{request_id}]    User-Agent: {request.headers.get('user-agent', 'none')[:50]}")
-    
-    # Log OPTIONS requests in detail
-    if request.method == "OPTIONS":
-        logger.info(f"[{request_id}] 🔵 CORS Preflight Request")
-        logger.debug(f"[{request_id}]    Access-Control-Request-Method: {request.headers.get('access-control-request-method', 'none')}")
-        logger.debug(f"[{request_id}]    Access-Control-Request-Headers: {request.headers.get('access-control-request-headers', 'none')}")
-    
-    try:
-        response = await call_next(request)
-        
-        # Calculate request duration
-        duration = (time.time() - start_time) * 1000
-        
-        # Log response
-        status_emoji = "✅" if response.status_code < 400 else "⚠️" if response.status_code < 500 else "❌"
-        logger.info(f"[{request_id}] {status_emoji} {response.status_code} | {duration:.2f}ms")
-        
-        return response
-        
-    except Exception as e:
-        duration = (time.time() - start_time) * 1000
-        logger.error(f"[{request_id}] ❌ Exception during request processing ({duration:.2f}ms)")
-        logger.error(f"[{request_id}]    Error: {str(e)}")
-        logger.error(f"[{request_id}]    Traceback:\n{traceback.format_exc()}")
-        raise
-
-
 # ============================================
 # CORS Configuration
 # ============================================
@@ -190,7 +157,7 @@ if settings.ENVIRONMENT == "production":
         allow_credentials=False,
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
         allow_headers=["*"],
-        expose_headers=["Content-Length", "Content-Type", "Authorization", "X-Request-ID"],
+        expose_headers=["Content-Length", "Content-Type", "Authorization", "X-Request-ID", "X-Next-Cursor"],
         max_age=3600,
     )
 else:
@@ -201,68 +168,37 @@ else:
         allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
         allow_methods=settings.CORS_ALLOW_METHODS,
         allow_headers=settings.CORS_ALLOW_HEADERS,
-        expose_headers=["Content-Length", "Content-Type", "Authorization", "X-Request-ID"],
+        expose_headers=["Content-Length", "Content-Type", "Authorization", "X-Request-ID", "X-Next-Cursor"],
         max_age=3600,
     )
 
 
 # ============================================
-# CORS Preflight Handler (Runs FIRST)
+# CORS Preflight Headers
 # ============================================
-@app.middleware("http")
-async def preflight_middleware(request: Request, call_next):
-    if request.method == "OPTIONS":
-        request_id = getattr(request.state, "request_id", "unknown")
-        
-        origin = request.headers.get("origin") or "*"
-        request_method = request.headers.get("access-control-request-method", "")
-        request_headers = request.headers.get("access-control-request-headers", "*")
-        
-        logger.info(f"[{request_id}] ✈️  Handling OPTIONS preflight")
-        logger.debug(f"[{request_id}]    Origin: {origin}")
-        logger.debug(f"[{request_id}]    Requested Method: {request_method}")
-        logger.debug(f"[{request_id}]    Requested Headers: {request_headers}")
-        
-        allow_headers = ",".join(settings.CORS_ALLOW_HEADERS) if settings.CORS_ALLOW_HEADERS != ["*"] else request_headers
-        allow_methods = ",".join(settings.CORS_ALLOW_METHODS)
-        
-        headers = {
-            "Access-Control-Allow-Origin": "*" if settings.ENVIRONMENT == "production" else origin,
-            "Access-Control-Allow-Methods": allow_methods,
-            "Access-Control-Allow-Headers": allow_headers,
-            "Access-Control-Allow-Credentials": "false" if settings.ENVIRONMENT == "production" else "true",
-            "Access-Control-Max-Age": "3600",
-            "X-Request-ID": request_id,
-        }
-        
-        logger.info(f"[{request_id}] ✅ Returning 200 OK for preflight")
-        return Response(status_code=200, content=b"", headers=headers)
+def preflight_headers(request_headers) -> dict:
+    """Permissive preflight response for OPTIONS requests CORSMiddleware does not answer"""
+    origin = request_headers.get("origin") or "*"
+    allow_headers = ",".join(settings.CORS_ALLOW_HEADERS) if settings.CORS_ALLOW_HEADERS != ["*"] else request_headers.get("access-control-request-headers", "*")
+    allow_methods = ",".join(settings.CORS_ALLOW_METHODS)
     
-    return await call_next(request)
-
-
-# Add CORS middleware
-app.add_middleware(CORSMiddleware, **cors_kwargs)
-app.add_middleware(LoggingMiddleware)
+    return {
+        "Access-Control-Allow-Origin": "*" if settings.ENVIRONMENT == "production" else origin,
+        "Access-Control-Allow-Methods": allow_methods,
+        "Access-Control-Allow-Headers": allow_headers,
+        "Access-Control-Allow-Credentials": "false" if settings.ENVIRONMENT == "production" else "true",
+        "Access-Control-Max-Age": "3600",
+    }
 
 
 # ============================================
-# Cache Control Middleware
+# Middleware Stack (last added runs first)
 # ============================================
-@app.middleware("http")
-async def cache_control_middleware(request: Request, call_next):
-    response = await call_next(request)
-    
-    try:
-        path = request.url.path or ""
-        if path.startswith("/api/"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Vary"] = response.headers.get("Vary", "Origin, Authorization")
-    except Exception as e:
-        logger.warning(f"Failed to set cache headers: {e}")
-    
-    return response
+# RequestPipelineMiddleware: request ID, timing, preflight short-circuit and
+# /api/ cache headers in a single pure-ASGI pass (outermost)
+app.add_middleware(CORSMiddleware, **cors_kwargs)
+app.add_middleware(LoggingMiddleware)
+app.add_middleware(RequestPipelineMiddleware, preflight_headers=preflight_headers)
 
 
 # ============================================
@@ -273,18 +209,8 @@ async def global_options(full_path: str, request: Request):
     request_id = getattr(request.state, "request_id", "unknown")
     logger.info(f"[{request_id}] 🔄 Global OPTIONS handler for /{full_path}")
     
-    origin = request.headers.get("origin") or "*"
-    allow_headers = ",".join(settings.CORS_ALLOW_HEADERS) if settings.CORS_ALLOW_HEADERS != ["*"] else request.headers.get("access-control-request-headers", "*")
-    allow_methods = ",".join(settings.CORS_ALLOW_METHODS)
-    
-    headers = {
-        "Access-Control-Allow-Origin": "*" if settings.ENVIRONMENT == "production" else origin,
-        "Access-Control-Allow-Methods": allow_methods,
-        "Access-Control-Allow-Headers": allow_headers,
-        "Access-Control-Allow-Credentials": "false" if settings.ENVIRONMENT == "production" else "true",
-        "Access-Control-Max-Age": "3600",
-        "X-Request-ID": request_id,
-    }
+    headers = preflight_headers(request.headers)
+    headers["X-Request-ID"] = request_id
     
     return Response(status_code=200, content=b"", headers=headers)
 
@@ -0,0 +1,116 @@
+# backend/app/middleware/cache_policy.py
+"""
+Per-route HTTP cache policies.
+
+Every /api/ response is no-store by default (see RequestPipelineMiddleware).
+Reference data that rarely changes (geo lists, ethnic groups, the app
+version) opts in by registering a CachePolicy for its GET paths:
+
+    cache_policies.register("/api/ethnic-groups", CachePolicy(max_age=300))
+    cache_policies.register("/api/geo/{path:path}", CachePolicy(
+        max_age=300, stale_while_revalidate=86400, version=lambda: ...))
+
+For a matching GET the middleware then sends Cache-Control from the policy
+and an ETag, and answers a matching If-None-Match with 304:
+
+- With `version`, the ETag is derived from a cheap token (e.g. a data
+  version counter) and a matching request is answered before the handler
+  runs at all. The token is taken again when the response starts, so a
+  handler that refreshed the data sends the new version.
+- Otherwise the ETag is a hash of the response body (the handler runs,
+  but an unchanged body is not sent again).
+
+An ETag set by the handler itself is kept. Error responses stay no-store.
+
+Path templates use `{name}` for one path segment and `{name:path}` for
+the rest of the path. Registering None for a path keeps it no-store even
+when a broader template registered after it matches.
+"""
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Pattern, Tuple
+import re
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Cacheability of a route's successful GET responses.
+
+    Args:
+        max_age: Seconds a client may reuse the response without asking
+        stale_while_revalidate: Seconds a client may keep using it while revalidating
+        private: Only the client may cache it (not shared proxies)
+        etag: Send an ETag and answer If-None-Match with 304
+        version: Returns a token that changes whenever the data does (None
+            when unknown); enables 304s without running the handler
+    """
+    max_age: int = 0
+    stale_while_revalidate: int = 0
+    private: bool = True
+    etag: bool = True
+    version: Optional[Callable[[], Optional[str]]] = None
+
+    def cache_control(self) -> str:
+        """Cache-Control header value"""
+        parts = ["private" if self.private else "public"]
+        if self.max_age > 0:
+            parts.append(f"max-age={self.max_age}")
+        else:
+            parts.append("no-cache")  # store, but revalidate every time
+        if self.stale_while_revalidate > 0:
+            parts.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(parts)
+
+    def version_etag(self) -> Optional[str]:
+        """Weak ETag from the version token (None without a version)"""
+        if self.version is None:
+            return None
+        token = self.version()
+        return f'W/"{token}"' if token is not None else None
+
+
+def _compile(template: str) -> Pattern:
+    pattern = ""
+    for part in re.split(r"(\{[^}]+\})", template):
+        if part.startswith("{") and part.endswith("}"):
+            pattern += ".+" if part.endswith(":path}") else "[^/]+"
+        else:
+            pattern += re.escape(part)
+    return re.compile(f"^{pattern}$")
+
+
+class CachePolicyRegistry:
+    """
+    Path template → CachePolicy for GET / HEAD requests (first match wins).
+    """
+
+    def __init__(self):
+        self._policies: List[Tuple[str, Pattern, Optional[CachePolicy]]] = []
+
+    def register(self, template: str, policy: Optional[CachePolicy]) -> None:
+        """
+        Declare the cache policy of a path.
+
+        Args:
+            template: Full request path, e.g. "/api/geo/districts/{code}"
+            policy: Policy applied to its successful GET responses, or None
+                to exclude the path from templates registered later
+        """
+        self._policies = [entry for entry in self._policies if entry[0] != template]
+        self._policies.append((template, _compile(template), policy))
+
+    def match(self, method: str, path: str) -> Optional[CachePolicy]:
+        """Policy for a request, or None (no-store)"""
+        if method not in ("GET", "HEAD"):
+            return None
+        for _, pattern, policy in self._policies:
+            if pattern.match(path):
+                return policy
+        return None
+
+    def clear(self) -> None:
+        self._policies = []
+
+
+# Global instance
+cache_policies = CachePolicyRegistry()
@@ -1,86 +1,134 @@
+import random
 import time
 import uuid
-from typing import Callable
+from typing import Any, Dict, Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.services.logging_service import log_event, sanitize_body
+from app.config import settings
+from app.services.logging_service import log_event, sanitize_body_prefix
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+_BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+
+def _is_json(scope: Scope) -> bool:
+    """True if the request declares a JSON body (uploads are never sampled)."""
+    for name, value in scope.get("headers", []):
+        if name == b"content-type":
+            return b"json" in value.lower()
+    return False
+
+
+class LoggingMiddleware:
+    """
+    Pure ASGI request logging middleware.
+
+    Records method, path, status code and duration from the ASGI messages
+    without wrapping the request in a Request object or buffering its body.
+    For a sampled fraction of JSON POST/PUT/PATCH requests
+    (LOG_BODY_SAMPLE_RATE) the first LOG_BODY_SAMPLE_BYTES of the body are
+    copied as they stream through `receive`; the body itself reaches the
+    application untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_bytes: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+    ):
+        self.app = app
+        self.sample_bytes = settings.LOG_BODY_SAMPLE_BYTES if sample_bytes is None else sample_bytes
+        self.sample_rate = settings.LOG_BODY_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        request_id = str(uuid.uuid4())
         start = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        state = scope.setdefault("state", {})
+        request_id = state.get("request_id") or str(uuid.uuid4())
+        client = scope.get("client")
+        client_ip = client[0] if client else None
 
-        # Try to read request body safely
-        body_content = {}
-        try:
-            if request.method in {"POST", "PUT", "PATCH"}:
-                body_content = await request.json()
-        except Exception:
-            body_content = {}
-
-        # Collect basic context
-        user = getattr(request.state, "user", None)
-        user_id = getattr(user, "id", None) if user else None
-        role = getattr(user, "role", None) if user else None
-        client_ip = request.client.host if request.client else None
-
-        # Pre-request log (DEBUG)
-        await log_event(
-            level="DEBUG",
-            module="middleware",
-            action="request",
-            details={"method": request.method, "path": request.url.path, "body": sanitize_body(body_content)},
-            endpoint=request.url.path,
-            user_id=user_id,
-            role=role,
-            ip_address=client_ip,
-            request_id=request_id,
+        sampled = (
+            method in _BODY_METHODS
+            and self.sample_bytes > 0
+            and _is_json(scope)
+            and random.random() < self.sample_rate
         )
+        body_prefix = bytearray()
+        body_truncated = False
+        status_code = None
+
+        async def receive_wrapper() -> Message:
+            nonlocal body_truncated
+            message = await receive()
+            if sampled and message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                remaining = self.sample_bytes - len(body_prefix)
+                if remaining > 0:
+                    body_prefix.extend(chunk[:remaining])
+                if len(chunk) > max(remaining, 0):
+                    body_truncated = True
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        user = state.get("user")
+        context = {
+            "endpoint": path,
+            "user_id": getattr(user, "id", None) if user else None,
+            "role": getattr(user, "role", None) if user else None,
+            "ip_address": client_ip,
+            "request_id": request_id,
+        }
 
         try:
-            response = await call_next(request)
-            status_code = response.status_code
+            await self.app(scope, receive_wrapper if sampled else receive, send_wrapper)
         except Exception as exc:
-            duration_ms = (time.perf_counter() - start) * 1000.0
             await log_event(
                 level="ERROR",
                 module="middleware",
                 action="error",
-                details={"method": request.method, "path": request.url.path, "error": str(exc)},
-                endpoint=request.url.path,
-                user_id=user_id,
-                role=role,
-                ip_address=client_ip,
-                request_id=request_id,
-                duration_ms=duration_ms,
+                details={"method": method, "path": path, "error": str(exc)},
+                duration_ms=(time.perf_counter() - start) * 1000.0,
+                **context,
             )
             raise
 
         duration_ms = (time.perf_counter() - start) * 1000.0
 
-        # Post-response log (INFO)
+        # Request log (DEBUG) - written once the body has streamed through
+        request_details: Dict[str, Any] = {"method": method, "path": path}
+        if sampled:
+            request_details["body"] = sanitize_body_prefix(bytes(body_prefix), body_truncated)
+        await log_event(
+            level="DEBUG",
+            module="middleware",
+            action="request",
+            details=request_details,
+            **context,
+        )
+
+        # Response log (INFO)
         await log_event(
             level="INFO",
             module="middleware",
             action="response",
             details={
-                "method": request.method,
-                "path": request.url.path,
+                "method": method,
+                "path": path,
                 "status_code": status_code,
             },
-            endpoint=request.url.path,
-            user_id=user_id,
-            role=role,
-            ip_address=client_ip,
-            request_id=request_id,
             duration_ms=duration_ms,
+            **context,
         )
-
-        return response
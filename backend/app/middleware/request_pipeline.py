@@ -0,0 +1,194 @@
+# backend/app/middleware/request_pipeline.py
+"""
+Single-pass ASGI request pipeline.
+
+Replaces the four `@app.middleware("http")` layers that used to live in
+main.py (add_request_id, log_requests, preflight_middleware,
+cache_control_middleware). Each of those was a BaseHTTPMiddleware, which
+costs an extra task and a response stream wrapper per layer. This
+middleware does all four jobs in one pass over the raw ASGI messages:
+
+1. Request ID  - 8-char id stored in scope["state"]["request_id"] (so
+                 request.state.request_id and LoggingMiddleware share it)
+                 and returned as X-Request-ID
+2. Timing      - "📨 METHOD path" / "✅ status | ms" log lines
+3. Preflight   - OPTIONS requests that CORSMiddleware does not answer
+                 itself get the permissive preflight response
+4. Cache       - /api/ responses are marked no-store, except GETs of
+                 routes registered in the cache policy registry
+                 (app.middleware.cache_policy), which get the policy's
+                 Cache-Control, an ETag and 304s for If-None-Match
+
+Install it as the outermost middleware (add it last).
+"""
+import logging
+import time
+import traceback
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.cache_policy import CachePolicy, CachePolicyRegistry, cache_policies
+from app.utils.etag import content_etag, etag_matches
+
+
+logger = logging.getLogger("app.main")
+
+NO_STORE_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
+    "Pragma": "no-cache",
+}
+DEFAULT_VARY = "Origin, Authorization"
+
+
+class RequestPipelineMiddleware:
+    """
+    Request ID, timing, preflight short-circuit and cache headers in one
+    ASGI middleware.
+
+    Args:
+        app: Downstream ASGI application
+        preflight_headers: Builds the preflight response headers from the
+            request headers (None disables the preflight short-circuit)
+        api_prefix: Path prefix whose responses get no-store cache headers
+        policies: Per-route cache policies (defaults to the global registry)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        preflight_headers: Optional[Callable[[Headers], Dict[str, str]]] = None,
+        api_prefix: str = "/api/",
+        policies: Optional[CachePolicyRegistry] = None,
+    ):
+        self.app = app
+        self.preflight_headers = preflight_headers
+        self.api_prefix = api_prefix
+        self.policies = cache_policies if policies is None else policies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())[:8]
+        scope.setdefault("state", {})["request_id"] = request_id
+        method = scope["method"]
+        path = scope["path"]
+        start_time = time.perf_counter()
+        status_code = None
+
+        logger.info(f"[{request_id}] 📨 {method} {path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            request_headers = Headers(scope=scope)
+            client = scope.get("client")
+            logger.debug(f"[{request_id}]    Client: {client[0] if client else 'unknown'}")
+            logger.debug(f"[{request_id}]    Origin: {request_headers.get('origin', 'none')}")
+            logger.debug(f"[{request_id}]    User-Agent: {request_headers.get('user-agent', 'none')[:50]}")
+
+        policy = self.policies.match(method, path) if path.startswith(self.api_prefix) else None
+        if_none_match = Headers(scope=scope).get("if-none-match") if policy and policy.etag else None
+        version_etag = policy.version_etag() if policy and policy.etag else None
+        # Response start held back while the body is hashed for a content ETag
+        held_start: Optional[Message] = None
+        held_body: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, held_start
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                cacheable = self._apply_cache_headers(path, headers, policy, status_code)
+                if cacheable and "etag" not in headers:
+                    # Taken again: the handler may have refreshed the data
+                    current_etag = policy.version_etag() if policy.etag else None
+                    if current_etag:
+                        headers["ETag"] = current_etag
+                    elif policy.etag and status_code == 200 and method == "GET":
+                        held_start = message
+                        return
+            elif held_start is not None:
+                held_body.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                await self._send_with_content_etag(held_start, b"".join(held_body), if_none_match, send)
+                status_code = held_start["status"]
+                return
+            await send(message)
+
+        try:
+            if method == "OPTIONS" and self.preflight_headers is not None and not _is_cors_preflight(scope):
+                await self._preflight(scope, receive, send_wrapper, request_id)
+            elif version_etag and etag_matches(if_none_match, version_etag):
+                # Unchanged since the client's copy: skip the handler entirely
+                await Response(status_code=304, headers={"ETag": version_etag})(scope, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            duration = (time.perf_counter() - start_time) * 1000
+            logger.error(f"[{request_id}] ❌ Exception during request processing ({duration:.2f}ms)")
+            logger.error(f"[{request_id}]    Error: {str(e)}")
+            logger.error(f"[{request_id}]    Traceback:\n{traceback.format_exc()}")
+            raise
+
+        duration = (time.perf_counter() - start_time) * 1000
+        if status_code is not None:
+            status_emoji = "✅" if status_code < 400 else "⚠️" if status_code < 500 else "❌"
+            logger.info(f"[{request_id}] {status_emoji} {status_code} | {duration:.2f}ms")
+
+    async def _preflight(self, scope: Scope, receive: Receive, send: Send, request_id: str) -> None:
+        headers = self.preflight_headers(Headers(scope=scope))
+        headers["X-Request-ID"] = request_id
+        logger.info(f"[{request_id}] ✅ Returning 200 OK for preflight")
+        await Response(status_code=200, content=b"", headers=headers)(scope, receive, send)
+
+    def _apply_cache_headers(
+        self,
+        path: str,
+        headers: MutableHeaders,
+        policy: Optional[CachePolicy] = None,
+        status_code: int = 200,
+    ) -> bool:
+        """
+        Set the cache headers of an API response (static files keep theirs).
+
+        Returns:
+            bool: True if the response follows a cache policy, False if it
+            was marked no-store (or is not an API response)
+        """
+        if not path.startswith(self.api_prefix):
+            return False
+        headers["Vary"] = headers.get("Vary", DEFAULT_VARY)
+        if policy is not None and status_code in (200, 304):
+            headers["Cache-Control"] = policy.cache_control()
+            if "pragma" in headers:
+                del headers["Pragma"]
+            return True
+        for name, value in NO_STORE_HEADERS.items():
+            headers[name] = value
+        return False
+
+    @staticmethod
+    async def _send_with_content_etag(start: Message, body: bytes, if_none_match: Optional[str], send: Send) -> None:
+        """Send a held response with a body-hash ETag, as a bodiless 304 if the client has it"""
+        etag = content_etag(body)
+        headers = MutableHeaders(scope=start)
+        headers["ETag"] = etag
+        if etag_matches(if_none_match, etag):
+            start["status"] = 304
+            for name in ("content-length", "content-type"):
+                if name in headers:
+                    del headers[name]
+            body = b""
+        await send(start)
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+
+def _is_cors_preflight(scope: Scope) -> bool:
+    """True for OPTIONS requests that CORSMiddleware answers on its own."""
+    names: List[bytes] = [name for name, _ in scope.get("headers", [])]
+    return b"origin" in names and b"access-control-request-method" in names
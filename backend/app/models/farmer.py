@@ -331,3 +331,28 @@ class FarmerListItem(BaseModel):
     
     model_config = ConfigDict(populate_by_name=True)
 
+
+class FarmerGeoItem(FarmerListItem):
+    """List item with coordinates, returned by proximity queries"""
+    latitude: float
+    longitude: float
+    distance_m: Optional[float] = Field(None, description="Distance from the query point in metres (radius queries)")
+
+
+class FarmerAreaQuery(BaseModel):
+    """Polygon for the farmers-within-area query"""
+    polygon: List[List[float]] = Field(
+        ...,
+        min_length=3,
+        description="Polygon ring as [longitude, latitude] points (closed automatically)"
+    )
+    status: Optional[str] = Field(None, pattern=r"^(registered|under_review|verified|rejected|pending_documents)$")
+    limit: int = Field(200, ge=1, description="Maximum farmers returned (capped by FARMER_GEO_MAX_RESULTS)")
+
+
+class FarmerListPage(BaseModel):
+    """Page of farmers with total match count (and optional facet counts)"""
+    items: List[FarmerListItem]
+    total: int
+    next_cursor: Optional[str] = None
+    facets: Optional[dict] = None
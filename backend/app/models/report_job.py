@@ -0,0 +1,64 @@
+# backend/app/models/report_job.py
+from pydantic import BaseModel, Field
+from typing import Optional, Literal
+from datetime import datetime
+
+
+# ============================================
+# Background Report Jobs
+# ============================================
+class ReportFilters(BaseModel):
+    """Filters applied to the farmers selected by a report"""
+    province: Optional[str] = None
+    district: Optional[str] = None
+    status: Optional[str] = Field(None, description="Registration status")
+    start_date: Optional[datetime] = Field(None, description="Registered on/after")
+    end_date: Optional[datetime] = Field(None, description="Registered before")
+
+
+class ReportJobCreate(BaseModel):
+    """Request to generate a report in the background"""
+    report: Literal["farmers_details"] = "farmers_details"
+    format: Literal["csv", "xlsx", "pdf"] = "csv"
+    filters: ReportFilters = Field(default_factory=ReportFilters)
+
+
+class ReportJobOut(BaseModel):
+    """Report job status as returned by the API"""
+    job_id: str
+    report: str
+    format: str
+    status: Literal["queued", "running", "done", "failed"]
+    filters: ReportFilters
+    rows: int = 0
+    file_id: Optional[str] = None
+    filename: Optional[str] = None
+    download_url: Optional[str] = None
+    error: Optional[str] = None
+    deduplicated: bool = Field(False, description="True if an identical job was already in flight")
+    requested_by: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @classmethod
+    def from_mongo(cls, doc: dict, deduplicated: bool = False) -> "ReportJobOut":
+        """Build from a report_jobs document"""
+        file_id = doc.get("file_id")
+        return cls(
+            job_id=doc["_id"],
+            report=doc["report"],
+            format=doc["format"],
+            status=doc["status"],
+            filters=ReportFilters(**(doc.get("filters") or {})),
+            rows=doc.get("rows", 0),
+            file_id=file_id,
+            filename=doc.get("filename"),
+            download_url=f"/api/reports/files/{file_id}" if file_id else None,
+            error=doc.get("error"),
+            deduplicated=deduplicated,
+            requested_by=doc.get("requested_by"),
+            created_at=doc["created_at"],
+            started_at=doc.get("started_at"),
+            finished_at=doc.get("finished_at"),
+        )
@@ -0,0 +1,67 @@
+# backend/app/models/stats.py
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
+from datetime import datetime
+
+
+# ============================================
+# Dashboard / Report Statistics
+# ============================================
+class DistrictCount(BaseModel):
+    """Farmer count for one district"""
+    district: Optional[str] = None
+    count: int
+
+
+class RecentFarmer(BaseModel):
+    """Summary row for the most recently registered farmers"""
+    farmer_id: str
+    name: str
+    district: str
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_mongo(cls, doc: dict) -> "RecentFarmer":
+        """Build from a farmer document, tolerating missing/null fields"""
+        personal_info = doc.get("personal_info") or {}
+        address = doc.get("address") or {}
+        first_name = personal_info.get("first_name") or ""
+        last_name = personal_info.get("last_name") or ""
+        return cls(
+            farmer_id=doc.get("farmer_id") or "N/A",
+            name=f"{first_name} {last_name}".strip() or "Unknown",
+            district=address.get("district_name") or "N/A",
+            created_at=_as_datetime(doc.get("created_at")),
+        )
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    """Legacy created_at values may be ISO strings or empty; unparseable → None"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+class SystemStats(BaseModel):
+    """
+    Statistics shared by dashboard/stats, farmers/stats/overview and
+    reports/dashboard. Only the metrics an endpoint requested are filled in;
+    the rest keep their defaults.
+    """
+    farmers_total: int = 0
+    farmers_by_status: Dict[str, int] = Field(default_factory=dict)
+    farmers_by_district: List[DistrictCount] = Field(default_factory=list)
+    farmers_this_month: int = 0
+    recent_farmers: List[RecentFarmer] = Field(default_factory=list)
+    users_total: int = 0
+    operators_total: int = 0
+    generated_at: datetime
+
+    def status_count(self, status: str) -> int:
+        """Number of farmers with the given registration status"""
+        return self.farmers_by_status.get(status, 0)
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from app.middleware.cache_policy import CachePolicy, cache_policies
+
 router = APIRouter(prefix="/api/app", tags=["app"])
 
+# Update checks: reusable for 5 minutes, then revalidated by content ETag
+cache_policies.register("/api/app/version", CachePolicy(max_age=300, stale_while_revalidate=3600, private=False))
+
 class VersionInfo(BaseModel):
     versionCode: int
     versionName: str
@@ -36,6 +36,8 @@ from app.utils.security import (
 )
 from app.dependencies.roles import get_current_user, require_admin
 from app.services.logging_service import log_event, sanitize_body
+from app.services.principal_cache import principal_cache
+from app.services.report_cache import report_cache, USERS
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -379,6 +381,7 @@ async def register_user(
     
     # Insert into database
     result = await db.users.insert_one(user_doc)
+    await report_cache.invalidate_tags(USERS)
     
     # Fetch created user
     created_user = await db.users.find_one({"_id": result.inserted_id})
@@ -519,8 +522,9 @@ async def change_password(
     }
     ```
     """
-    # Verify current password
-    if not verify_password(request.current_password, current_user.get("password_hash", "")):
+    # Verify current password (the cached principal carries no password hash)
+    user_doc = await db.users.find_one({"email": current_user["email"]}, {"password_hash": 1})
+    if not user_doc or not verify_password(request.current_password, user_doc.get("password_hash", "")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
@@ -555,6 +559,7 @@ async def change_password(
             }
         }
     )
+    await principal_cache.invalidate(current_user["email"])
     
     return {
         "message": "Password changed successfully",
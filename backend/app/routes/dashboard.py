@@ -3,7 +3,9 @@ from fastapi import APIRouter, Depends, Request
 from app.database import get_db
 from app.dependencies.roles import require_role
 from app.services.logging_service import log_event
-from datetime import datetime
+from app.services.farmer_stats_service import FarmerStatsService
+from app.services.stats_service import StatsService, FARMER_COUNTS, RECENT_FARMERS, USERS, OPERATORS
+from app.services.report_cache import report_cache, FARMERS as FARMERS_TAG, OPERATORS as OPERATORS_TAG, USERS as USERS_TAG
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -29,46 +31,51 @@ async def get_dashboard_stats(
         ip_address=request.client.host if request.client else None
     )
     
-    total_farmers = await db.farmers.count_documents({})
-    active_farmers = await db.farmers.count_documents({"registration_status": "approved"})
-    pending_farmers = await db.farmers.count_documents({"registration_status": "pending"})
-    rejected_farmers = await db.farmers.count_documents({"registration_status": "rejected"})
-    total_users = await db.users.count_documents({})
-    operators = await db.operators.count_documents({})
-    recent_farmers = await db.farmers.find({}).sort("created_at", -1).limit(5).to_list(5)
-
-    # Format recent farmer fields for summary with safe None handling
-    recent_results = []
-    for f in recent_farmers:
-        # Safe extraction with defaults
-        personal_info = f.get("personal_info") or {}
-        address = f.get("address") or {}
-        
-        # Get names with fallback to empty string
-        first_name = personal_info.get("first_name") or ""
-        last_name = personal_info.get("last_name") or ""
-        
-        # Safely build full name
-        full_name = f"{first_name} {last_name}".strip()
-        if not full_name:
-            full_name = "Unknown"
-        
-        recent_results.append({
-            "farmer_id": f.get("farmer_id") or "N/A",
-            "name": full_name,
-            "district": address.get("district_name") or "N/A",
-            "created_at": f.get("created_at")
-        })
+    async def compute():
+        stats = await StatsService(db).collect({FARMER_COUNTS, RECENT_FARMERS, USERS, OPERATORS})
+        return {
+            "farmers": {
+                "total": stats.farmers_total,
+                "active": stats.status_count("approved"),
+                "pending": stats.status_count("pending"),
+                "rejected": stats.status_count("rejected"),
+                "recent": [f.model_dump() for f in stats.recent_farmers]
+            },
+            "users": stats.users_total,
+            "operators": stats.operators_total,
+        }
 
+    result, meta = await report_cache.get_or_compute(
+        "dashboard.stats",
+        compute,
+        scope=sorted(current_user.get("roles", [])),
+        tags=(FARMERS_TAG, OPERATORS_TAG, USERS_TAG),
+    )
     return {
-        "farmers": {
-            "total": total_farmers,
-            "active": active_farmers,
-            "pending": pending_farmers,
-            "rejected": rejected_farmers,
-            "recent": recent_results
-        },
-        "users": total_users,
-        "operators": operators,
-        "generated_at": datetime.now().isoformat()
+        **result,
+        "generated_at": meta.generated_at.isoformat(),
+        "stale": meta.stale
     }
+
+
+@router.post(
+    "/stats/reconcile",
+    summary="Rebuild farmer statistics",
+    description="Recompute the materialized farmer_stats document from the farmers collection (ADMIN only)."
+)
+async def reconcile_dashboard_stats(
+    db = Depends(get_db),
+    current_user = Depends(require_role(["ADMIN"]))
+):
+    await log_event(
+        level="INFO",
+        module="dashboard",
+        action="reconcile_stats",
+        details={},
+        user_id=current_user.get("email"),
+        role="ADMIN",
+    )
+    stats_service = FarmerStatsService(db)
+    await stats_service.reconcile()
+    await report_cache.invalidate_tags(FARMERS_TAG)
+    return await stats_service.get()
@@ -2,6 +2,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from app.database import get_db_motor
+from app.middleware.cache_policy import CachePolicy, cache_policies
 from app.models.ethnic_group import (
     EthnicGroupCreate,
     EthnicGroupUpdate,
@@ -12,6 +13,11 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 router = APIRouter(prefix="/ethnic-groups", tags=["ethnic-groups"])
 
+# Dropdown data: reusable for 5 minutes, then revalidated by content ETag
+ETHNIC_GROUPS_CACHE_POLICY = CachePolicy(max_age=300, stale_while_revalidate=3600, private=False)
+cache_policies.register("/api/ethnic-groups", ETHNIC_GROUPS_CACHE_POLICY)
+cache_policies.register("/api/ethnic-groups/{ethnic_group_id}", ETHNIC_GROUPS_CACHE_POLICY)
+
 
 async def get_ethnic_group_service(db: AsyncIOMotorDatabase = Depends(get_db_motor)) -> EthnicGroupService:
     """Dependency to get EthnicGroupService instance"""
@@ -5,6 +5,10 @@ Farmer management endpoints.
 Endpoints:
 - POST /api/farmers - Create new farmer
 - GET /api/farmers - List farmers with pagination/filters
+- GET /api/farmers/nearby - Farmers within a radius of a point
+- GET /api/farmers/within-bbox - Farmers inside a bounding box
+- POST /api/farmers/within - Farmers inside a polygon
+- POST /api/farmers/location-check - Re-check address codes against GPS boundaries
 - GET /api/farmers/{farmer_id} - Get farmer details
 - PUT /api/farmers/{farmer_id} - Update farmer
 - PATCH /api/farmers/{farmer_id}/status - Update registration status
@@ -26,6 +30,7 @@ from fastapi import (
 from fastapi.responses import JSONResponse
 from typing import Optional, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
 from app.database import get_db
 from app.dependencies.roles import (
@@ -35,13 +40,18 @@ from app.dependencies.roles import (
     can_access_farmer_data,
     get_current_user
 )
+from app.dependencies.operator_scope import get_operator_scope
 from app.models.farmer import (
     FarmerCreate,
     FarmerUpdate,
     FarmerOut,
     FarmerListItem,
+    FarmerListPage,
+    FarmerGeoItem,
+    FarmerAreaQuery,
 )
 from app.services.farmer_service import FarmerService
+from app.services.farmer_stats_service import STATS_PROJECTION
 from app.utils.security import verify_qr_signature, generate_qr_data
 from app.config import settings
 from pathlib import Path
@@ -50,6 +60,8 @@ from datetime import datetime
 from fastapi import UploadFile, File, HTTPException, Depends
 from app.services.logging_service import log_event, sanitize_body
 from app.services.gridfs_service import gridfs_service
+from app.services.geo_boundaries import geo_boundaries
+from app.utils.location_utils import bbox_geometry, polygon_geometry
 
 
 router = APIRouter(prefix="/farmers", tags=["Farmers"])
@@ -76,7 +88,8 @@ router = APIRouter(prefix="/farmers", tags=["Farmers"])
 async def create_farmer(
     farmer_data: FarmerCreate,
     db: AsyncIOMotorDatabase = Depends(get_db),
-    current_user: dict = Depends(require_operator)
+    current_user: dict = Depends(require_operator),
+    scope: dict = Depends(get_operator_scope)
 ):
     """
     Create a new farmer record.
@@ -131,9 +144,8 @@ async def create_farmer(
     )
     
     # For operators, validate that farmer is in their assigned district
-    if current_user.get("roles") and "OPERATOR" in current_user.get("roles", []) and "ADMIN" not in current_user.get("roles", []):
-        user_email = current_user.get("email")
-        operator_doc = await db.operators.find_one({"email": user_email})
+    if scope["restricted"]:
+        operator_doc = scope["operator"]
         if operator_doc:
             assigned_districts = operator_doc.get("assigned_districts", [])
             farmer_district = farmer_data.address.district_name if farmer_data.address else None
@@ -161,10 +173,8 @@ async def create_farmer(
     # so operator-scoped queries (created_by == operator_id) work correctly.
     created_by = current_user.get("email")
     # If the caller is an operator, prefer operator_id from the operators collection
-    if current_user.get("roles") and "OPERATOR" in current_user.get("roles", []):
-        op_doc = await db.operators.find_one({"email": current_user.get("email")})
-        if op_doc and op_doc.get("operator_id"):
-            created_by = op_doc.get("operator_id")
+    if scope["operator_id"]:
+        created_by = scope["operator_id"]
 
     farmer = await farmer_service.create_farmer(farmer_data, created_by=created_by)
     
@@ -197,15 +207,18 @@ async def create_farmer(
     include_in_schema=False  # Hide duplicate from docs
 )
 async def list_farmers(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum records to return"),
     status: Optional[str] = Query(None, regex="^(registered|under_review|verified|rejected|pending_documents)$", description="Filter by registration status"),
     district: Optional[str] = Query(None, description="Filter by district name"),
-    search: Optional[str] = Query(None, description="Search in name, phone, farmer_id"),
+    search: Optional[str] = Query(None, description="Prefix search in name, phone, farmer_id (relevance ranked)"),
     farmer_id_exact: Optional[str] = Query(None, description="Exact farmer_id match (overrides search)"),
     nrc: Optional[str] = Query(None, description="Exact NRC number match (overrides search)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page's X-Next-Cursor header (overrides skip)"),
     db: AsyncIOMotorDatabase = Depends(get_db),
-    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR", "FARMER"]))
+    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR", "FARMER"])),
+    scope: dict = Depends(get_operator_scope)
 ):
     """
     List all farmers with pagination and filtering.
@@ -217,11 +230,16 @@ async def list_farmers(
     - `limit`: Max records per page (default: 20, max: 100)
     - `status`: Filter by status (registered/under_review/verified/rejected/pending_documents)
     - `district`: Filter by district name
-    - `search`: Search in farmer_id, name, phone
+    - `search`: Prefix search in farmer_id, name tokens, phone digits (relevance ranked)
+    - `cursor`: Keyset cursor for constant-cost deep paging (overrides `skip`)
+    
+    **Pagination:** When more results may follow, the response carries an
+    `X-Next-Cursor` header; pass it back as `cursor` to fetch the next page.
     
     **Example:**
     ```
     GET /api/farmers?skip=0&limit=20&status=pending&district=Kawambwa
+    GET /api/farmers?limit=20&cursor=eyJ0IjoiMjAyNS0xMS0xN1QxMjowMDowMCIsImlkIjoiNTA3ZjFmNzdiY2Y4NmNkNzk5NDM5MDExIn0
     ```
     
     **Response:**
@@ -245,27 +263,19 @@ async def list_farmers(
         level="DEBUG",
         module="farmers",
         action="list_query",
-        details={"skip": skip, "limit": limit, "status": status, "district": district, "search": search},
+        details={"skip": skip, "limit": limit, "status": status, "district": district, "search": search, "cursor": bool(cursor)},
         endpoint="/api/farmers",
         user_id=current_user.get("email"),
         role=",".join(current_user.get("roles", [])) if current_user.get("roles") else None,
     )
     farmer_service = FarmerService(db)
     
-    # Apply filtering for operators
-    allowed_districts = None
-    created_by_filter = None
-    if current_user.get("roles") and "OPERATOR" in current_user.get("roles", []) and "ADMIN" not in current_user.get("roles", []):
-        # Operator: show farmers in their assigned districts OR created by them
-        user_email = current_user.get("email")
-        operator_doc = await db.operators.find_one({"email": user_email})
-        if operator_doc:
-            allowed_districts = operator_doc.get("assigned_districts", [])
-            created_by_filter = user_email  # Also show farmers created by this operator
-            # If no districts assigned, still show farmers they created (fallback)
-    # Admin sees all farmers (both None)
+    # Operators see farmers in their assigned districts OR created by them;
+    # admins see all farmers (both None)
+    allowed_districts = scope["allowed_districts"]
+    created_by_filter = scope["created_by"]
     
-    farmers = await farmer_service.list_farmers(
+    page = await farmer_service.list_farmers_page(
         skip=skip,
         limit=limit,
         status=status,
@@ -274,8 +284,12 @@ async def list_farmers(
         created_by=created_by_filter,
         farmer_id_exact=farmer_id_exact,
         nrc=nrc,
-        allowed_districts=allowed_districts
+        allowed_districts=allowed_districts,
+        cursor=cursor
     )
+    farmers = page["items"]
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
     
     await log_event(
         level="INFO",
@@ -297,14 +311,20 @@ async def list_farmers(
 async def count_farmers(
     status: Optional[str] = Query(None, regex="^(registered|under_review|verified|rejected|pending_documents)$"),
     district: Optional[str] = Query(None),
+    search: Optional[str] = Query(None, description="Prefix search in name, phone, farmer_id"),
     farmer_id_exact: Optional[str] = Query(None, description="Exact farmer_id match"),
     nrc: Optional[str] = Query(None, description="Exact NRC match"),
     db: AsyncIOMotorDatabase = Depends(get_db),
-    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR", "FARMER"]))
+    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR", "FARMER"])),
+    scope: dict = Depends(get_operator_scope)
 ):
     """
     Get total farmer count with optional filters.
     
+    Counts with exactly the same filter as `GET /api/farmers`, so the total
+    always matches the listed rows. Use `GET /api/farmers/page` to fetch a
+    page and its total in one request.
+    
     **Example Response:**
     ```
     {
@@ -318,20 +338,14 @@ async def count_farmers(
     """
     farmer_service = FarmerService(db)
     
-    # Apply same operator filtering logic as list endpoint
-    allowed_districts = None
-    created_by_filter = None
-    if current_user.get("roles") and "OPERATOR" in current_user.get("roles", []) and "ADMIN" not in current_user.get("roles", []):
-        user_email = current_user.get("email")
-        operator_doc = await db.operators.find_one({"email": user_email})
-        if operator_doc:
-            allowed_districts = operator_doc.get("assigned_districts", [])
-            # If no districts assigned, operator sees nothing (secure default)
-    # Admin sees all farmers (both None)
+    # Apply same operator scope as list endpoint
+    allowed_districts = scope["allowed_districts"]
+    created_by_filter = scope["created_by"]
     
     total = await farmer_service.count_farmers(
         status=status,
         district=district,
+        search=search,
         created_by=created_by_filter,
         farmer_id_exact=farmer_id_exact,
         nrc=nrc,
@@ -343,12 +357,266 @@ async def count_farmers(
         "filters": {
             "status": status,
             "district": district,
+            "search": search,
             "farmer_id_exact": farmer_id_exact,
             "nrc": nrc
         }
     }
 
 
+@router.get(
+    "/page",
+    response_model=FarmerListPage,
+    summary="List farmers with total",
+    description="Get a page of farmers, the total match count and optional facet counts in one request (queried concurrently)"
+)
+async def list_farmers_with_total(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum records to return"),
+    status: Optional[str] = Query(None, regex="^(registered|under_review|verified|rejected|pending_documents)$", description="Filter by registration status"),
+    district: Optional[str] = Query(None, description="Filter by district name"),
+    search: Optional[str] = Query(None, description="Prefix search in name, phone, farmer_id (relevance ranked)"),
+    farmer_id_exact: Optional[str] = Query(None, description="Exact farmer_id match (overrides search)"),
+    nrc: Optional[str] = Query(None, description="Exact NRC number match (overrides search)"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page's next_cursor (overrides skip)"),
+    facets: bool = Query(False, description="Include counts by status and district"),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR", "FARMER"])),
+    scope: dict = Depends(get_operator_scope)
+):
+    """
+    List farmers together with the total match count.
+    
+    Replaces the `GET /api/farmers` + `GET /api/farmers/count` pair. The page
+    (the same index-backed query as `GET /api/farmers`) and a count-only
+    `$facet` aggregation over the same filter (total and facets) run
+    concurrently. Unfiltered requests without facets use the collection's
+    estimated count instead.
+    
+    **Permissions:** ADMIN, OPERATOR, or FARMER
+    
+    **Query Parameters:** Same as `GET /api/farmers`, plus
+    - `facets`: Include counts by status and top districts (default: false)
+    
+    **Response:**
+    ```
+    {
+        "items": [{"_id": "...", "farmer_id": "ZM1A2B3C4D", ...}],
+        "total": 150,
+        "next_cursor": "eyJ0IjoiMjAyNS0xMS0xN1QxMjowMDowMCIsImlkIjoi...",
+        "facets": {
+            "status": [{"status": "registered", "count": 120}],
+            "district": [{"district": "Kawambwa", "count": 45}]
+        }
+    }
+    ```
+    """
+    farmer_service = FarmerService(db)
+    
+    # Apply same operator scope as list endpoint
+    allowed_districts = scope["allowed_districts"]
+    created_by_filter = scope["created_by"]
+    
+    return await farmer_service.query_farmers(
+        skip=skip,
+        limit=limit,
+        status=status,
+        district=district,
+        search=search,
+        created_by=created_by_filter,
+        farmer_id_exact=farmer_id_exact,
+        nrc=nrc,
+        allowed_districts=allowed_districts,
+        cursor=cursor,
+        include_facets=facets
+    )
+
+
+# =======================================================
+# Proximity Queries (GeoJSON location, 2dsphere index)
+# =======================================================
+@router.get(
+    "/nearby",
+    response_model=List[FarmerGeoItem],
+    summary="Farmers near a point",
+    description="Farmers with GPS coordinates within a radius of a point, nearest first"
+)
+async def list_farmers_nearby(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the centre"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude of the centre"),
+    radius_km: float = Query(..., gt=0, description="Radius in kilometres"),
+    limit: int = Query(200, ge=1, description="Maximum farmers returned"),
+    status_filter: Optional[str] = Query(None, alias="status", regex="^(registered|under_review|verified|rejected|pending_documents)$", description="Filter by registration status"),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR"])),
+    scope: dict = Depends(get_operator_scope)
+):
+    """
+    Find farmers within `radius_km` of a point, for planning field visits.
+    
+    **Permissions:** ADMIN or OPERATOR (operators only see their scope)
+    
+    **Example:**
+    ```
+    GET /api/farmers/nearby?lat=-11.20&lon=28.89&radius_km=15
+    ```
+    
+    **Response:** Farmer list items plus `latitude`, `longitude` and
+    `distance_m`, nearest first. Farmers without GPS coordinates are not
+    included.
+    """
+    if radius_km > settings.FARMER_GEO_MAX_RADIUS_KM:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"radius_km must be at most {settings.FARMER_GEO_MAX_RADIUS_KM}"
+        )
+    
+    return await FarmerService(db).find_farmers_near(
+        lat=lat,
+        lon=lon,
+        radius_m=radius_km * 1000,
+        limit=min(limit, settings.FARMER_GEO_MAX_RESULTS),
+        status=status_filter,
+        created_by=scope["created_by"],
+        allowed_districts=scope["allowed_districts"]
+    )
+
+
+@router.get(
+    "/within-bbox",
+    response_model=List[FarmerGeoItem],
+    summary="Farmers inside a bounding box",
+    description="Farmers with GPS coordinates inside a longitude/latitude box (e.g. the visible map area)"
+)
+async def list_farmers_within_bbox(
+    min_lon: float = Query(..., ge=-180, le=180),
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    limit: int = Query(200, ge=1, description="Maximum farmers returned"),
+    status_filter: Optional[str] = Query(None, alias="status", regex="^(registered|under_review|verified|rejected|pending_documents)$", description="Filter by registration status"),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR"])),
+    scope: dict = Depends(get_operator_scope)
+):
+    """
+    Find farmers inside a bounding box.
+    
+    **Permissions:** ADMIN or OPERATOR (operators only see their scope)
+    
+    **Example:**
+    ```
+    GET /api/farmers/within-bbox?min_lon=28.7&min_lat=-11.4&max_lon=29.1&max_lat=-11.0
+    ```
+    """
+    try:
+        geometry = bbox_geometry(min_lon, min_lat, max_lon, max_lat)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return await FarmerService(db).find_farmers_within(
+        geometry=geometry,
+        limit=min(limit, settings.FARMER_GEO_MAX_RESULTS),
+        status=status_filter,
+        created_by=scope["created_by"],
+        allowed_districts=scope["allowed_districts"]
+    )
+
+
+@router.post(
+    "/within",
+    response_model=List[FarmerGeoItem],
+    summary="Farmers inside a polygon",
+    description="Farmers with GPS coordinates inside a polygon (e.g. a drawn visit area)"
+)
+async def list_farmers_within_polygon(
+    area: FarmerAreaQuery,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN", "OPERATOR"])),
+    scope: dict = Depends(get_operator_scope)
+):
+    """
+    Find farmers inside a polygon.
+    
+    **Permissions:** ADMIN or OPERATOR (operators only see their scope)
+    
+    **Example Request:**
+    ```
+    {
+        "polygon": [[28.80, -11.30], [29.00, -11.30], [28.90, -11.10]],
+        "status": "verified",
+        "limit": 500
+    }
+    ```
+    """
+    try:
+        geometry = polygon_geometry(area.polygon)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return await FarmerService(db).find_farmers_within(
+        geometry=geometry,
+        limit=min(area.limit, settings.FARMER_GEO_MAX_RESULTS),
+        status=area.status,
+        created_by=scope["created_by"],
+        allowed_districts=scope["allowed_districts"]
+    )
+
+
+@router.post(
+    "/location-check",
+    summary="Re-check farmer locations",
+    description="Check every geolocated farmer's district / chiefdom against the boundary polygons"
+)
+async def check_farmer_locations(
+    fill_missing: bool = Query(False, description="Fill empty codes of consistent addresses from GPS"),
+    sample: int = Query(50, ge=0, le=500, description="Maximum problem farmers listed"),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Re-check the whole collection against the loaded boundaries
+    (GEO_BOUNDARIES_PATH), e.g. after loading new boundary data.
+    
+    **Permissions:** ADMIN only
+    
+    Mismatched addresses are only reported (they need review); with
+    `fill_missing=true`, consistent addresses get their empty codes filled.
+    
+    **Example Response:**
+    ```
+    {
+        "checked": 120000,
+        "consistent": 118500,
+        "outside": 300,
+        "mismatched": 1200,
+        "fillable": 40000,
+        "filled": 0,
+        "boundaries_version": "3f2a9c1b7d4e",
+        "samples": [{"farmer_id": "ZM1A2B3C4D", "problems": ["GPS coordinates lie in district LP06 (Mansa District), not LP05"]}]
+    }
+    ```
+    """
+    if not geo_boundaries.loaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Geo boundaries are not loaded (set GEO_BOUNDARIES_PATH)"
+        )
+    
+    result = await FarmerService(db).check_locations(fill_missing=fill_missing, sample_limit=sample)
+    
+    await log_event(
+        level="INFO",
+        module="farmers",
+        action="location_check",
+        details={k: v for k, v in result.items() if k != "samples"},
+        endpoint="/api/farmers/location-check",
+        user_id=current_user.get("email"),
+        role=",".join(current_user.get("roles", [])) if current_user.get("roles") else None,
+    )
+    return result
+
+
 # =======================================================
 # GET Single Farmer
 # =======================================================
@@ -589,7 +857,7 @@ async def review_farmer(
     )
     
     # Also update reviewed_by and reviewed_at metadata
-    await db.farmers.update_one(
+    previous = await db.farmers.find_one_and_update(
         {"farmer_id": farmer_id},
         {
             "$set": {
@@ -599,8 +867,12 @@ async def review_farmer(
                 "reviewed_at": now,
                 "updated_at": now
             }
-        }
+        },
+        projection=STATS_PROJECTION,
+        return_document=ReturnDocument.BEFORE
     )
+    if previous is not None:
+        await farmer_service.record_change(previous, {**previous, "registration_status": new_status})
     
     # Fetch and return updated farmer
     updated_farmer = await farmer_service.get_farmer_by_id(farmer_id)
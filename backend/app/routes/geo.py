@@ -8,9 +8,12 @@ Collections:
 - chiefdoms: Traditional authority areas within districts
 
 Hierarchy: Province → District → Chiefdom
+
+All reads are served from the in-memory geo store (app.services.geo_store),
+loaded at startup and reloaded when the data version changes.
 """
 
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
 from typing import Optional, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field, ConfigDict
@@ -18,12 +21,36 @@ from functools import lru_cache
 import logging
 
 from app.database import get_db
+from app.middleware.cache_policy import CachePolicy, cache_policies
+from app.services.geo_boundaries import geo_boundaries
+from app.services.geo_store import GeoSnapshot, geo_store, serialize_geo_doc  # noqa: F401 (re-exported)
+from app.utils.etag import etag_matches
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/geo", tags=["Geographic Data"])
 
 
+def _geo_version_token() -> Optional[str]:
+    # Only a recently verified version may answer 304 without the handler;
+    # otherwise the handler runs (and re-checks the stored version) first
+    snapshot = geo_store.checked_snapshot()
+    if snapshot is None:
+        return None
+    token = f"geo-{snapshot.version}-{snapshot.fingerprint}"
+    return f"{token}-{geo_boundaries.version}" if geo_boundaries.version else token
+
+
+# Reference data: reusable for 5 minutes, then revalidated against the geo
+# data and boundaries versions (304 without running the handler while they
+# are unchanged). The version endpoint itself is never cached.
+cache_policies.register("/api/geo/version", None)
+cache_policies.register(
+    "/api/geo/{path:path}",
+    CachePolicy(max_age=300, stale_while_revalidate=86400, private=False, version=_geo_version_token),
+)
+
+
 # =======================================================
 # Pydantic Models
 # =======================================================
@@ -79,45 +106,16 @@ class Chiefdom(BaseModel):
 # =======================================================
 # Helper Functions
 # =======================================================
-def serialize_geo_doc(doc: dict, exclude_id: bool = True) -> dict:
-    """
-    Serialize MongoDB geographic document to JSON-safe dict.
-    
-    Args:
-        doc: MongoDB document
-        exclude_id: Whether to exclude _id field
-    
-    Returns:
-        dict: Serialized document
-    """
-    import math
-    
-    if not doc:
-        return None
-    
-    result = {}
-    for key, value in doc.items():
-        if exclude_id and key == "_id":
-            continue
-        
-        # Handle ObjectId
-        if hasattr(value, '__class__') and value.__class__.__name__ == 'ObjectId':
-            result[key] = str(value)
-        # Handle NaN and Inf values (convert to None for JSON compliance)
-        elif isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-            result[key] = None
-        else:
-            result[key] = value
-    
-    # Map database field names to API field names
-    if "province_id" in result and "province_code" not in result:
-        result["province_code"] = result.pop("province_id")
-    if "district_id" in result and "district_code" not in result:
-        result["district_code"] = result.pop("district_id")
-    if "chiefdom_id" in result and "chiefdom_code" not in result:
-        result["chiefdom_code"] = result.pop("chiefdom_id")
-    
-    return result
+async def load_geo_snapshot(db: AsyncIOMotorDatabase) -> GeoSnapshot:
+    """Current geo store snapshot, as a 500 if it cannot be loaded"""
+    try:
+        return await geo_store.get(db)
+    except Exception as e:
+        logger.error(f"Error loading geographic data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to load geographic data: {str(e)}"
+        )
 
 
 # =======================================================
@@ -151,31 +149,10 @@ async def list_provinces(
     ]
     ```
     """
-    try:
-        # Query provinces, sorted by name
-        cursor = db.provinces.find({}).sort("province_name", 1)
-        provinces = await cursor.to_list(length=100)
-        
-        if not provinces:
-            logger.warning("No provinces found in database")
-            return []
-        
-        # DEBUG: Log first province structure
-        if provinces:
-            logger.info(f"First province keys: {list(provinces[0].keys())}")
-        
-        # Serialize and return
-        result = [serialize_geo_doc(p) for p in provinces]
-        logger.info(f"Retrieved {len(result)} provinces")
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error retrieving provinces: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve provinces: {str(e)}"
-        )
+    snapshot = await load_geo_snapshot(db)
+    if not snapshot.provinces:
+        logger.warning("No provinces found in database")
+    return snapshot.provinces
 
 
 @router.get(
@@ -202,27 +179,14 @@ async def get_province(
     }
     ```
     """
-    try:
-        province = await db.provinces.find_one({
-            "province_id": province_code.upper()
-        })
-        
-        if not province:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Province {province_code} not found"
-            )
-        
-        return serialize_geo_doc(province)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error retrieving province {province_code}: {e}")
+    snapshot = await load_geo_snapshot(db)
+    province = snapshot.provinces_by_code.get(province_code.upper())
+    if not province:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve province: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Province {province_code} not found"
         )
+    return province
 
 
 # =======================================================
@@ -268,32 +232,10 @@ async def list_districts(
     ]
     ```
     """
-    try:
-        # Build query
-        query = {}
-        if province_code:
-            query["province_id"] = province_code.upper()
-        
-        # Execute query, sorted by name
-        cursor = db.districts.find(query).sort("district_name", 1)
-        districts = await cursor.to_list(length=500)
-        
-        if not districts:
-            logger.warning(f"No districts found for query: {query}")
-            return []
-        
-        # Serialize and return
-        result = [serialize_geo_doc(d) for d in districts]
-        logger.info(f"Retrieved {len(result)} districts")
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error retrieving districts: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve districts: {str(e)}"
-        )
+    snapshot = await load_geo_snapshot(db)
+    if province_code:
+        return snapshot.districts_by_province.get(province_code.upper(), [])
+    return snapshot.districts
 
 
 @router.get(
@@ -321,27 +263,14 @@ async def get_district(
     }
     ```
     """
-    try:
-        district = await db.districts.find_one({
-            "district_id": district_code.upper()
-        })
-        
-        if not district:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"District {district_code} not found"
-            )
-        
-        return serialize_geo_doc(district)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error retrieving district {district_code}: {e}")
+    snapshot = await load_geo_snapshot(db)
+    district = snapshot.districts_by_code.get(district_code.upper())
+    if not district:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve district: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"District {district_code} not found"
         )
+    return district
 
 
 # =======================================================
@@ -387,49 +316,11 @@ async def list_chiefdoms(
     ]
     ```
     """
-    try:
-        # Build query (case-insensitive)
-        query = {}
-        if district_code:
-            # Case-insensitive match
-            query["district_id"] = {
-                "$regex": f"^{district_code}$",
-                "$options": "i"
-            }
-        
-        # Execute query, sorted by name
-        cursor = db.chiefdoms.find(query).sort("chiefdom_name", 1)
-        chiefdoms = await cursor.to_list(length=2000)
-        
-        if not chiefdoms:
-            logger.warning(f"No chiefdoms found for query: {query}")
-            return []
-        
-        # Serialize and normalize field names
-        result = []
-        for c in chiefdoms:
-            try:
-                doc = serialize_geo_doc(c)
-                
-                # Normalize chiefdom_name (handle legacy "chief_name" field)
-                if "chiefdom_name" not in doc and "chief_name" in doc:
-                    doc["chiefdom_name"] = doc.pop("chief_name")
-                
-                result.append(doc)
-                
-            except Exception as e:
-                logger.warning(f"Error processing chiefdom {c.get('chiefdom_code', 'unknown')}: {e}")
-                continue
-        
-        logger.info(f"Retrieved {len(result)} chiefdoms")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error retrieving chiefdoms: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve chiefdoms: {str(e)}"
-        )
+    snapshot = await load_geo_snapshot(db)
+    if district_code:
+        # District codes match case-insensitively
+        return snapshot.chiefdoms_by_district.get(district_code.upper(), [])
+    return snapshot.chiefdoms
 
 
 @router.get(
@@ -457,33 +348,14 @@ async def get_chiefdom(
     }
     ```
     """
-    try:
-        chiefdom = await db.chiefdoms.find_one({
-            "chiefdom_id": chiefdom_code.upper()
-        })
-        
-        if not chiefdom:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Chiefdom {chiefdom_code} not found"
-            )
-        
-        doc = serialize_geo_doc(chiefdom)
-        
-        # Normalize field name
-        if "chiefdom_name" not in doc and "chief_name" in doc:
-            doc["chiefdom_name"] = doc.pop("chief_name")
-        
-        return doc
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error retrieving chiefdom {chiefdom_code}: {e}")
+    snapshot = await load_geo_snapshot(db)
+    chiefdom = snapshot.chiefdoms_by_code.get(chiefdom_code.upper())
+    if not chiefdom:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve chiefdom: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Chiefdom {chiefdom_code} not found"
         )
+    return chiefdom
 
 
 # =======================================================
@@ -495,12 +367,17 @@ async def get_chiefdom(
     description="Get complete province → district → chiefdom hierarchy"
 )
 async def get_geo_hierarchy(
+    request: Request,
     db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
     Get complete geographic hierarchy for form dropdowns.
     
     **Use Case:** Frontend forms with cascading dropdowns
+
+    The hierarchy is rendered once per geo data version and carries a
+    content-hash `ETag`: clients sending it back in `If-None-Match` get
+    `304 Not Modified` without a body.
     
     **Example Response:**
     ```
@@ -526,66 +403,88 @@ async def get_geo_hierarchy(
     }
     ```
     """
-    try:
-        # Fetch all data
-        provinces = await db.provinces.find({}).sort("province_name", 1).to_list(100)
-        districts = await db.districts.find({}).sort("district_name", 1).to_list(500)
-        chiefdoms = await db.chiefdoms.find({}).sort("chiefdom_name", 1).to_list(2000)
-        
-        logger.info(f"Building hierarchy from {len(provinces)} provinces, {len(districts)} districts, {len(chiefdoms)} chiefdoms")
-        
-        # Build hierarchy
-        hierarchy = []
-        
-        for province in provinces:
-            # Use province_id field from MongoDB (will be mapped to province_code by serialize)
-            province_id = province.get("province_id")
-            
-            if not province_id:
-                logger.warning(f"Province {province.get('province_name')} has no province_id")
-                continue  # Skip if no identifier
-            
-            # Get districts for this province
-            province_districts = [
-                d for d in districts 
-                if d.get("province_id") == province_id
-            ]
-            
-            # For each district, get chiefdoms
-            districts_with_chiefdoms = []
-            for district in province_districts:
-                # Use district_id field from MongoDB
-                district_id = district.get("district_id")
-                
-                if not district_id:
-                    continue  # Skip if no identifier
-                
-                district_chiefdoms = [
-                    serialize_geo_doc(c)
-                    for c in chiefdoms
-                    if c.get("district_id", "").upper() == district_id.upper()
-                ]
-                
-                # Normalize chiefdom names
-                for chief in district_chiefdoms:
-                    if "chiefdom_name" not in chief and "chief_name" in chief:
-                        chief["chiefdom_name"] = chief.pop("chief_name")
-                
-                districts_with_chiefdoms.append({
-                    **serialize_geo_doc(district),
-                    "chiefdoms": district_chiefdoms
-                })
-            
-            hierarchy.append({
-                **serialize_geo_doc(province),
-                "districts": districts_with_chiefdoms
-            })
-        
-        return {"provinces": hierarchy}
-        
-    except Exception as e:
-        logger.error(f"Error building geographic hierarchy: {e}")
+    snapshot = await load_geo_snapshot(db)
+    headers = {"ETag": snapshot.hierarchy_etag, "X-Geo-Version": str(snapshot.version)}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.hierarchy_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.hierarchy_body, media_type="application/json", headers=headers)
+
+
+# =======================================================
+# GPS Resolver
+# =======================================================
+@router.get(
+    "/resolve",
+    summary="Resolve GPS coordinates",
+    description="District and chiefdom containing a GPS point (from the boundary polygons)"
+)
+async def resolve_location(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+):
+    """
+    Find the district and chiefdom that contain a GPS point, e.g. to
+    pre-select the dropdowns after capturing coordinates.
+    
+    **Example:**
+    ```
+    GET /api/geo/resolve?lat=-11.20&lon=28.89
+    ```
+    
+    **Example Response:**
+    ```
+    {
+        "province_code": "LP",
+        "district_code": "LP06",
+        "district_name": "Mansa District",
+        "chiefdom_code": "LP06-001",
+        "chiefdom_name": "Chief Chimese"
+    }
+    ```
+    """
+    if not geo_boundaries.loaded:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to build hierarchy: {str(e)}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Geo boundaries are not loaded"
+        )
+    resolved = geo_boundaries.resolve(lat, lon)
+    if resolved is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No district contains these coordinates"
         )
+    return resolved
+
+
+# =======================================================
+# Data Version
+# =======================================================
+@router.get(
+    "/version",
+    summary="Get geographic data version",
+    description="Version counter of the geographic data (changes when entries are added)"
+)
+async def get_geo_version(
+    db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Current version of the geographic reference data.
+
+    Clients cache provinces / districts / chiefdoms and re-download them
+    only when `version` differs from the one they stored.
+
+    **Example Response:**
+    ```
+    {
+        "version": 3,
+        "loaded_at": "2025-01-15T08:30:00",
+        "counts": {"provinces": 10, "districts": 116, "chiefdoms": 288}
+    }
+    ```
+    """
+    snapshot = await load_geo_snapshot(db)
+    return {
+        "version": snapshot.version,
+        "loaded_at": snapshot.loaded_at,
+        "counts": snapshot.counts(),
+    }
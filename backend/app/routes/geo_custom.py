@@ -1,16 +1,20 @@
 # backend/app/routes/geo_custom.py
 """
 Custom geographic data endpoints for adding user-defined locations (Others option).
+
+Codes are allocated atomically and duplicates (same normalized name under
+the same parent) return the existing entry; see GeoCustomService.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from datetime import datetime
 
 from app.database import get_db
 from app.dependencies.roles import require_role
 from app.services.logging_service import log_event
+from app.services.geo_custom_service import GeoCustomService
+from app.services.geo_store import geo_store
 
 
 router = APIRouter(prefix="/geo/custom", tags=["Geographic Data - Custom"])
@@ -30,6 +34,17 @@ class CustomChiefdomCreate(BaseModel):
     district_code: str = Field(..., min_length=2)
 
 
+async def _create(creation, db: AsyncIOMotorDatabase):
+    """Await a GeoCustomService create; new entries bump the geo data version"""
+    try:
+        doc, created = await creation
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if created:
+        await geo_store.bump_version(db)
+    return doc, created
+
+
 @router.post(
     "/provinces",
     status_code=status.HTTP_201_CREATED,
@@ -52,41 +67,13 @@ async def create_custom_province(
         role=",".join(current_user.get("roles", [])),
     )
     
-    # Check if already exists
-    existing = await db.provinces.find_one({"province_name": {"$regex": f"^{payload.province_name}$", "$options": "i"}})
-    if existing:
-        return {
-            "message": "Province already exists",
-            "province_code": existing.get("province_code") or existing.get("province_id"),
-            "province_name": existing.get("province_name"),
-        }
-    
-    # Generate code from name
-    code = "".join([c[0].upper() for c in payload.province_name.split()[:2]])
-    code = code if len(code) >= 2 else (code + "X").ljust(2, "X")
-    
-    # Ensure unique code
-    counter = 1
-    base_code = code
-    while await db.provinces.find_one({"province_code": code}):
-        code = f"{base_code}{counter}"
-        counter += 1
-    
-    doc = {
-        "province_code": code,
-        "province_id": code,
-        "province_name": payload.province_name,
-        "custom_added": True,
-        "added_by": current_user.get("email"),
-        "created_at": datetime.utcnow(),
-    }
-    
-    await db.provinces.insert_one(doc)
-    
+    doc, created = await _create(
+        GeoCustomService(db).create_province(payload.province_name, added_by=current_user.get("email")), db
+    )
     return {
-        "message": "Province added successfully",
-        "province_code": code,
-        "province_name": payload.province_name,
+        "message": "Province added successfully" if created else "Province already exists",
+        "province_code": doc.get("province_code") or doc.get("province_id"),
+        "province_name": doc.get("province_name"),
     }
 
 
@@ -112,45 +99,16 @@ async def create_custom_district(
         role=",".join(current_user.get("roles", [])),
     )
     
-    # Check if already exists
-    existing = await db.districts.find_one({
-        "district_name": {"$regex": f"^{payload.district_name}$", "$options": "i"},
-        "province_code": payload.province_code
-    })
-    if existing:
-        return {
-            "message": "District already exists",
-            "district_code": existing.get("district_code") or existing.get("district_id"),
-            "district_name": existing.get("district_name"),
-        }
-    
-    # Generate code
-    code = f"{payload.province_code}{str(await db.districts.count_documents({'province_code': payload.province_code}) + 1).zfill(2)}"
-    
-    # Ensure unique
-    counter = 1
-    base_code = code
-    while await db.districts.find_one({"district_code": code}):
-        code = f"{base_code}{counter}"
-        counter += 1
-    
-    doc = {
-        "district_code": code,
-        "district_id": code,
-        "district_name": payload.district_name,
-        "province_code": payload.province_code,
-        "province_id": payload.province_code,
-        "custom_added": True,
-        "added_by": current_user.get("email"),
-        "created_at": datetime.utcnow(),
-    }
-    
-    await db.districts.insert_one(doc)
-    
+    doc, created = await _create(
+        GeoCustomService(db).create_district(
+            payload.district_name, payload.province_code, added_by=current_user.get("email")
+        ),
+        db,
+    )
     return {
-        "message": "District added successfully",
-        "district_code": code,
-        "district_name": payload.district_name,
+        "message": "District added successfully" if created else "District already exists",
+        "district_code": doc.get("district_code") or doc.get("district_id"),
+        "district_name": doc.get("district_name"),
     }
 
 
@@ -176,45 +134,14 @@ async def create_custom_chiefdom(
         role=",".join(current_user.get("roles", [])),
     )
     
-    # Check if already exists
-    existing = await db.chiefdoms.find_one({
-        "chiefdom_name": {"$regex": f"^{payload.chiefdom_name}$", "$options": "i"},
-        "district_code": payload.district_code
-    })
-    if existing:
-        return {
-            "message": "Chiefdom already exists",
-            "chiefdom_code": existing.get("chiefdom_code") or existing.get("chiefdom_id"),
-            "chiefdom_name": existing.get("chiefdom_name"),
-        }
-    
-    # Generate code
-    count = await db.chiefdoms.count_documents({"district_code": payload.district_code})
-    code = f"{payload.district_code}-{str(count + 1).zfill(3)}"
-    
-    # Ensure unique
-    counter = 1
-    base_code = code
-    while await db.chiefdoms.find_one({"chiefdom_code": code}):
-        code = f"{base_code}{counter}"
-        counter += 1
-    
-    doc = {
-        "chiefdom_code": code,
-        "chiefdom_id": code,
-        "chiefdom_name": payload.chiefdom_name,
-        "chief_name": payload.chiefdom_name,
-        "district_code": payload.district_code,
-        "district_id": payload.district_code,
-        "custom_added": True,
-        "added_by": current_user.get("email"),
-        "created_at": datetime.utcnow(),
-    }
-    
-    await db.chiefdoms.insert_one(doc)
-    
+    doc, created = await _create(
+        GeoCustomService(db).create_chiefdom(
+            payload.chiefdom_name, payload.district_code, added_by=current_user.get("email")
+        ),
+        db,
+    )
     return {
-        "message": "Chiefdom added successfully",
-        "chiefdom_code": code,
-        "chiefdom_name": payload.chiefdom_name,
+        "message": "Chiefdom added successfully" if created else "Chiefdom already exists",
+        "chiefdom_code": doc.get("chiefdom_code") or doc.get("chiefdom_id"),
+        "chiefdom_name": doc.get("chiefdom_name") or doc.get("chief_name"),
     }
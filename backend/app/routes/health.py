@@ -1,10 +1,15 @@
 # backend/app/routes/health.py
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import MongoClient
 from redis import Redis
 from celery import Celery
 import os
 
+from app.database import get_db
+from app.dependencies.roles import require_admin
+from app.indexes import check_index_drift
+
 router = APIRouter(tags=["Health"])
 
 # Initialize Celery app for health checks
@@ -77,3 +82,19 @@ def full_health_check():
         "status": "ok" if all_ok else "degraded",
         "components": status_report
     }
+
+
+@router.get(
+    "/indexes",
+    summary="Index drift report",
+    description="Admin only. Compare declared MongoDB indexes with the live database."
+)
+async def index_drift(
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin: dict = Depends(require_admin),
+):
+    drift = await check_index_drift(db)
+    return {
+        "status": "ok" if not drift else "drift",
+        "drift": drift
+    }
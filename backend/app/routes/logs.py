@@ -6,6 +6,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.database import get_db
 from app.services.logging_service import LOG_COLLECTION
+from app.services.log_writer import log_writer
 from app.dependencies.roles import require_admin
 
 router = APIRouter()
@@ -66,3 +67,11 @@ async def log_stats(
     ]
     data = await db[LOG_COLLECTION].aggregate(pipeline).to_list(length=1000)
     return {"stats": data}
+
+
+@router.get("/writer", summary="Log writer counters")
+async def log_writer_stats(
+    _admin: dict = Depends(require_admin),
+):
+    """Queue depth and flushed/dropped/failed counters of the batched log writer."""
+    return log_writer.stats()
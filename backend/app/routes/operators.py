@@ -3,13 +3,17 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional, Dict, Any
 from uuid import uuid4
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from app.database import get_db
 from app.dependencies.roles import require_role, require_admin, get_current_user, require_operator
+from app.dependencies.operator_scope import invalidate_operator_scope
+from app.services.principal_cache import principal_cache
+from app.services.report_cache import report_cache, OPERATORS, USERS
 from app.utils.security import hash_password
 from app.models.user import UserRole
 from bson import ObjectId # Import ObjectId
 from app.services.logging_service import log_event
+from app.utils.pagination import KEYSET_SORT, apply_keyset, decode_cursor, next_cursor_from
 
 
 router = APIRouter(prefix="/operators", tags=["Operators"])
@@ -58,44 +62,80 @@ def _doc_to_operator(doc: dict) -> Dict[str, Any]:
     return doc
 
 
-async def _get_operator_stats(operator_id: str, db):
-    """Quick stats for an operator."""
-    # Get operator to check assigned districts
-    operator_doc = await db.operators.find_one({"operator_id": operator_id})
-    assigned_districts = operator_doc.get("assigned_districts", []) if operator_doc else []
-    
-    # Build query based on district assignment or created_by
-    if assigned_districts:
-        # Count farmers in assigned districts
-        farmer_query = {"address.district_name": {"$in": assigned_districts}}
-    else:
-        # No districts assigned - count only farmers created by this operator
-        farmer_query = {"created_by": operator_id}
-    
-    farmer_count = await db.farmers.count_documents(farmer_query)
-    from datetime import timedelta
-    recent_cutoff = datetime.now(timezone.utc) - timedelta(days=30)
-    recent_query = {**farmer_query, "created_at": {"$gte": recent_cutoff}}
-    recent_count = await db.farmers.count_documents(recent_query)
-    pipeline = [
-        {"$match": farmer_query},
+def _stats_scope(operator: dict):
+    """(assigned districts, creator id) - farmers in the districts, or else those the operator created"""
+    districts = [d for d in (operator.get("assigned_districts") or []) if d]
+    return districts, None if districts else operator.get("operator_id")
+
+
+def operator_stats_pipeline(operators: List[dict], recent_cutoff: datetime) -> List[Dict[str, Any]]:
+    """
+    One aggregation for the stats of several operators.
+
+    Farmers are grouped by (district, creator), keeping only the districts
+    assigned to some operator and the creators that are operators without
+    districts (everything else collapses to null), so the result stays
+    small; assemble_operator_stats() sums the groups per operator.
+    """
+    districts, creators = set(), set()
+    for op in operators:
+        op_districts, creator = _stats_scope(op)
+        districts.update(op_districts)
+        if creator:
+            creators.add(creator)
+    districts, creators = sorted(districts), sorted(creators)
+
+    match = []
+    if districts:
+        match.append({"address.district_name": {"$in": districts}})
+    if creators:
+        match.append({"created_by": {"$in": creators}})
+    if not match:
+        return []
+
+    return [
+        {"$match": {"$or": match}},
         {
             "$group": {
-                "_id": None,
+                "_id": {
+                    "district": {"$cond": [{"$in": ["$address.district_name", districts]}, "$address.district_name", None]},
+                    "creator": {"$cond": [{"$in": ["$created_by", creators]}, "$created_by", None]},
+                },
+                "farmers": {"$sum": 1},
+                "recent": {"$sum": {"$cond": [{"$gte": ["$created_at", recent_cutoff]}, 1, 0]}},
                 "total_land": {"$sum": {"$ifNull": ["$farm_info.farm_size_hectares", 0]}},
-                "avg_land": {"$avg": {"$ifNull": ["$farm_info.farm_size_hectares", 0]}},
             }
         },
     ]
-    agg = await db.farmers.aggregate(pipeline).to_list(length=1)
-    total_land = agg[0]["total_land"] if agg else 0
-    avg_land = agg[0]["avg_land"] if agg else 0
-    return {
-        "farmer_count": farmer_count,
-        "recent_registrations_30d": recent_count,
-        "total_land_hectares": total_land,
-        "avg_land_hectares": avg_land,
-    }
+
+
+def assemble_operator_stats(operators: List[dict], rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per-operator stats (keyed by operator_id) from the operator_stats_pipeline() groups."""
+    stats = {}
+    for op in operators:
+        districts, creator = _stats_scope(op)
+        wanted = set(districts)
+        if districts:
+            groups = [row for row in rows if row["_id"].get("district") in wanted]
+        else:
+            groups = [row for row in rows if creator and row["_id"].get("creator") == creator]
+        farmer_count = sum(row["farmers"] for row in groups)
+        total_land = sum(row["total_land"] for row in groups)
+        stats[op.get("operator_id")] = {
+            "farmer_count": farmer_count,
+            "recent_registrations_30d": sum(row["recent"] for row in groups),
+            "total_land_hectares": total_land,
+            "avg_land_hectares": total_land / farmer_count if farmer_count else 0,
+        }
+    return stats
+
+
+async def _get_operator_stats(operators: List[dict], db) -> Dict[str, Dict[str, Any]]:
+    """Quick stats for a page of operators (one aggregation, whatever the page size)."""
+    recent_cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+    pipeline = operator_stats_pipeline(operators, recent_cutoff)
+    rows = await db.farmers.aggregate(pipeline).to_list(length=None) if pipeline else []
+    return assemble_operator_stats(operators, rows)
 
 
 # ---------------------------
@@ -152,6 +192,7 @@ async def create_operator(payload: OperatorCreate, db=Depends(get_db), current_u
         "updated_at": now,
     }
     await db.operators.insert_one(operator_doc)
+    await report_cache.invalidate_tags(OPERATORS, USERS)
 
     out = OperatorOut(
         operator_id=operator_id,
@@ -208,11 +249,11 @@ async def list_operators(
     cursor = db.operators.find(query).skip(skip).limit(limit)
     ops = await cursor.to_list(length=limit)
 
+    stats = await _get_operator_stats(ops, db)
     results = []
     for op in ops:
         op_doc = _doc_to_operator(op)
-        stats = await _get_operator_stats(op_doc["operator_id"], db)
-        op_doc["farmer_count"] = stats["farmer_count"]
+        op_doc.update(stats[op.get("operator_id")])
         results.append(op_doc)
 
     return {"count": len(results), "results": results}
@@ -282,8 +323,8 @@ async def get_operator(operator_id: str, db=Depends(get_db), current_user: dict
         )
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Operator not found")
     op_doc = _doc_to_operator(op)
-    stats = await _get_operator_stats(operator_id, db)
-    op_doc.update(stats)
+    stats = await _get_operator_stats([op], db)
+    op_doc.update(stats[operator_id])
     return op_doc
 
 
@@ -321,6 +362,9 @@ async def update_operator(operator_id: str, payload: OperatorUpdate, db=Depends(
 
     update_data["updated_at"] = datetime.now(timezone.utc)
     await db.operators.update_one({"operator_id": operator_id}, {"$set": update_data})
+    # Assigned districts feed the cached operator scope used by farmer endpoints
+    invalidate_operator_scope(op.get("email"))
+    await report_cache.invalidate_tags(OPERATORS, USERS)
 
     # If 'is_active' status is being updated for the operator, update the corresponding user's 'is_active' status as well.
     if "is_active" in update_data:
@@ -345,6 +389,7 @@ async def update_operator(operator_id: str, payload: OperatorUpdate, db=Depends(
                 {"_id": filter_id},
                 {"$set": {"is_active": update_data["is_active"]}}
             )
+            await principal_cache.invalidate(op.get("email"))
 
     updated = await db.operators.find_one({"operator_id": operator_id})
     return _doc_to_operator(updated)
@@ -369,7 +414,10 @@ async def delete_operator(operator_id: str, db=Depends(get_db)):
         )
 
     await db.operators.delete_one({"operator_id": operator_id})
+    invalidate_operator_scope(op.get("email"))
     await db.users.delete_one({"_id": op["user_id"]})
+    await principal_cache.invalidate(op.get("email"))
+    await report_cache.invalidate_tags(OPERATORS, USERS)
     return {"message": "Operator deleted"}
 
 
@@ -383,13 +431,24 @@ async def get_operator_farmers(
     operator_id: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page's next_cursor (overrides skip)"),
     db=Depends(get_db)
 ):
-    cursor = db.farmers.find({"created_by": operator_id}).skip(skip).limit(limit)
-    farmers = await cursor.to_list(length=limit)
+    try:
+        position = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    query = {"created_by": operator_id}
+    if position is not None:
+        find_cursor = db.farmers.find(apply_keyset(query, position)).sort(KEYSET_SORT).limit(limit)
+    else:
+        find_cursor = db.farmers.find(query).sort(KEYSET_SORT).skip(skip).limit(limit)
+    farmers = await find_cursor.to_list(length=limit)
+    next_cursor = next_cursor_from(farmers, limit)
     for f in farmers:
         f.pop("_id", None)
-    return {"count": len(farmers), "results": farmers}
+    return {"count": len(farmers), "results": farmers, "next_cursor": next_cursor}
 
 
 @router.get(
@@ -403,6 +462,6 @@ async def operator_statistics(operator_id: str, db=Depends(get_db)):
     if not op:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Operator not found")
 
-    stats = await _get_operator_stats(operator_id, db)
-    return {"operator_id": operator_id, "operator_name": op.get("full_name"), **stats}
+    stats = await _get_operator_stats([op], db)
+    return {"operator_id": operator_id, "operator_name": op.get("full_name"), **stats[operator_id]}
 
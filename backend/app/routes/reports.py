@@ -1,9 +1,39 @@
 # backend/app/routes/reports.py
-from fastapi import APIRouter, Depends
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import tempfile
+import time
+from kombu.exceptions import OperationalError as KombuOperationalError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from app.config import settings
 from app.database import get_db
 from app.dependencies.roles import require_role
 from app.services.logging_service import log_event
+from app.services.farmer_export import (
+    build_export_filter,
+    iter_farmer_detail_batches,
+    stream_csv,
+    stream_ndjson,
+)
+from app.models.report_job import ReportJobCreate, ReportJobOut
+from app.services.farmer_columnar import (
+    PARQUET_COMPRESSIONS,
+    ArrowStreamEncoder,
+    ParquetBatchWriter,
+    batched_rows_async,
+    columnar_cursor,
+    require_pyarrow,
+    resolve_columns,
+)
+from app.services.gridfs_service import gridfs_service
+from app.services.registration_rollups import RegistrationRollupService
+from app.services.report_jobs import FINAL_STATUSES, ReportJobService
+from app.services.report_cache import report_cache, FARMERS, OPERATORS as OPERATORS_TAG, USERS as USERS_TAG
+from app.services.stats_service import StatsService, FARMER_COUNTS, FARMERS_THIS_MONTH, USERS, OPERATORS
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -25,22 +55,22 @@ async def dashboard_summary(db=Depends(get_db), current_user: dict = Depends(req
         user_id=current_user.get("email"),
         role="ADMIN",
     )
-    total_farmers = await db.farmers.count_documents({})
-    total_operators = await db.operators.count_documents({})
-    total_users = await db.users.count_documents({})
-
-    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    farmers_this_month = await db.farmers.count_documents({"created_at": {"$gte": month_start}})
-
-    return {
-        "timestamp": datetime.utcnow(),
-        "metrics": {
-            "farmers_total": total_farmers,
-            "operators_total": total_operators,
-            "users_total": total_users,
-            "farmers_registered_this_month": farmers_this_month,
+    async def compute():
+        stats = await StatsService(db).collect({FARMER_COUNTS, FARMERS_THIS_MONTH, USERS, OPERATORS})
+        return {
+            "timestamp": stats.generated_at,
+            "metrics": {
+                "farmers_total": stats.farmers_total,
+                "operators_total": stats.operators_total,
+                "users_total": stats.users_total,
+                "farmers_registered_this_month": stats.farmers_this_month,
+            }
         }
-    }
+
+    result, meta = await report_cache.get_or_compute(
+        "reports.dashboard", compute, scope="ADMIN", tags=(FARMERS, OPERATORS_TAG, USERS_TAG)
+    )
+    return {**result, **meta.as_fields()}
 
 
 @router.get("/farmers-by-region", dependencies=[Depends(require_role(["ADMIN"]))])
@@ -56,35 +86,53 @@ async def farmers_by_region(db=Depends(get_db), current_user: dict = Depends(req
         user_id=current_user.get("email"),
         role="ADMIN",
     )
-    pipeline = [
-        {
-            "$group": {
-                "_id": {
-                    "province": "$address.province_name",
-                    "district": "$address.district_name",
-                },
-                "count": {"$sum": 1},
+    async def compute():
+        pipeline = [
+            {
+                "$group": {
+                    "_id": {
+                        "province": "$address.province_name",
+                        "district": "$address.district_name",
+                    },
+                    "count": {"$sum": 1},
+                }
+            },
+            {"$sort": {"_id.province": 1, "_id.district": 1}},
+        ]
+        results = await db.farmers.aggregate(pipeline).to_list(length=None)
+        formatted = [
+            {
+                "province": r["_id"]["province"],
+                "district": r["_id"]["district"],
+                "farmer_count": r["count"],
             }
-        },
-        {"$sort": {"_id.province": 1, "_id.district": 1}},
-    ]
-    results = await db.farmers.aggregate(pipeline).to_list(length=None)
-    formatted = [
-        {
-            "province": r["_id"]["province"],
-            "district": r["_id"]["district"],
-            "farmer_count": r["count"],
-        }
-        for r in results
-    ]
-    return {"generated_at": datetime.utcnow(), "regions": formatted}
+            for r in results
+        ]
+        return {"regions": formatted}
+
+    result, meta = await report_cache.get_or_compute(
+        "reports.farmers_by_region", compute, scope="ADMIN", tags=(FARMERS,)
+    )
+    return {**meta.as_fields(), **result}
 
 
 @router.get("/operator-performance", dependencies=[Depends(require_role(["ADMIN"]))])
-async def operator_performance(db=Depends(get_db), current_user: dict = Depends(require_role(["ADMIN"]))):
+async def operator_performance(
+    start_date: Optional[datetime] = Query(None, description="Only count farmers registered on/after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only count farmers registered before this time"),
+    db=Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN"])),
+):
     """
     Aggregate stats per operator: total farmers registered, recent registrations (30d).
+
+    Optional start_date/end_date restrict the report to registrations in
+    that window. Operator and admin names are resolved with $lookup in the
+    same aggregation (one round trip).
     """
+    if start_date and end_date and start_date >= end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+
     await log_event(
         level="INFO",
         module="reports",
@@ -93,8 +141,46 @@ async def operator_performance(db=Depends(get_db), current_user: dict = Depends(
         user_id=current_user.get("email"),
         role="ADMIN",
     )
-    cutoff = datetime.utcnow() - timedelta(days=30)
-    pipeline = [
+    async def compute():
+        cutoff = datetime.utcnow() - timedelta(days=30)
+        pipeline = operator_performance_pipeline(cutoff, start_date, end_date)
+        results = await db.farmers.aggregate(pipeline).to_list(length=None)
+        return {
+            "window": {"start_date": start_date, "end_date": end_date},
+            "operators": [format_operator_performance(r) for r in results],
+        }
+
+    result, meta = await report_cache.get_or_compute(
+        "reports.operator_performance",
+        compute,
+        params={"start_date": start_date, "end_date": end_date},
+        scope="ADMIN",
+        tags=(FARMERS, OPERATORS_TAG, USERS_TAG),
+    )
+    return {**meta.as_fields(), **result}
+
+
+def operator_performance_pipeline(
+    recent_cutoff: datetime,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Farmers grouped by created_by with the matching operator / user joined in.
+
+    created_by stores the creator's email, so both lookups are equality
+    joins on the unique email indexes.
+    """
+    pipeline: List[Dict[str, Any]] = []
+    window: Dict[str, datetime] = {}
+    if start_date:
+        window["$gte"] = start_date
+    if end_date:
+        window["$lt"] = end_date
+    if window:
+        pipeline.append({"$match": {"created_at": window}})
+
+    pipeline += [
         {
             "$group": {
                 "_id": "$created_by",
@@ -102,7 +188,7 @@ async def operator_performance(db=Depends(get_db), current_user: dict = Depends(
                 "recent_farmers": {
                     "$sum": {
                         "$cond": [
-                            {"$gte": ["$created_at", cutoff]},
+                            {"$gte": ["$created_at", recent_cutoff]},
                             1,
                             0,
                         ]
@@ -111,120 +197,364 @@ async def operator_performance(db=Depends(get_db), current_user: dict = Depends(
             }
         },
         {"$sort": {"total_farmers": -1}},
-    ]
-    results = await db.farmers.aggregate(pipeline).to_list(length=None)
-
-    out = []
-    for r in results:
-        # created_by stores the email, so look up operator by email
-        op = await db.operators.find_one({"email": r["_id"]}, {"full_name": 1, "email": 1, "operator_id": 1})
-        
-        # If not found in operators, check if it's an admin user
-        if not op:
-            user = await db.users.find_one({"email": r["_id"]}, {"full_name": 1, "email": 1})
-            if user:
-                op = {"full_name": user.get("full_name", "Admin User"), "email": user.get("email")}
-        
-        out.append(
-            {
-                "operator_id": r["_id"],
-                "operator_name": op.get("full_name") if op else r["_id"],  # Use email if name not found
-                "email": op.get("email") if op else r["_id"],
-                "total_farmers": r["total_farmers"],
-                "recent_farmers_30d": r["recent_farmers"],
+        {"$lookup": {"from": "operators", "localField": "_id", "foreignField": "email", "as": "operator"}},
+        {"$lookup": {"from": "users", "localField": "_id", "foreignField": "email", "as": "user"}},
+        {
+            "$project": {
+                "total_farmers": 1,
+                "recent_farmers": 1,
+                "operator": _first_match("$operator"),
+                "user": _first_match("$user"),
             }
-        )
-    return {"generated_at": datetime.utcnow(), "operators": out}
+        },
+    ]
+    return pipeline
+
+
+def _first_match(field: str) -> Dict[str, Any]:
+    """First looked-up document, reduced to full_name and email."""
+    return {
+        "$arrayElemAt": [
+            {"$map": {"input": field, "as": "m", "in": {"full_name": "$$m.full_name", "email": "$$m.email"}}},
+            0,
+        ]
+    }
+
+
+def format_operator_performance(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape one aggregation row; admins (users) stand in for missing operators."""
+    op = row.get("operator")
+    if not op and row.get("user"):
+        user = row["user"]
+        op = {"full_name": user.get("full_name", "Admin User"), "email": user.get("email")}
+
+    return {
+        "operator_id": row["_id"],
+        "operator_name": op.get("full_name") if op else row["_id"],  # Use email if name not found
+        "email": op.get("email") if op else row["_id"],
+        "total_farmers": row["total_farmers"],
+        "recent_farmers_30d": row["recent_farmers"],
+    }
 
 
 @router.get("/activity-trends", dependencies=[Depends(require_role(["ADMIN"]))])
-async def activity_trends(db=Depends(get_db)):
+async def activity_trends(
+    days: int = Query(14, ge=1, le=366, description="Number of days to chart"),
+    db=Depends(get_db),
+):
     """
-    Daily registration count for past 14 days for charting.
+    Daily registration count for the past `days` days for charting.
     """
-    days = 14
-    start = datetime.utcnow() - timedelta(days=days)
-    pipeline = [
-        {"$match": {"created_at": {"$gte": start}}},
-        {
-            "$group": {
-                "_id": {
-                    "year": {"$year": "$created_at"},
-                    "month": {"$month": "$created_at"},
-                    "day": {"$dayOfMonth": "$created_at"},
-                },
-                "count": {"$sum": 1},
-            }
-        },
-        {"$sort": {"_id.year": 1, "_id.month": 1, "_id.day": 1}},
-    ]
-    results = await db.farmers.aggregate(pipeline).to_list(length=None)
-    formatted = [
-        {
-            "date": f"{r['_id']['year']}-{r['_id']['month']:02d}-{r['_id']['day']:02d}",
-            "registrations": r["count"],
+    async def compute():
+        end = datetime.utcnow().date()
+        start = end - timedelta(days=days - 1)
+        rows = await RegistrationRollupService(db).trends(start, end, granularity="day")
+        formatted = [
+            {"date": row["period"], "registrations": row["registrations"]}
+            for row in rows
+        ]
+        return {"trends": formatted}
+
+    result, meta = await report_cache.get_or_compute(
+        "reports.activity_trends", compute, params={"days": days}, scope="ADMIN", tags=(FARMERS,)
+    )
+    return {**meta.as_fields(), **result}
+
+
+@router.get("/registrations", dependencies=[Depends(require_role(["ADMIN"]))])
+async def registration_trends(
+    start_date: Optional[date] = Query(None, description="First day (default: 29 days before end_date)"),
+    end_date: Optional[date] = Query(None, description="Last day, inclusive (default: today, UTC)"),
+    granularity: str = Query("day", regex="^(day|week|month)$", description="Bucket size"),
+    group_by: Optional[str] = Query(None, regex="^(district|operator)$", description="Split each period by district or operator"),
+    district: Optional[str] = Query(None, description="Only count this district"),
+    operator: Optional[str] = Query(None, description="Only count farmers created by this operator (email)"),
+    db=Depends(get_db),
+):
+    """
+    Registrations per day, ISO week (labelled by its Monday) or month over
+    any date range, read from the precomputed registration_rollups.
+    """
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=29)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+    params = {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "granularity": granularity,
+        "group_by": group_by,
+        "district": district,
+        "operator": operator,
+    }
+
+    async def compute():
+        series = await RegistrationRollupService(db).trends(
+            start_date, end_date, granularity, group_by, district, operator
+        )
+        return {
+            "start_date": params["start_date"],
+            "end_date": params["end_date"],
+            "granularity": granularity,
+            "group_by": group_by,
+            "series": series,
         }
-        for r in results
-    ]
-    return {"generated_at": datetime.utcnow(), "trends": formatted}
+
+    result, meta = await report_cache.get_or_compute(
+        "reports.registrations", compute, params=params, scope="ADMIN", tags=(FARMERS,)
+    )
+    return {**meta.as_fields(), **result}
 
 
 @router.get("/farmers-details", dependencies=[Depends(require_role(["ADMIN"]))])
-async def farmers_details_report(db=Depends(get_db)):
+async def farmers_details_report(
+    format: str = Query("json", regex="^(json|csv|ndjson)$", description="json (single body), csv or ndjson (streamed)"),
+    province: Optional[str] = Query(None, description="Filter by province name"),
+    district: Optional[str] = Query(None, description="Filter by district name"),
+    status: Optional[str] = Query(None, description="Filter by registration status"),
+    start_date: Optional[datetime] = Query(None, description="Registered on/after this time"),
+    end_date: Optional[datetime] = Query(None, description="Registered before this time"),
+    db=Depends(get_db),
+):
     """
     Complete farmer details report with all personal and farm information.
+
+    format=csv and format=ndjson stream the rows from a batched cursor, so
+    memory stays flat however many farmers match. format=json keeps the
+    original single-body response.
     """
-    farmers = await db.farmers.find({}, {
-        "farmer_id": 1,
-        "personal_info": 1,
-        "address": 1,
-        "farm_info": 1,
-        "registration_status": 1,
-        "created_by": 1,
-        "created_at": 1,
-        "_id": 0
-    }).sort("created_at", -1).to_list(length=None)
-    
-    # Format the data for better readability
+    if start_date and end_date and start_date >= end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+
+    query = build_export_filter(province, district, status, start_date, end_date)
+
+    if format != "json":
+        stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        body = stream_csv(db, query) if format == "csv" else stream_ndjson(db, query)
+        return StreamingResponse(
+            body,
+            media_type="text/csv" if format == "csv" else "application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename=farmers_details_{stamp}.{format}"},
+        )
+
     formatted_farmers = []
-    for farmer in farmers:
-        personal_info = farmer.get("personal_info", {})
-        address = farmer.get("address", {})
-        farm_info = farmer.get("farm_info", {})
-        
-        # Get crops list
-        crops_list = farm_info.get("crops_grown", [])
-        if not crops_list:
-            crops_list = []
-        
-        # Format names
-        first_name = personal_info.get("first_name", "")
-        last_name = personal_info.get("last_name", "")
-        full_name = f"{first_name} {last_name}".strip()
-        
-        formatted_farmers.append({
-            "farmer_id": farmer.get("farmer_id", ""),
-            "full_name": full_name if full_name else "N/A",
-            "nrc_number": personal_info.get("nrc", ""),
-            "phone_primary": personal_info.get("phone_primary", ""),
-            "phone_secondary": personal_info.get("phone_secondary", ""),
-            "gender": personal_info.get("gender", ""),
-            "date_of_birth": personal_info.get("date_of_birth", ""),
-            "province": address.get("province_name", ""),
-            "district": address.get("district_name", ""),
-            "constituency": address.get("constituency_name", ""),
-            "ward": address.get("ward_name", ""),
-            "village": address.get("village", ""),
-            "total_land_size": farm_info.get("farm_size_hectares", 0),
-            "crops": ", ".join(crops_list) if crops_list else "None",
-            "years_farming": farm_info.get("years_farming", 0),
-            "registration_status": farmer.get("registration_status", ""),
-            "registered_by": farmer.get("created_by", ""),
-            "registration_date": farmer.get("created_at", "").strftime("%Y-%m-%d") if farmer.get("created_at") else "",
-        })
+    async for rows in iter_farmer_detail_batches(db, query):
+        formatted_farmers.extend(rows)
     
     return {
         "generated_at": datetime.utcnow(),
         "total_farmers": len(formatted_farmers),
         "farmers": formatted_farmers
     }
+
+
+# Parquet files are spooled in memory up to this size, then on disk
+PARQUET_SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+
+@router.get("/farmers-export", dependencies=[Depends(require_role(["ADMIN"]))])
+async def farmers_columnar_export(
+    format: str = Query("parquet", regex="^(parquet|arrow)$", description="parquet (file) or arrow (IPC stream)"),
+    columns: Optional[str] = Query(None, description="Comma-separated column names (default: all)"),
+    compression: str = Query("zstd", description="Parquet compression: " + ", ".join(PARQUET_COMPRESSIONS)),
+    province: Optional[str] = Query(None, description="Filter by province name"),
+    district: Optional[str] = Query(None, description="Filter by district name"),
+    status: Optional[str] = Query(None, description="Filter by registration status"),
+    operator: Optional[str] = Query(None, description="Filter by registering operator (email)"),
+    start_date: Optional[datetime] = Query(None, description="Registered on/after this time"),
+    end_date: Optional[datetime] = Query(None, description="Registered before this time"),
+    db=Depends(get_db),
+):
+    """
+    Typed, columnar export of the farmers collection for analytics tools
+    (pandas.read_parquet, DuckDB, pyarrow).
+
+    personal_info, address, farm_info and household_info are flattened into
+    prefixed columns (e.g. address_district_name). Each cursor batch becomes
+    one Parquet row group / Arrow record batch. format=arrow streams as it
+    reads; format=parquet is sent once the file footer is written.
+    """
+    if start_date and end_date and start_date >= end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    if compression not in PARQUET_COMPRESSIONS:
+        raise HTTPException(status_code=400, detail=f"compression must be one of {', '.join(PARQUET_COMPRESSIONS)}")
+    try:
+        selected = resolve_columns(columns.split(",") if columns else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        require_pyarrow()
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    query = build_export_filter(province, district, status, start_date, end_date, created_by=operator)
+    cursor = columnar_cursor(db.farmers, query, selected)
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+
+    if format == "arrow":
+        async def arrow_body():
+            encoder = ArrowStreamEncoder(selected)
+            yield encoder.start()
+            async for rows in batched_rows_async(cursor, selected):
+                if chunk := encoder.encode(rows):
+                    yield chunk
+            yield encoder.finish()
+
+        return StreamingResponse(
+            arrow_body(),
+            media_type="application/vnd.apache.arrow.stream",
+            headers={"Content-Disposition": f"attachment; filename=farmers_{stamp}.arrows"},
+        )
+
+    # The Parquet footer is written last, so the file is built before sending
+    fh = tempfile.SpooledTemporaryFile(max_size=PARQUET_SPOOL_MAX_BYTES)
+    try:
+        with ParquetBatchWriter(fh, selected, compression) as writer:
+            async for rows in batched_rows_async(cursor, selected):
+                writer.write(rows)
+        size = fh.tell()
+        fh.seek(0)
+    except Exception:
+        fh.close()
+        raise
+
+    def parquet_body():
+        with fh:
+            while chunk := fh.read(1024 * 1024):
+                yield chunk
+
+    return StreamingResponse(
+        parquet_body(),
+        media_type="application/vnd.apache.parquet",
+        headers={
+            "Content-Disposition": f"attachment; filename=farmers_{stamp}.parquet",
+            "Content-Length": str(size),
+            "X-Row-Count": str(writer.rows),
+        },
+    )
+
+
+# =======================================================
+# Background Report Jobs
+# =======================================================
+@router.post("/jobs", status_code=202, response_model=ReportJobOut,
+             dependencies=[Depends(require_role(["ADMIN"]))])
+async def submit_report_job(
+    request: ReportJobCreate,
+    db=Depends(get_db),
+    current_user: dict = Depends(require_role(["ADMIN"])),
+):
+    """
+    Queue a report to be generated in the background (CSV, XLSX or PDF).
+
+    An identical request (same report, format and filters) that is still
+    queued or running is returned instead of starting another one
+    (deduplicated=true). Poll GET /reports/jobs/{job_id} or follow
+    GET /reports/jobs/{job_id}/events, then download from download_url.
+    """
+    filters = request.filters
+    if filters.start_date and filters.end_date and filters.start_date >= filters.end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+
+    service = ReportJobService(db)
+    job, created = await service.submit(request, requested_by=current_user.get("email"))
+
+    if created:
+        from app.tasks.report_tasks import generate_report
+
+        try:
+            result = generate_report.apply_async(args=[job["_id"]])
+        except (KombuOperationalError, RedisTimeoutError):
+            logging.exception("Failed to enqueue report job")
+            await service.mark_failed(job["_id"], "Background queue unreachable")
+            raise HTTPException(status_code=503, detail="Service unavailable: background queue unreachable")
+        except Exception:
+            logging.exception("Unexpected error while enqueueing report job")
+            await service.mark_failed(job["_id"], "Could not be queued")
+            raise HTTPException(status_code=500, detail="Internal server error while queuing task")
+        await db.report_jobs.update_one({"_id": job["_id"]}, {"$set": {"celery_task_id": result.id}})
+
+        await log_event(
+            level="INFO",
+            module="reports",
+            action="report_job_submitted",
+            endpoint="/api/reports/jobs",
+            user_id=current_user.get("email"),
+            role="ADMIN",
+            details={"job_id": job["_id"], "report": request.report, "format": request.format},
+        )
+
+    return ReportJobOut.from_mongo(job, deduplicated=not created)
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobOut,
+            dependencies=[Depends(require_role(["ADMIN"]))])
+async def get_report_job(job_id: str, db=Depends(get_db)):
+    """Current status and progress of a report job."""
+    job = await ReportJobService(db).get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return ReportJobOut.from_mongo(job)
+
+
+@router.get("/jobs/{job_id}/events", dependencies=[Depends(require_role(["ADMIN"]))])
+async def report_job_events(job_id: str, db=Depends(get_db)):
+    """
+    Server-sent events with the job status, sent whenever status or progress
+    changes. The stream ends once the job is done or failed (or after
+    REPORT_JOB_STREAM_TIMEOUT_SECONDS).
+    """
+    service = ReportJobService(db)
+    if not await service.get(job_id):
+        raise HTTPException(status_code=404, detail="Report job not found")
+
+    async def events():
+        deadline = time.monotonic() + settings.REPORT_JOB_STREAM_TIMEOUT_SECONDS
+        last = None
+        while True:
+            job = await service.get(job_id)
+            if not job:
+                return
+            state = (job["status"], job.get("rows", 0))
+            if state != last:
+                last = state
+                yield f"event: status\ndata: {ReportJobOut.from_mongo(job).model_dump_json()}\n\n"
+            if job["status"] in FINAL_STATUSES or time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(settings.REPORT_JOB_POLL_INTERVAL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/files/{file_id}", dependencies=[Depends(require_role(["ADMIN"]))])
+async def download_report_file(file_id: str):
+    """Download a generated report from GridFS, streamed chunk by chunk."""
+    try:
+        grid_out = await gridfs_service.open_download_stream(file_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Report file not found")
+
+    metadata = grid_out.metadata or {}
+    if metadata.get("file_type") != "report":
+        raise HTTPException(status_code=404, detail="Report file not found")
+
+    async def chunks():
+        while True:
+            chunk = await grid_out.readchunk()
+            if not chunk:
+                break
+            yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type=metadata.get("content_type", "application/octet-stream"),
+        headers={
+            "Content-Disposition": f"attachment; filename={grid_out.filename}",
+            "Content-Length": str(grid_out.length),
+        },
+    )
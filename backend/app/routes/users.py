@@ -5,6 +5,8 @@ from app.dependencies.roles import require_admin
 from app.models.user import UserCreate, UserOut, UserRole
 from app.utils.security import hash_password
 from app.services.logging_service import log_event
+from app.services.principal_cache import principal_cache
+from app.services.report_cache import report_cache, USERS
 from typing import Optional, List
 from datetime import datetime, timezone
 from pydantic import BaseModel
@@ -100,6 +102,7 @@ async def create_user(
         "updated_at": now
     }
     result = await db.users.insert_one(new_user_doc)
+    await report_cache.invalidate_tags(USERS)
     new_user = await db.users.find_one({"_id": result.inserted_id})
     
     await log_event(
@@ -178,6 +181,9 @@ async def update_user_status(
     if result.modified_count == 0:
         raise HTTPException(status_code=400, detail="Failed to update user status")
     
+    await principal_cache.invalidate(email)
+    await report_cache.invalidate_tags(USERS)
+    
     return {"message": f"User {'activated' if status_update.is_active else 'deactivated'} successfully", "email": email}
 
 
@@ -227,6 +233,9 @@ async def delete_user(
     if result.deleted_count == 0:
         raise HTTPException(status_code=400, detail="Failed to delete user")
     
+    await principal_cache.invalidate(email)
+    await report_cache.invalidate_tags(USERS)
+    
     await log_event(
         level="INFO",
         module="users",
@@ -0,0 +1,310 @@
+# backend/app/services/farmer_columnar.py
+"""
+Columnar (Parquet / Arrow) export of the farmers collection for analytics.
+
+Farmer documents are flattened into typed columns (`personal_info.first_name`
+→ `personal_info_first_name`, ...) and written one cursor batch at a time:
+every batch becomes one Parquet row group or one Arrow IPC record batch, so
+memory stays bounded by the batch size. Only the selected columns are
+projected on the server.
+
+pyarrow is an optional dependency; everything that needs it imports it
+lazily through require_pyarrow().
+
+Usage:
+    columns = resolve_columns(["farmer_id", "address_district_name"])
+    cursor = columnar_cursor(db.farmers, build_export_filter(status="approved"), columns)
+    with open("farmers.parquet", "wb") as fh:
+        write_parquet(fh, columns, batched_rows(cursor, columns, 5000))
+"""
+import io
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+
+# =======================================================
+# Column Schema
+# =======================================================
+# column name → (document path, kind); kinds map to Arrow types in arrow_schema()
+COLUMN_SPECS: Dict[str, Tuple[str, str]] = {
+    "farmer_id": ("farmer_id", "string"),
+    "registration_status": ("registration_status", "string"),
+    "is_active": ("is_active", "bool"),
+    "created_by": ("created_by", "string"),
+    "created_at": ("created_at", "timestamp"),
+    "updated_at": ("updated_at", "timestamp"),
+    "personal_info_first_name": ("personal_info.first_name", "string"),
+    "personal_info_last_name": ("personal_info.last_name", "string"),
+    "personal_info_phone_primary": ("personal_info.phone_primary", "string"),
+    "personal_info_phone_secondary": ("personal_info.phone_secondary", "string"),
+    "personal_info_email": ("personal_info.email", "string"),
+    "personal_info_nrc": ("personal_info.nrc", "string"),
+    "personal_info_date_of_birth": ("personal_info.date_of_birth", "string"),
+    "personal_info_gender": ("personal_info.gender", "string"),
+    "personal_info_ethnic_group": ("personal_info.ethnic_group", "string"),
+    "address_province_code": ("address.province_code", "string"),
+    "address_province_name": ("address.province_name", "string"),
+    "address_district_code": ("address.district_code", "string"),
+    "address_district_name": ("address.district_name", "string"),
+    "address_chiefdom_code": ("address.chiefdom_code", "string"),
+    "address_chiefdom_name": ("address.chiefdom_name", "string"),
+    "address_village": ("address.village", "string"),
+    "address_street": ("address.street", "string"),
+    "address_gps_latitude": ("address.gps_latitude", "float"),
+    "address_gps_longitude": ("address.gps_longitude", "float"),
+    "farm_info_farm_size_hectares": ("farm_info.farm_size_hectares", "float"),
+    "farm_info_crops_grown": ("farm_info.crops_grown", "list"),
+    "farm_info_livestock_types": ("farm_info.livestock_types", "list"),
+    "farm_info_has_irrigation": ("farm_info.has_irrigation", "bool"),
+    "farm_info_years_farming": ("farm_info.years_farming", "int"),
+    "household_info_household_size": ("household_info.household_size", "int"),
+    "household_info_number_of_dependents": ("household_info.number_of_dependents", "int"),
+    "household_info_primary_income_source": ("household_info.primary_income_source", "string"),
+}
+
+PARQUET_COMPRESSIONS = ("zstd", "snappy", "gzip", "none")
+
+
+def require_pyarrow():
+    """
+    Import pyarrow.
+
+    Raises:
+        ImportError: With an install hint if pyarrow is missing
+    """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Columnar export requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def resolve_columns(columns: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Validate a column selection (None or empty selects every column).
+
+    Raises:
+        ValueError: On unknown column names
+    """
+    selected = [c.strip() for c in (columns or []) if c and c.strip()]
+    if not selected:
+        return list(COLUMN_SPECS)
+    unknown = [c for c in selected if c not in COLUMN_SPECS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return list(dict.fromkeys(selected))
+
+
+def columnar_projection(columns: Sequence[str]) -> Dict[str, int]:
+    """Server-side projection of the document fields behind `columns`"""
+    projection = {"_id": 0}
+    for column in columns:
+        projection[COLUMN_SPECS[column][0]] = 1
+    return projection
+
+
+_TRUE_STRINGS = frozenset({"true", "t", "yes", "y", "1"})
+_FALSE_STRINGS = frozenset({"false", "f", "no", "n", "0"})
+
+
+def _coerce_bool(value: Any) -> Optional[bool]:
+    """Booleans, 0/1 and known yes/no strings; anything else is unknown (None)"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_STRINGS:
+            return True
+        if text in _FALSE_STRINGS:
+            return False
+    return None
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Convert a stored value to the column kind; unconvertible values become null."""
+    if value is None or value == "":
+        return None if kind != "string" else value
+    try:
+        if kind == "string":
+            return str(value)
+        if kind == "float":
+            return float(value)
+        if kind == "int":
+            return int(value)
+        if kind == "bool":
+            return _coerce_bool(value)
+        if kind == "timestamp":
+            return value if isinstance(value, datetime) else None
+        if kind == "list":
+            return [str(item) for item in value] if isinstance(value, list) else None
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def flatten_farmer(farmer: Dict[str, Any], columns: Sequence[str]) -> Dict[str, Any]:
+    """Flatten one (projected) farmer document into a typed row."""
+    row = {}
+    for column in columns:
+        path, kind = COLUMN_SPECS[column]
+        value: Any = farmer
+        for part in path.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        row[column] = _coerce(value, kind)
+    return row
+
+
+def arrow_schema(columns: Sequence[str]):
+    """pyarrow schema for the selected columns"""
+    pa = require_pyarrow()
+    types = {
+        "string": pa.string(),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("ms"),
+        "list": pa.list_(pa.string()),
+    }
+    return pa.schema([(column, types[COLUMN_SPECS[column][1]]) for column in columns])
+
+
+# =======================================================
+# Batched Reading
+# =======================================================
+def columnar_cursor(collection, query: Dict[str, Any], columns: Sequence[str], batch_size: Optional[int] = None):
+    """
+    Cursor over the matching farmers in export order (works for motor and pymongo).
+
+    Args:
+        collection: farmers collection (async or sync)
+        query: Filter from build_export_filter()
+        columns: Selected columns
+        batch_size: Documents per cursor batch (defaults to REPORT_EXPORT_BATCH_SIZE)
+    """
+    return (
+        collection.find(query, columnar_projection(columns))
+        .sort([("created_at", -1), ("_id", -1)])
+        .batch_size(batch_size or settings.REPORT_EXPORT_BATCH_SIZE)
+    )
+
+
+def batched_rows(documents: Iterable[Dict[str, Any]], columns: Sequence[str],
+                 batch_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Group flattened rows into batches (sync cursors)."""
+    batch_size = batch_size or settings.REPORT_EXPORT_BATCH_SIZE
+    batch: List[Dict[str, Any]] = []
+    for farmer in documents:
+        batch.append(flatten_farmer(farmer, columns))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def batched_rows_async(cursor, columns: Sequence[str], batch_size: Optional[int] = None):
+    """Group flattened rows into batches (motor cursors)."""
+    batch_size = batch_size or settings.REPORT_EXPORT_BATCH_SIZE
+    batch: List[Dict[str, Any]] = []
+    async for farmer in cursor:
+        batch.append(flatten_farmer(farmer, columns))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# =======================================================
+# Writers
+# =======================================================
+class ParquetBatchWriter:
+    """
+    Writes row batches to a Parquet file, one row group per batch.
+
+    Usage:
+        with ParquetBatchWriter(fh, columns) as writer:
+            for rows in batches:
+                writer.write(rows)
+    """
+
+    def __init__(self, fh: BinaryIO, columns: Sequence[str], compression: str = "zstd"):
+        if compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f"Unsupported Parquet compression: {compression}")
+        pa = require_pyarrow()
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self.schema = arrow_schema(columns)
+        self.rows = 0
+        self._writer = pq.ParquetWriter(
+            fh, self.schema, compression=None if compression == "none" else compression
+        )
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self.schema))
+            self.rows += len(rows)
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def __enter__(self) -> "ParquetBatchWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_parquet(fh: BinaryIO, columns: Sequence[str], batches: Iterable[List[Dict[str, Any]]],
+                  compression: str = "zstd") -> int:
+    """Write every batch to a Parquet file. Returns the row count."""
+    with ParquetBatchWriter(fh, columns, compression) as writer:
+        for rows in batches:
+            writer.write(rows)
+    return writer.rows
+
+
+class ArrowStreamEncoder:
+    """
+    Encodes row batches as an Arrow IPC stream, returning the bytes of each
+    part as it is produced (for chunked HTTP responses).
+
+    Usage:
+        encoder = ArrowStreamEncoder(columns)
+        yield encoder.start()
+        for rows in batches:
+            yield encoder.encode(rows)
+        yield encoder.finish()
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self._pa = require_pyarrow()
+        self.schema = arrow_schema(columns)
+        self._sink = io.BytesIO()
+        self._writer = None
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def start(self) -> bytes:
+        """Stream header (pyarrow may defer the schema message to the first batch)"""
+        self._writer = self._pa.ipc.new_stream(self._sink, self.schema)
+        return self._drain()
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        """One record batch message"""
+        self._writer.write_batch(self._pa.RecordBatch.from_pylist(rows, schema=self.schema))
+        return self._drain()
+
+    def finish(self) -> bytes:
+        """End-of-stream marker"""
+        self._writer.close()
+        return self._drain()
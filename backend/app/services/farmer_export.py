@@ -0,0 +1,219 @@
+# backend/app/services/farmer_export.py
+"""
+Farmer details export.
+
+Builds the rows of the farmers-details report from a batched cursor, so an
+export of the whole collection never holds more than one batch in memory.
+Only the fields the report uses are projected on the server.
+
+Usage:
+    query = build_export_filter(province="Luapula Province", status="approved")
+    return StreamingResponse(stream_csv(db, query), media_type="text/csv")
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config import settings
+
+
+# Column order of the CSV export (and key order of the JSON rows)
+FARMER_DETAIL_COLUMNS = [
+    "farmer_id",
+    "full_name",
+    "nrc_number",
+    "phone_primary",
+    "phone_secondary",
+    "gender",
+    "date_of_birth",
+    "province",
+    "district",
+    "constituency",
+    "ward",
+    "village",
+    "total_land_size",
+    "crops",
+    "years_farming",
+    "registration_status",
+    "registered_by",
+    "registration_date",
+]
+
+FARMER_DETAIL_PROJECTION = {
+    "_id": 0,
+    "farmer_id": 1,
+    "personal_info.first_name": 1,
+    "personal_info.last_name": 1,
+    "personal_info.nrc": 1,
+    "personal_info.phone_primary": 1,
+    "personal_info.phone_secondary": 1,
+    "personal_info.gender": 1,
+    "personal_info.date_of_birth": 1,
+    "address.province_name": 1,
+    "address.district_name": 1,
+    "address.constituency_name": 1,
+    "address.ward_name": 1,
+    "address.village": 1,
+    "farm_info.farm_size_hectares": 1,
+    "farm_info.crops_grown": 1,
+    "farm_info.years_farming": 1,
+    "registration_status": 1,
+    "created_by": 1,
+    "created_at": 1,
+}
+
+
+def build_export_filter(
+    province: Optional[str] = None,
+    district: Optional[str] = None,
+    status: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    created_by: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    MongoDB filter for the export (all arguments optional).
+
+    Args:
+        province: Exact province name
+        district: Exact district name
+        status: Registration status
+        start_date: Registered on/after (inclusive)
+        end_date: Registered before (exclusive)
+        created_by: Email of the registering operator
+    """
+    query: Dict[str, Any] = {}
+    if province:
+        query["address.province_name"] = province
+    if district:
+        query["address.district_name"] = district
+    if status:
+        query["registration_status"] = status
+    if created_by:
+        query["created_by"] = created_by
+    created: Dict[str, datetime] = {}
+    if start_date:
+        created["$gte"] = start_date
+    if end_date:
+        created["$lt"] = end_date
+    if created:
+        query["created_at"] = created
+    return query
+
+
+def format_farmer_detail(farmer: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one (projected) farmer document into a report row."""
+    personal_info = farmer.get("personal_info") or {}
+    address = farmer.get("address") or {}
+    farm_info = farmer.get("farm_info") or {}
+
+    crops_list = farm_info.get("crops_grown") or []
+    full_name = f"{personal_info.get('first_name', '')} {personal_info.get('last_name', '')}".strip()
+    created_at = farmer.get("created_at")
+
+    return {
+        "farmer_id": farmer.get("farmer_id", ""),
+        "full_name": full_name if full_name else "N/A",
+        "nrc_number": personal_info.get("nrc", ""),
+        "phone_primary": personal_info.get("phone_primary", ""),
+        "phone_secondary": personal_info.get("phone_secondary", ""),
+        "gender": personal_info.get("gender", ""),
+        "date_of_birth": personal_info.get("date_of_birth", ""),
+        "province": address.get("province_name", ""),
+        "district": address.get("district_name", ""),
+        "constituency": address.get("constituency_name", ""),
+        "ward": address.get("ward_name", ""),
+        "village": address.get("village", ""),
+        "total_land_size": farm_info.get("farm_size_hectares", 0),
+        "crops": ", ".join(crops_list) if crops_list else "None",
+        "years_farming": farm_info.get("years_farming", 0),
+        "registration_status": farmer.get("registration_status", ""),
+        "registered_by": farmer.get("created_by", ""),
+        "registration_date": created_at.strftime("%Y-%m-%d") if isinstance(created_at, datetime) else "",
+    }
+
+
+# =======================================================
+# Batched Iteration
+# =======================================================
+async def iter_farmer_detail_batches(
+    db: AsyncIOMotorDatabase,
+    query: Dict[str, Any],
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield formatted rows, newest first, one cursor batch at a time.
+
+    Args:
+        db: MongoDB database instance
+        query: Filter from build_export_filter()
+        batch_size: Rows per batch (defaults to REPORT_EXPORT_BATCH_SIZE)
+    """
+    batch_size = batch_size or settings.REPORT_EXPORT_BATCH_SIZE
+    cursor = (
+        db.farmers.find(query, FARMER_DETAIL_PROJECTION)
+        .sort([("created_at", -1), ("_id", -1)])
+        .batch_size(batch_size)
+    )
+    batch: List[Dict[str, Any]] = []
+    async for farmer in cursor:
+        batch.append(format_farmer_detail(farmer))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_farmer_detail_batches_sync(
+    db,
+    query: Dict[str, Any],
+    batch_size: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Synchronous (pymongo) counterpart of iter_farmer_detail_batches() for Celery tasks."""
+    batch_size = batch_size or settings.REPORT_EXPORT_BATCH_SIZE
+    cursor = (
+        db.farmers.find(query, FARMER_DETAIL_PROJECTION)
+        .sort([("created_at", -1), ("_id", -1)])
+        .batch_size(batch_size)
+    )
+    batch: List[Dict[str, Any]] = []
+    for farmer in cursor:
+        batch.append(format_farmer_detail(farmer))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def rows_to_csv(rows: List[Dict[str, Any]], header: bool = False) -> bytes:
+    """Encode rows as CSV (optionally preceded by the header line)."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FARMER_DETAIL_COLUMNS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def rows_to_ndjson(rows: List[Dict[str, Any]]) -> bytes:
+    """Encode rows as newline-delimited JSON."""
+    return "".join(json.dumps(row, default=str) + "\n" for row in rows).encode("utf-8")
+
+
+async def stream_csv(db: AsyncIOMotorDatabase, query: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """CSV export body: header line, then one chunk per batch."""
+    yield rows_to_csv([], header=True)
+    async for rows in iter_farmer_detail_batches(db, query):
+        yield rows_to_csv(rows)
+
+
+async def stream_ndjson(db: AsyncIOMotorDatabase, query: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """NDJSON export body: one chunk per batch."""
+    async for rows in iter_farmer_detail_batches(db, query):
+        yield rows_to_ndjson(rows)
@@ -10,10 +10,14 @@ Responsibilities:
 - Search and filtering
 """
 
+import asyncio
+import logging
 import re
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import HTTPException, status
 
@@ -22,10 +26,39 @@ from app.models.farmer import (
     FarmerUpdate,
     FarmerInDB,
     FarmerOut,
-    FarmerListItem
+    FarmerListItem,
+    FarmerGeoItem,
 )
 from app.utils.crypto_utils import generate_farmer_id, hmac_hash
+from app.utils.pagination import (
+    KEYSET_SORT,
+    apply_keyset,
+    decode_cursor,
+    next_cursor_from,
+)
+from app.utils.search_utils import (
+    build_search_fields,
+    build_search_match,
+    build_relevance_score,
+    normalize_query,
+    SEARCH_CANDIDATE_LIMIT,
+)
+from app.utils.location_utils import (
+    build_location,
+    within_geometry_match,
+    within_radius_stage,
+)
+from app.config import settings
 from app.database import get_farmers_collection
+from app.services.geo_boundaries import geo_boundaries
+from app.services.principal_cache import principal_cache
+from app.services.report_cache import report_cache, FARMERS
+from app.services.farmer_stats_service import FarmerStatsService, STATS_PROJECTION
+from app.services.registration_rollups import RegistrationRollupService, ROLLUP_PROJECTION
+from app.services.stats_service import StatsService, FARMER_COUNTS
+
+
+logger = logging.getLogger(__name__)
 
 
 # =======================================================
@@ -36,6 +69,33 @@ ZAMBIA_LON_RANGE = (21.0, 34.0)
 NRC_PATTERN = re.compile(r"^\d{6}/\d{2}/\d$")
 ZAMBIA_PHONE_PATTERN = re.compile(r"^(\+260|0)[0-9]{9}$")
 
+# Fields needed to build a FarmerListItem, including legacy flat fallbacks.
+# Pushed down to MongoDB so list pages never ship household/farm info or
+# document arrays over the wire.
+LIST_ITEM_PROJECTION = {
+    "farmer_id": 1,
+    "registration_status": 1,
+    "created_at": 1,
+    "is_active": 1,
+    "review_notes": 1,
+    "personal_info.first_name": 1,
+    "personal_info.last_name": 1,
+    "personal_info.phone_primary": 1,
+    "address.district_name": 1,
+    "address.district": 1,
+    "address.village": 1,
+    # Legacy flat structure
+    "first_name": 1,
+    "last_name": 1,
+    "phone_primary": 1,
+}
+
+# Number of district buckets returned by query_farmers(include_facets=True)
+FACET_DISTRICT_LIMIT = 20
+
+# List item fields plus what proximity results add
+GEO_ITEM_PROJECTION = {**LIST_ITEM_PROJECTION, "location": 1, "distance_m": 1}
+
 
 class FarmerService:
     """
@@ -52,6 +112,8 @@ class FarmerService:
         """
         self.db = db
         self.collection = db.farmers
+        self.stats = FarmerStatsService(db)
+        self.rollups = RegistrationRollupService(db)
     
     # =======================================================
     # 1️⃣ CREATE Operations
@@ -111,8 +173,20 @@ class FarmerService:
                 salt="nrc"
             )
         
+        # Precomputed, normalized search keys (served by the search_keys index)
+        farmer_doc["search"] = build_search_fields(farmer_doc)
+        
+        # Empty address codes (e.g. chiefdom) are filled in from the GPS point
+        self._fill_address_from_gps(farmer_doc["address"])
+        
+        # GeoJSON point for proximity queries (served by location_2dsphere)
+        location = build_location(farmer_doc["address"])
+        if location:
+            farmer_doc["location"] = location
+        
         # Insert into database
         result = await self.collection.insert_one(farmer_doc)
+        await self.record_change(None, farmer_doc)
         
         # Fetch and return the created farmer
         created_farmer = await self.collection.find_one({"_id": result.inserted_id})
@@ -177,7 +251,20 @@ class FarmerService:
         
         return FarmerOut.from_mongo(farmer)
     
-    async def list_farmers(
+    async def list_farmers(self, **kwargs) -> List[FarmerListItem]:
+        """
+        List farmers with pagination and filtering.
+        
+        Accepts the same arguments as list_farmers_page() and returns only
+        the items (for callers that do not use cursors).
+        
+        Returns:
+            List[FarmerListItem]: List of farmer summaries
+        """
+        page = await self.list_farmers_page(**kwargs)
+        return page["items"]
+    
+    async def list_farmers_page(
         self,
         skip: int = 0,
         limit: int = 100,
@@ -187,26 +274,176 @@ class FarmerService:
         created_by: Optional[str] = None,
         farmer_id_exact: Optional[str] = None,
         nrc: Optional[str] = None,
-        allowed_districts: Optional[List[str]] = None
-    ) -> List[FarmerListItem]:
+        allowed_districts: Optional[List[str]] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        List farmers with pagination and filtering.
+        List farmers with pagination and filtering, returning a page cursor.
         
         Args:
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
             status: Filter by registration status
             district: Filter by district name
-            search: Search in name, phone, farmer_id (ignored if farmer_id_exact or nrc provided)
+            search: Prefix search over name tokens, phone digits and farmer_id,
+                ranked by relevance (ignored if farmer_id_exact or nrc provided)
             created_by: Filter by operator email (for operators viewing their own farmers)
             farmer_id_exact: Exact farmer_id match (short-circuits other text search)
             nrc: Exact NRC number (hash lookup; short-circuits other search)
             allowed_districts: List of districts operator is allowed to see (None = all)
+            cursor: Opaque keyset cursor from a previous page's next_cursor.
+                Relevance-ranked search results are paged with skip only.
         
         Returns:
-            List[FarmerListItem]: List of farmer summaries
+            Dict with "items" (List[FarmerListItem]) and "next_cursor"
+        
+        Raises:
+            HTTPException: 400 if the cursor is malformed
+        """
+        position = self._decode_cursor(cursor)
+        query, search_terms = self._build_list_filter(
+            status=status,
+            district=district,
+            search=search,
+            created_by=created_by,
+            farmer_id_exact=farmer_id_exact,
+            nrc=nrc,
+            allowed_districts=allowed_districts,
+        )
+        
+        pipeline = self._items_pipeline(query, search_terms, position, skip, limit)
+        farmers = await self.collection.aggregate(pipeline).to_list(length=limit)
+        
+        return {
+            "items": [self._to_list_item(farmer) for farmer in farmers],
+            "next_cursor": None if search_terms else next_cursor_from(farmers, limit),
+        }
+    
+    async def query_farmers(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        district: Optional[str] = None,
+        search: Optional[str] = None,
+        created_by: Optional[str] = None,
+        farmer_id_exact: Optional[str] = None,
+        nrc: Optional[str] = None,
+        allowed_districts: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        include_facets: bool = False
+    ) -> Dict[str, Any]:
+        """
+        List a page of farmers together with the total match count (and
+        optional facet counts), issued concurrently.
+        
+        The page is the same index-backed aggregation as list_farmers_page().
+        Filtered queries count with a count-only $facet over the shared
+        filter; unfiltered queries read the total from collection metadata
+        (estimated_document_count) instead of counting.
+        
+        Args:
+            Same as list_farmers_page(), plus:
+            include_facets: Also return counts by status and district
+        
+        Returns:
+            Dict with "items", "total", "next_cursor" and "facets"
+        
+        Raises:
+            HTTPException: 400 if the cursor is malformed
+        """
+        position = self._decode_cursor(cursor)
+        query, search_terms = self._build_list_filter(
+            status=status,
+            district=district,
+            search=search,
+            created_by=created_by,
+            farmer_id_exact=farmer_id_exact,
+            nrc=nrc,
+            allowed_districts=allowed_districts,
+        )
+        items_pipeline = self._items_pipeline(query, search_terms, position, skip, limit)
+        
+        if not query and not include_facets:
+            farmers, total = await asyncio.gather(
+                self.collection.aggregate(items_pipeline).to_list(length=limit),
+                self.collection.estimated_document_count(),
+            )
+            facets = None
+        else:
+            # Counts only: a $facet branch cannot use indexes, so the sorted
+            # page runs as its own (index-backed) aggregation alongside
+            branches = {"total": [{"$count": "count"}]}
+            if include_facets:
+                branches["by_status"] = [
+                    {"$group": {"_id": "$registration_status", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}},
+                ]
+                branches["by_district"] = [
+                    {"$group": {"_id": "$address.district_name", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}},
+                    {"$limit": FACET_DISTRICT_LIMIT},
+                ]
+            
+            counts_pipeline = [{"$facet": branches}]
+            if query:
+                counts_pipeline.insert(0, {"$match": query})
+            
+            farmers, result = await asyncio.gather(
+                self.collection.aggregate(items_pipeline).to_list(length=limit),
+                self.collection.aggregate(counts_pipeline).to_list(length=1),
+            )
+            result = result[0] if result else {}
+            total_rows = result.get("total", [])
+            total = total_rows[0]["count"] if total_rows else 0
+            facets = None
+            if include_facets:
+                facets = {
+                    "status": [
+                        {"status": f["_id"], "count": f["count"]}
+                        for f in result.get("by_status", [])
+                    ],
+                    "district": [
+                        {"district": f["_id"], "count": f["count"]}
+                        for f in result.get("by_district", [])
+                    ],
+                }
+        
+        return {
+            "items": [self._to_list_item(farmer) for farmer in farmers],
+            "total": total,
+            "next_cursor": None if search_terms else next_cursor_from(farmers, limit),
+            "facets": facets,
+        }
+    
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]):
+        """Decode a keyset cursor, mapping malformed input to HTTP 400."""
+        try:
+            return decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    @staticmethod
+    def _build_list_filter(
+        status: Optional[str] = None,
+        district: Optional[str] = None,
+        search: Optional[str] = None,
+        created_by: Optional[str] = None,
+        farmer_id_exact: Optional[str] = None,
+        nrc: Optional[str] = None,
+        allowed_districts: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Build the MongoDB filter shared by list, count and combined queries.
+        
+        Returns:
+            Tuple of (filter, normalized search terms). Search terms are
+            non-empty only when relevance-ranked search is active.
         """
-        # Build query filter
         query = {}
         
         if status:
@@ -235,65 +472,111 @@ class FarmerService:
             query["address.district_name"] = district
         
         # Exact farmer_id match takes precedence over search
+        search_terms = []
         if farmer_id_exact:
             query["farmer_id"] = farmer_id_exact
         # NRC exact (hashed) match takes precedence if farmer_id_exact not provided
         elif nrc:
             query["nrc_hash"] = hmac_hash(nrc, salt="nrc")
-        elif search and "$or" not in query:
-            # Text search across multiple fields (only if $or not already in query)
-            query["$or"] = [
-                {"farmer_id": {"$regex": search, "$options": "i"}},
-                {"personal_info.first_name": {"$regex": search, "$options": "i"}},
-                {"personal_info.last_name": {"$regex": search, "$options": "i"}},
-                {"personal_info.phone_primary": {"$regex": search, "$options": "i"}},
-            ]
+        elif search:
+            # Anchored prefix match on precomputed search keys (index-served,
+            # user input is regex-escaped)
+            search_terms = normalize_query(search)
+            if search_terms:
+                search_match = build_search_match(search_terms)
+                if "$and" in search_match:
+                    query["$and"] = search_match["$and"]
+                else:
+                    query.update(search_match)
         
-        # Execute query with pagination
-        cursor = self.collection.find(query).skip(skip).limit(limit).sort("created_at", -1)
-        farmers = await cursor.to_list(length=limit)
-        
-        # Transform to list items
-        result = []
-        for farmer in farmers:
-            # Handle legacy created_at (might be empty string or missing)
-            created_at = farmer.get("created_at")
-            if not created_at or created_at == "":
-                created_at = datetime.now(datetime.timezone.utc) if hasattr(datetime, 'timezone') else datetime.utcnow()
-            
-            # Handle legacy address format (district vs district_name)
-            address = farmer.get("address", {})
-            district_name = address.get("district_name") or address.get("district", "Unknown")
-            
-            # Handle both nested (personal_info) and flat structure
-            personal_info = farmer.get("personal_info", {})
-            first_name = personal_info.get("first_name") or farmer.get("first_name", "")
-            last_name = personal_info.get("last_name") or farmer.get("last_name", "")
-            phone_primary = personal_info.get("phone_primary") or farmer.get("phone_primary", "")
-            
-            # Legacy farmer_id placeholder if missing
-            farmer_id_value = farmer.get("farmer_id") or f"LEGACY_{str(farmer['_id'])[-8:].upper()}"
-            
-            result.append(FarmerListItem(
-                _id=str(farmer["_id"]),
-                farmer_id=farmer_id_value,
-                registration_status=farmer.get("registration_status", "registered"),
-                created_at=created_at,
-                first_name=first_name,
-                last_name=last_name,
-                phone_primary=phone_primary,
-                village=address.get("village", ""),
-                district_name=district_name,
-                is_active=farmer.get("is_active", True),
-                review_notes=farmer.get("review_notes"),
-            ))
+        return query, search_terms
+    
+    @staticmethod
+    def _items_pipeline(
+        query: Dict[str, Any],
+        search_terms: List[str],
+        position,
+        skip: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregation stages producing one projected page of list items.
         
-        return result
+        Search results are ranked by relevance (newest first within equal
+        relevance) and paged with skip; at most SEARCH_CANDIDATE_LIMIT
+        matches are scored, so the sort is bounded. Otherwise pages follow
+        the keyset ordering, seeking past `position` when a cursor was given.
+        """
+        stages = []
+        if search_terms:
+            if query:
+                stages.append({"$match": query})
+            stages += [
+                {"$limit": SEARCH_CANDIDATE_LIMIT},
+                {"$addFields": {"_relevance": build_relevance_score(search_terms)}},
+                {"$sort": {"_relevance": -1, "created_at": -1}},
+                {"$skip": skip},
+            ]
+        else:
+            match = apply_keyset(query, position)
+            if match:
+                stages.append({"$match": match})
+            stages.append({"$sort": dict(KEYSET_SORT)})
+            if position is None and skip:
+                stages.append({"$skip": skip})
+        
+        stages += [
+            {"$limit": limit},
+            {"$project": LIST_ITEM_PROJECTION},
+        ]
+        return stages
+    
+    @staticmethod
+    def _to_list_item(farmer: dict) -> FarmerListItem:
+        """
+        Build a FarmerListItem from a (projected) farmer document.
+        
+        Handles legacy documents: empty/missing created_at, flat name/phone
+        fields, `address.district` instead of `district_name`, and missing
+        farmer_id.
+        """
+        # Handle legacy created_at (might be empty string or missing)
+        created_at = farmer.get("created_at")
+        if not created_at or created_at == "":
+            created_at = datetime.now(datetime.timezone.utc) if hasattr(datetime, 'timezone') else datetime.utcnow()
+        
+        # Handle legacy address format (district vs district_name)
+        address = farmer.get("address") or {}
+        district_name = address.get("district_name") or address.get("district", "Unknown")
+        
+        # Handle both nested (personal_info) and flat structure
+        personal_info = farmer.get("personal_info") or {}
+        first_name = personal_info.get("first_name") or farmer.get("first_name", "")
+        last_name = personal_info.get("last_name") or farmer.get("last_name", "")
+        phone_primary = personal_info.get("phone_primary") or farmer.get("phone_primary", "")
+        
+        # Legacy farmer_id placeholder if missing
+        farmer_id_value = farmer.get("farmer_id") or f"LEGACY_{str(farmer['_id'])[-8:].upper()}"
+        
+        return FarmerListItem(
+            _id=str(farmer["_id"]),
+            farmer_id=farmer_id_value,
+            registration_status=farmer.get("registration_status", "registered"),
+            created_at=created_at,
+            first_name=first_name,
+            last_name=last_name,
+            phone_primary=phone_primary,
+            village=address.get("village", ""),
+            district_name=district_name,
+            is_active=farmer.get("is_active", True),
+            review_notes=farmer.get("review_notes"),
+        )
     
     async def count_farmers(
         self,
         status: Optional[str] = None,
         district: Optional[str] = None,
+        search: Optional[str] = None,
         created_by: Optional[str] = None,
         farmer_id_exact: Optional[str] = None,
         nrc: Optional[str] = None,
@@ -302,9 +585,14 @@ class FarmerService:
         """
         Count total farmers with optional filters.
         
+        Uses the same filter as list_farmers_page(), so counts always agree
+        with the listed rows. Without any filter the count is read from
+        collection metadata (estimated_document_count).
+        
         Args:
             status: Filter by registration status
             district: Filter by district name
+            search: Prefix search terms
             created_by: Filter by operator email
             farmer_id_exact: Exact farmer_id match
             nrc: Exact NRC number (hashed)
@@ -313,27 +601,110 @@ class FarmerService:
         Returns:
             int: Total count
         """
-        query = {}
+        query, _ = self._build_list_filter(
+            status=status,
+            district=district,
+            search=search,
+            created_by=created_by,
+            farmer_id_exact=farmer_id_exact,
+            nrc=nrc,
+            allowed_districts=allowed_districts,
+        )
         
-        if status:
-            query["registration_status"] = status
+        if not query:
+            return await self.collection.estimated_document_count()
+        return await self.collection.count_documents(query)
+    
+    async def find_farmers_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+        limit: int,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        allowed_districts: Optional[List[str]] = None
+    ) -> List[FarmerGeoItem]:
+        """
+        Farmers within a radius of a point, nearest first.
         
-        # If allowed_districts is provided, filter by those districts
-        if allowed_districts:
-            query["address.district_name"] = {"$in": allowed_districts}
-        elif district:
-            # Only apply single district filter if allowed_districts not specified
-            query["address.district_name"] = district
+        Args:
+            lat: Centre latitude
+            lon: Centre longitude
+            radius_m: Radius in metres
+            limit: Maximum farmers returned
+            status: Registration status filter
+            created_by: Operator scope - farmers created by this user
+            allowed_districts: Operator scope - farmers in these districts
         
-        if created_by:
-            query["created_by"] = created_by
+        Returns:
+            List[FarmerGeoItem]: Farmers with their distance in metres
+        """
+        query, _ = self._build_list_filter(
+            status=status, created_by=created_by, allowed_districts=allowed_districts
+        )
+        pipeline = [
+            within_radius_stage(lat, lon, radius_m, query),
+            {"$limit": limit},
+            {"$project": GEO_ITEM_PROJECTION},
+        ]
+        farmers = await self.collection.aggregate(pipeline).to_list(length=limit)
+        return [self._to_geo_item(f) for f in farmers]
+    
+    async def find_farmers_within(
+        self,
+        geometry: Dict[str, Any],
+        limit: int,
+        status: Optional[str] = None,
+        created_by: Optional[str] = None,
+        allowed_districts: Optional[List[str]] = None
+    ) -> List[FarmerGeoItem]:
+        """
+        Farmers inside a GeoJSON polygon (e.g. a bounding box).
         
-        if farmer_id_exact:
-            query["farmer_id"] = farmer_id_exact
-        elif nrc:
-            query["nrc_hash"] = hmac_hash(nrc, salt="nrc")
+        Args:
+            geometry: GeoJSON Polygon (see app.utils.location_utils)
+            limit: Maximum farmers returned
+            status: Registration status filter
+            created_by: Operator scope - farmers created by this user
+            allowed_districts: Operator scope - farmers in these districts
         
-        return await self.collection.count_documents(query)
+        Returns:
+            List[FarmerGeoItem]: Farmers inside the polygon
+        
+        Raises:
+            HTTPException: 400 if MongoDB rejects the polygon (e.g. self-intersecting)
+        """
+        query, _ = self._build_list_filter(
+            status=status, created_by=created_by, allowed_districts=allowed_districts
+        )
+        match = {"$and": [query, within_geometry_match(geometry)]} if query else within_geometry_match(geometry)
+        try:
+            farmers = await self.collection.find(match, GEO_ITEM_PROJECTION).limit(limit).to_list(length=limit)
+        except OperationFailure as e:
+            raise self._invalid_area(e)
+        return [self._to_geo_item(f) for f in farmers]
+    
+    @staticmethod
+    def _invalid_area(error: OperationFailure) -> HTTPException:
+        """Map a rejected $geoWithin geometry to HTTP 400."""
+        logger.warning(f"⚠️  Rejected area query: {error}")
+        message = (error.details or {}).get("errmsg") or str(error)
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid area: {message}"
+        )
+    
+    @classmethod
+    def _to_geo_item(cls, farmer: dict) -> FarmerGeoItem:
+        """FarmerListItem of a farmer plus its coordinates and distance"""
+        lon, lat = farmer["location"]["coordinates"]
+        return FarmerGeoItem(
+            **cls._to_list_item(farmer).model_dump(by_alias=True),
+            latitude=lat,
+            longitude=lon,
+            distance_m=farmer.get("distance_m"),
+        )
     
     # =======================================================
     # 3️⃣ UPDATE Operations
@@ -376,6 +747,29 @@ class FarmerService:
                     # Update only the fields provided, keep the rest
                     update_dict[nested_key] = {**existing_nested, **update_dict[nested_key]}
         
+        # Keep search keys in sync with name/phone changes
+        if "personal_info" in update_dict:
+            update_dict["search"] = build_search_fields({**existing, **update_dict})
+        
+        # Changed addresses must agree with their GPS point
+        if "address" in update_dict:
+            problems = self._boundary_problems(update_dict["address"])
+            if problems:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={"message": "Validation failed", "errors": problems},
+                )
+            self._fill_address_from_gps(update_dict["address"])
+        
+        # Keep the GeoJSON point in sync with the GPS coordinates
+        update_ops = {}
+        if "address" in update_dict:
+            location = build_location(update_dict["address"])
+            if location:
+                update_dict["location"] = location
+            elif "location" in existing:
+                update_ops["$unset"] = {"location": ""}
+        
         # Add updated timestamp
         now = datetime.now(datetime.timezone.utc) if hasattr(datetime, 'timezone') else datetime.utcnow()
         update_dict["updated_at"] = now
@@ -383,11 +777,12 @@ class FarmerService:
         # Perform update
         await self.collection.update_one(
             {"farmer_id": farmer_id},
-            {"$set": update_dict}
+            {"$set": update_dict, **update_ops}
         )
         
         # If 'is_active' is in the update, also update the user record
         if "is_active" in update_dict:
+            await principal_cache.invalidate(farmer_id)
             farmer = await self.collection.find_one({"farmer_id": farmer_id})
             if farmer and farmer.get("personal_info", {}).get("email"):
                 user_email = farmer["personal_info"]["email"]
@@ -395,9 +790,11 @@ class FarmerService:
                     {"email": user_email},
                     {"$set": {"is_active": update_dict["is_active"]}}
                 )
+                await principal_cache.invalidate(user_email)
 
         # Fetch and return updated farmer
         updated = await self.collection.find_one({"farmer_id": farmer_id})
+        await self.record_change(existing, updated)
         return FarmerOut.from_mongo(updated)
     
     async def update_registration_status(
@@ -426,23 +823,24 @@ class FarmerService:
         
         now = datetime.now(datetime.timezone.utc) if hasattr(datetime, 'timezone') else datetime.utcnow()
         
-        result = await self.collection.update_one(
+        changes = {
+            "registration_status": new_status,
+            "updated_at": now
+        }
+        previous = await self.collection.find_one_and_update(
             {"farmer_id": farmer_id},
-            {
-                "$set": {
-                    "registration_status": new_status,
-                    "updated_at": now
-                }
-            }
+            {"$set": changes},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Farmer {farmer_id} not found"
             )
         
-        updated = await self.collection.find_one({"farmer_id": farmer_id})
+        updated = {**previous, **changes}
+        await self.record_change(previous, updated)
         return FarmerOut.from_mongo(updated)
     
     async def update_documents(
@@ -473,6 +871,176 @@ class FarmerService:
         
         return {"success": True, "modified": result.modified_count}
     
+    async def backfill_search_keys(self, batch_size: int = 500) -> int:
+        """
+        Populate the `search` sub-document on farmers that predate it.
+        
+        Args:
+            batch_size: Number of updates sent per bulk_write
+        
+        Returns:
+            int: Number of farmers updated
+        """
+        cursor = self.collection.find(
+            {"search.keys": {"$exists": False}},
+            {"farmer_id": 1, "personal_info": 1, "first_name": 1, "last_name": 1, "phone_primary": 1}
+        )
+        
+        updated = 0
+        batch = []
+        async for farmer in cursor:
+            batch.append(UpdateOne(
+                {"_id": farmer["_id"]},
+                {"$set": {"search": build_search_fields(farmer)}}
+            ))
+            if len(batch) >= batch_size:
+                result = await self.collection.bulk_write(batch, ordered=False)
+                updated += result.modified_count
+                batch = []
+        
+        if batch:
+            result = await self.collection.bulk_write(batch, ordered=False)
+            updated += result.modified_count
+        
+        return updated
+    
+    async def backfill_locations(self, batch_size: int = 500) -> int:
+        """
+        Populate the GeoJSON `location` on farmers with GPS coordinates
+        that predate it.
+        
+        Args:
+            batch_size: Number of updates sent per bulk_write
+        
+        Returns:
+            int: Number of farmers updated
+        """
+        cursor = self.collection.find(
+            {
+                "location": {"$exists": False},
+                "address.gps_latitude": {"$type": "number"},
+                "address.gps_longitude": {"$type": "number"},
+            },
+            {"address.gps_latitude": 1, "address.gps_longitude": 1}
+        )
+        
+        updated = 0
+        batch = []
+        async for farmer in cursor:
+            location = build_location(farmer.get("address"))
+            if not location:
+                continue
+            batch.append(UpdateOne({"_id": farmer["_id"]}, {"$set": {"location": location}}))
+            if len(batch) >= batch_size:
+                result = await self.collection.bulk_write(batch, ordered=False)
+                updated += result.modified_count
+                batch = []
+        
+        if batch:
+            result = await self.collection.bulk_write(batch, ordered=False)
+            updated += result.modified_count
+        
+        return updated
+    
+    async def check_locations(
+        self,
+        fill_missing: bool = False,
+        sample_limit: int = 50,
+        batch_size: int = 500
+    ) -> Dict[str, Any]:
+        """
+        Re-check every geolocated farmer's address codes against the
+        boundary polygons.
+        
+        Fills go through the normal write bookkeeping: statistics and
+        registration rollups get the deltas of every filled farmer (a filled
+        district_name moves it out of the "unknown" bucket) and cached
+        reports are invalidated.
+        
+        Args:
+            fill_missing: Fill empty codes (e.g. chiefdom) of consistent
+                addresses from the GPS point; mismatches are never changed
+            sample_limit: Maximum problem farmers listed in the result
+            batch_size: Number of updates sent per bulk_write
+        
+        Returns:
+            Dict with counts (checked, consistent, outside, mismatched,
+            fillable, filled) and a sample of problem farmers
+        """
+        counts = {"checked": 0, "consistent": 0, "outside": 0, "mismatched": 0, "fillable": 0, "filled": 0}
+        samples = []
+        batch: List[Tuple[dict, Dict[str, str]]] = []
+        
+        cursor = self.collection.find(
+            {"location": {"$exists": True}},
+            {
+                **STATS_PROJECTION,
+                **ROLLUP_PROJECTION,
+                "farmer_id": 1,
+                "address.gps_latitude": 1,
+                "address.gps_longitude": 1,
+                "address.province_code": 1,
+                "address.district_code": 1,
+                "address.chiefdom_code": 1,
+                "address.chiefdom_name": 1,
+            }
+        )
+        async for farmer in cursor:
+            counts["checked"] += 1
+            address = farmer.get("address") or {}
+            resolved, problems = geo_boundaries.check_address(address)
+            if problems:
+                counts["outside" if resolved is None else "mismatched"] += 1
+                if len(samples) < sample_limit:
+                    samples.append({"farmer_id": farmer.get("farmer_id"), "problems": problems})
+                continue
+            
+            counts["consistent"] += 1
+            missing = geo_boundaries.missing_fields(address, resolved)
+            if not missing:
+                continue
+            counts["fillable"] += 1
+            if fill_missing:
+                batch.append((farmer, missing))
+                if len(batch) >= batch_size:
+                    counts["filled"] += await self._apply_address_fills(batch)
+                    batch = []
+        
+        if batch:
+            counts["filled"] += await self._apply_address_fills(batch)
+        if counts["filled"]:
+            await report_cache.invalidate_tags(FARMERS)
+        
+        return {**counts, "boundaries_version": geo_boundaries.version, "samples": samples}
+    
+    async def _apply_address_fills(self, batch: List[Tuple[dict, Dict[str, str]]]) -> int:
+        """
+        Write address fills and apply their statistics / rollup deltas
+        (summed over the batch: one stats $inc, one $inc per rollup bucket).
+        
+        Args:
+            batch: (projected farmer, address fields to set) pairs
+        
+        Returns:
+            int: Number of farmers modified
+        """
+        result = await self.collection.bulk_write([
+            UpdateOne(
+                {"_id": farmer["_id"]},
+                {"$set": {f"address.{name}": value for name, value in missing.items()}}
+            )
+            for farmer, missing in batch
+        ], ordered=False)
+        changes = [
+            (farmer, {**farmer, "address": {**(farmer.get("address") or {}), **missing}})
+            for farmer, missing in batch
+        ]
+        await asyncio.gather(
+            self.stats.apply_many(changes),
+            self.rollups.apply_many(changes)
+        )
+        return result.modified_count
+    
     # =======================================================
     # 4️⃣ DELETE Operations
     # =======================================================
@@ -486,8 +1054,15 @@ class FarmerService:
         Returns:
             bool: True if deleted, False if not found
         """
-        result = await self.collection.delete_one({"farmer_id": farmer_id})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete(
+            {"farmer_id": farmer_id},
+            projection={**STATS_PROJECTION, **ROLLUP_PROJECTION}
+        )
+        await principal_cache.invalidate(farmer_id)
+        if deleted is None:
+            return False
+        await self.record_change(deleted, None)
+        return True
     
     # =======================================================
     # 5️⃣ Validation Helpers
@@ -549,6 +1124,10 @@ class FarmerService:
                     errors.append(f"Longitude out of Zambia bounds ({ZAMBIA_LON_RANGE[0]} to {ZAMBIA_LON_RANGE[1]})")
             except (TypeError, ValueError):
                 errors.append("Invalid GPS coordinates (must be numbers)")
+            
+            # Chosen district / chiefdom must contain the GPS point
+            if not errors:
+                errors.extend(self._boundary_problems(address))
         
         # --- Phone number ---
         phone = personal.get("phone_primary")
@@ -565,6 +1144,31 @@ class FarmerService:
                 },
             )
     
+    @staticmethod
+    def _boundary_problems(address: dict) -> List[str]:
+        """
+        Disagreements between an address's codes and its GPS point.
+        
+        Returned in GEO_BOUNDARY_CHECK=enforce mode, only logged in warn
+        mode; empty when boundaries are not loaded or the check is off.
+        """
+        if settings.GEO_BOUNDARY_CHECK == "off":
+            return []
+        _, problems = geo_boundaries.check_address(address)
+        if problems and settings.GEO_BOUNDARY_CHECK == "warn":
+            logger.warning(f"⚠️  GPS boundary check: {'; '.join(problems)}")
+            return []
+        return problems
+    
+    @staticmethod
+    def _fill_address_from_gps(address: dict) -> None:
+        """Fill empty address codes (e.g. chiefdom) from the GPS point, in place"""
+        if settings.GEO_BOUNDARY_CHECK == "off" or not isinstance(address, dict):
+            return
+        resolved, problems = geo_boundaries.check_address(address)
+        if not problems:
+            address.update(geo_boundaries.missing_fields(address, resolved))
+    
     async def _check_duplicate_nrc(self, nrc: str) -> None:
         """
         Check if NRC already exists in database.
@@ -611,6 +1215,25 @@ class FarmerService:
     # =======================================================
     # 6️⃣ Statistics & Analytics
     # =======================================================
+    async def record_change(
+        self,
+        before: Optional[dict],
+        after: Optional[dict]
+    ) -> None:
+        """
+        Update the materialized statistics after a farmer write and
+        invalidate cached reports.
+        
+        Args:
+            before: Farmer before the write (None for inserts)
+            after: Farmer after the write (None for deletes)
+        """
+        await asyncio.gather(
+            self.stats.apply(before, after),
+            self.rollups.apply(before, after)
+        )
+        await report_cache.invalidate_tags(FARMERS)
+    
     async def get_statistics(self) -> Dict[str, Any]:
         """
         Get farmer statistics for dashboard.
@@ -618,36 +1241,12 @@ class FarmerService:
         Returns:
             Dict with farmer counts by status, district, etc.
         """
-        total = await self.collection.count_documents({})
-        pending = await self.collection.count_documents({"registration_status": "pending"})
-        approved = await self.collection.count_documents({"registration_status": "approved"})
-        rejected = await self.collection.count_documents({"registration_status": "rejected"})
-        
-        # Aggregate by district
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$address.district_name",
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"count": -1}
-            },
-            {
-                "$limit": 10
-            }
-        ]
-        
-        districts = await self.collection.aggregate(pipeline).to_list(length=10)
+        stats = await StatsService(self.db).collect({FARMER_COUNTS})
         
         return {
-            "total_farmers": total,
-            "pending": pending,
-            "approved": approved,
-            "rejected": rejected,
-            "by_district": [
-                {"district": d["_id"], "count": d["count"]} 
-                for d in districts
-            ]
+            "total_farmers": stats.farmers_total,
+            "pending": stats.status_count("pending"),
+            "approved": stats.status_count("approved"),
+            "rejected": stats.status_count("rejected"),
+            "by_district": [d.model_dump() for d in stats.farmers_by_district]
         }
@@ -0,0 +1,239 @@
+# backend/app/services/farmer_stats_service.py
+"""
+Materialized farmer statistics.
+
+Dashboards used to count the farmers collection on every page load. The
+counts now live in a single `farmer_stats` document:
+
+    {
+        "_id": "global",
+        "total": 1520,
+        "by_status": {"pending": 310, "approved": 1100, ...},
+        "by_district": {"Mansa District": 240, ...},
+        "by_province": {"Luapula Province": 610, ...},
+        "by_operator": {"OP-1A2B3C": 85, ...},
+        "updated_at": ...,
+        "reconciled_at": ...
+    }
+
+Every farmer write path (create, update, review, status change, delete,
+mobile sync) applies the difference it makes with a single atomic `$inc`.
+reconcile() rebuilds the document from the farmers collection; it runs
+when the document is missing and periodically from Celery to repair any
+drift (e.g. writes made directly in the database).
+
+Bucket values are used as field names, so "." and "$" are escaped (see
+encode_key/decode_key).
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+STATS_COLLECTION = "farmer_stats"
+STATS_ID = "global"
+
+UNKNOWN = "unknown"
+
+# Bucket name → farmer field it counts by
+DIMENSIONS = {
+    "by_status": "registration_status",
+    "by_district": "address.district_name",
+    "by_province": "address.province_name",
+    "by_operator": "created_by",
+}
+
+# Fields a write path must load to compute its stats delta
+STATS_PROJECTION = {
+    "registration_status": 1,
+    "address.district_name": 1,
+    "address.province_name": 1,
+    "created_by": 1,
+}
+
+
+# =======================================================
+# Pure helpers (shared with the synchronous Celery tasks)
+# =======================================================
+def encode_key(value: Any) -> str:
+    """Turn a bucket value into a safe MongoDB field name."""
+    if value is None or value == "":
+        return UNKNOWN
+    return str(value).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def decode_key(key: str) -> str:
+    """Inverse of encode_key()."""
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+
+def _get_path(doc: Optional[Dict[str, Any]], path: str) -> Any:
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def stats_increments(farmer: Optional[Dict[str, Any]], sign: int) -> Dict[str, int]:
+    """
+    $inc paths contributed by one farmer document.
+
+    Args:
+        farmer: Farmer document (at least STATS_PROJECTION fields), or None
+        sign: +1 when the farmer is counted in, -1 when counted out
+    """
+    if farmer is None:
+        return {}
+    increments = {"total": sign}
+    for bucket, field in DIMENSIONS.items():
+        increments[f"{bucket}.{encode_key(_get_path(farmer, field))}"] = sign
+    return increments
+
+
+def stats_delta(
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+) -> Dict[str, int]:
+    """
+    Net $inc needed when a farmer changes from `before` to `after`.
+
+    Use before=None for inserts and after=None for deletes. Paths that net
+    to zero are dropped, so an update touching no counted field yields {}.
+    """
+    delta: Dict[str, int] = {}
+    for path, value in list(stats_increments(before, -1).items()) + list(stats_increments(after, 1).items()):
+        delta[path] = delta.get(path, 0) + value
+    return {path: value for path, value in delta.items() if value != 0}
+
+
+def merge_stats_deltas(deltas: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Sum several stats_delta() results (zero paths dropped)."""
+    merged: Dict[str, int] = {}
+    for delta in deltas:
+        for path, value in delta.items():
+            merged[path] = merged.get(path, 0) + value
+    return {path: value for path, value in merged.items() if value != 0}
+
+
+def stats_update(delta: Dict[str, int]) -> Dict[str, Any]:
+    """Update document applying a delta to the stats document."""
+    return {
+        "$inc": delta,
+        "$set": {"updated_at": datetime.now(timezone.utc)},
+    }
+
+
+def reconcile_pipeline() -> List[Dict[str, Any]]:
+    """Aggregation computing every stats bucket from the farmers collection."""
+    facets = {"total": [{"$count": "count"}]}
+    for bucket, field in DIMENSIONS.items():
+        facets[bucket] = [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+    return [{"$facet": facets}]
+
+
+def stats_document_from_facets(result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the stats document from the reconcile_pipeline() output."""
+    result = result or {}
+    total_rows = result.get("total") or []
+    now = datetime.now(timezone.utc)
+    doc = {
+        "_id": STATS_ID,
+        "total": total_rows[0]["count"] if total_rows else 0,
+        "updated_at": now,
+        "reconciled_at": now,
+    }
+    for bucket in DIMENSIONS:
+        counts: Dict[str, int] = {}
+        for row in result.get(bucket, []):
+            key = encode_key(row["_id"])
+            counts[key] = counts.get(key, 0) + row["count"]
+        doc[bucket] = counts
+    return doc
+
+
+def decode_stats(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode bucket keys and drop buckets that have reached zero."""
+    decoded = {
+        "total": doc.get("total", 0),
+        "updated_at": doc.get("updated_at"),
+        "reconciled_at": doc.get("reconciled_at"),
+    }
+    for bucket in DIMENSIONS:
+        decoded[bucket] = {
+            decode_key(key): count
+            for key, count in (doc.get(bucket) or {}).items()
+            if count
+        }
+    return decoded
+
+
+# =======================================================
+# Async service
+# =======================================================
+class FarmerStatsService:
+    """
+    Reads and maintains the materialized farmer_stats document.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[STATS_COLLECTION]
+
+    async def apply(
+        self,
+        before: Optional[Dict[str, Any]],
+        after: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Apply the change of one farmer from `before` to `after`.
+
+        Args:
+            before: Farmer before the write (None for inserts)
+            after: Farmer after the write (None for deletes)
+        """
+        delta = stats_delta(before, after)
+        if not delta:
+            return
+        await self.collection.update_one({"_id": STATS_ID}, stats_update(delta), upsert=True)
+
+    async def apply_many(self, changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]) -> None:
+        """
+        Apply the changes of many farmers with a single $inc.
+
+        Args:
+            changes: (before, after) pairs, as for apply()
+        """
+        delta = merge_stats_deltas(stats_delta(before, after) for before, after in changes)
+        if not delta:
+            return
+        await self.collection.update_one({"_id": STATS_ID}, stats_update(delta), upsert=True)
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Current statistics, reconciling first if the document does not exist.
+
+        Returns:
+            Dict with total, by_status, by_district, by_province, by_operator
+        """
+        doc = await self.collection.find_one({"_id": STATS_ID})
+        if doc is None or doc.get("reconciled_at") is None:
+            doc = await self.reconcile()
+        return decode_stats(doc)
+
+    async def reconcile(self) -> Dict[str, Any]:
+        """
+        Rebuild the stats document from the farmers collection.
+
+        Increments that land while the aggregation runs are overwritten;
+        the next reconcile corrects them.
+
+        Returns:
+            dict: The raw (encoded) stats document that was stored
+        """
+        result = await self.db.farmers.aggregate(reconcile_pipeline()).to_list(length=1)
+        doc = stats_document_from_facets(result[0] if result else None)
+        await self.collection.replace_one({"_id": STATS_ID}, doc, upsert=True)
+        return doc
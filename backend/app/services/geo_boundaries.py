@@ -0,0 +1,345 @@
+# backend/app/services/geo_boundaries.py
+"""
+Geo Boundaries - resolve GPS coordinates to district and chiefdom.
+
+District and chiefdom boundary polygons are loaded once per worker from a
+local GeoJSON FeatureCollection (GEO_BOUNDARIES_PATH). Each feature is a
+Polygon or MultiPolygon whose properties carry its codes:
+
+    {"district_code": "LP06", "district_name": "Mansa District", "province_code": "LP"}
+    {"chiefdom_code": "LP05-002", "chiefdom_name": "Chief Chama", "district_code": "LP05"}
+
+(`*_id` keys and `chief_name` are accepted as in the geo collections.)
+
+Spatial index:
+- Each level (districts, chiefdoms) gets a uniform grid of
+  GEO_BOUNDARY_GRID_DEGREES cells.
+- A cell crossed by no edge of a polygon whose centre lies inside it is
+  entirely inside that polygon ("interior" cell); found with one scanline
+  pass per grid row at load time.
+- Lookups in interior cells are a single dict hit; points in boundary
+  cells are tested with ray casting against the few polygons whose edges
+  cross that cell (after a bounding-box check).
+
+Usage:
+    resolved = geo_boundaries.resolve(lat=-11.2, lon=28.89)
+    resolved.district_code  # "LP06"
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import math
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+Ring = List[Tuple[float, float]]
+Cell = Tuple[int, int]
+
+
+# =======================================================
+# Geometry
+# =======================================================
+def point_in_ring(x: float, y: float, ring: Ring) -> bool:
+    """Ray casting (even-odd) test of a point against a closed or open ring"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _edges(ring: Ring) -> Iterable[Tuple[Tuple[float, float], Tuple[float, float]]]:
+    return zip(ring, ring[1:] + ring[:1])
+
+
+@dataclass
+class Boundary:
+    """One district or chiefdom polygon (possibly multi-part, with holes)"""
+    level: str
+    code: str
+    name: Optional[str]
+    district_code: Optional[str]
+    province_code: Optional[str]
+    polygons: List[List[Ring]]  # [[outer, hole, ...], ...]
+    bbox: Tuple[float, float, float, float] = field(init=False)
+
+    def __post_init__(self):
+        xs = [x for polygon in self.polygons for x, _ in polygon[0]]
+        ys = [y for polygon in self.polygons for _, y in polygon[0]]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+
+    def contains(self, x: float, y: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        return any(
+            point_in_ring(x, y, polygon[0]) and not any(point_in_ring(x, y, hole) for hole in polygon[1:])
+            for polygon in self.polygons
+        )
+
+    def rings(self) -> Iterable[Ring]:
+        for polygon in self.polygons:
+            yield from polygon
+
+
+class BoundaryGrid:
+    """
+    Uniform-grid index over the boundaries of one level.
+
+    Args:
+        boundaries: Non-overlapping boundaries (e.g. all districts)
+        cell_degrees: Grid cell size in degrees
+    """
+
+    def __init__(self, boundaries: List[Boundary], cell_degrees: float):
+        self.boundaries = boundaries
+        self.cell_degrees = cell_degrees
+        self._interior: Dict[Cell, int] = {}
+        self._crossing: Dict[Cell, List[int]] = {}
+        for index, boundary in enumerate(boundaries):
+            self._add(index, boundary)
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_degrees)
+
+    def _add(self, index: int, boundary: Boundary) -> None:
+        # Cells an edge may pass through (its bounding box, conservatively)
+        crossed = set()
+        for ring in boundary.rings():
+            for (x1, y1), (x2, y2) in _edges(ring):
+                for cx in range(self._cell(min(x1, x2)), self._cell(max(x1, x2)) + 1):
+                    for cy in range(self._cell(min(y1, y2)), self._cell(max(y1, y2)) + 1):
+                        crossed.add((cx, cy))
+        for cell in crossed:
+            self._crossing.setdefault(cell, []).append(index)
+
+        # Interior cells: centre inside (scanline along the row centre) and
+        # no edge crossing the cell
+        size = self.cell_degrees
+        min_x, min_y, max_x, max_y = boundary.bbox
+        for cy in range(self._cell(min_y), self._cell(max_y) + 1):
+            y = (cy + 0.5) * size
+            xs = sorted(
+                x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+                for ring in boundary.rings()
+                for (x1, y1), (x2, y2) in _edges(ring)
+                if (y1 > y) != (y2 > y)
+            )
+            for x_in, x_out in zip(xs[0::2], xs[1::2]):
+                for cx in range(math.ceil(x_in / size - 0.5), math.floor(x_out / size - 0.5) + 1):
+                    if (cx, cy) not in crossed:
+                        self._interior.setdefault((cx, cy), index)
+
+    def find(self, x: float, y: float) -> Optional[Boundary]:
+        """Boundary containing a point (x = longitude, y = latitude), or None"""
+        cell = (self._cell(x), self._cell(y))
+        index = self._interior.get(cell)
+        if index is not None:
+            return self.boundaries[index]
+        for index in self._crossing.get(cell, ()):
+            if self.boundaries[index].contains(x, y):
+                return self.boundaries[index]
+        return None
+
+
+# =======================================================
+# Loading
+# =======================================================
+def _prop(properties: Dict[str, Any], *names: str) -> Optional[str]:
+    for name in names:
+        value = properties.get(name)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def _polygons(geometry: Dict[str, Any]) -> List[List[Ring]]:
+    kind = (geometry or {}).get("type")
+    coordinates = (geometry or {}).get("coordinates") or []
+    if kind == "Polygon":
+        parts = [coordinates]
+    elif kind == "MultiPolygon":
+        parts = coordinates
+    else:
+        return []
+    return [
+        [[(float(point[0]), float(point[1])) for point in ring] for ring in part if len(ring) >= 3]
+        for part in parts
+        if part and len(part[0]) >= 3
+    ]
+
+
+def parse_boundaries(features: Iterable[Dict[str, Any]]) -> Tuple[List[Boundary], List[Boundary]]:
+    """
+    Split GeoJSON features into district and chiefdom boundaries.
+
+    Features without a usable polygon or code are skipped.
+
+    Returns:
+        Tuple[List[Boundary], List[Boundary]]: (districts, chiefdoms)
+    """
+    districts, chiefdoms = [], []
+    for feature in features:
+        properties = feature.get("properties") or {}
+        polygons = _polygons(feature.get("geometry"))
+        if not polygons:
+            continue
+        chiefdom = _prop(properties, "chiefdom_code", "chiefdom_id")
+        district = _prop(properties, "district_code", "district_id")
+        province = _prop(properties, "province_code", "province_id")
+        if chiefdom:
+            chiefdoms.append(Boundary(
+                "chiefdom", chiefdom.upper(), _prop(properties, "chiefdom_name", "chief_name"),
+                district.upper() if district else None, province, polygons,
+            ))
+        elif district:
+            districts.append(Boundary(
+                "district", district.upper(), _prop(properties, "district_name"),
+                district.upper(), province, polygons,
+            ))
+    return districts, chiefdoms
+
+
+# =======================================================
+# Resolver
+# =======================================================
+@dataclass(frozen=True)
+class ResolvedLocation:
+    """Administrative codes at a GPS point (None where no boundary matched)"""
+    province_code: Optional[str] = None
+    district_code: Optional[str] = None
+    district_name: Optional[str] = None
+    chiefdom_code: Optional[str] = None
+    chiefdom_name: Optional[str] = None
+
+
+class BoundaryResolver:
+    """
+    Process-wide GPS → district / chiefdom resolver.
+    """
+
+    def __init__(self, cell_degrees: Optional[float] = None):
+        self.cell_degrees = settings.GEO_BOUNDARY_GRID_DEGREES if cell_degrees is None else cell_degrees
+        self.version: Optional[str] = None
+        self._districts: Optional[BoundaryGrid] = None
+        self._chiefdoms: Optional[BoundaryGrid] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._districts is not None
+
+    def load_features(self, features: Iterable[Dict[str, Any]], version: Optional[str] = None) -> None:
+        """Build the indexes from GeoJSON features (replaces any loaded data)"""
+        districts, chiefdoms = parse_boundaries(features)
+        self._districts = BoundaryGrid(districts, self.cell_degrees)
+        self._chiefdoms = BoundaryGrid(chiefdoms, self.cell_degrees)
+        self.version = version
+        logger.info(
+            f"🧭 Geo boundaries loaded: {len(districts)} districts, {len(chiefdoms)} chiefdoms"
+        )
+
+    def load_file(self, path: str) -> None:
+        """
+        Load a GeoJSON FeatureCollection; its content hash becomes the version.
+
+        Raises:
+            OSError, ValueError: If the file cannot be read or parsed
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+        collection = json.loads(raw)
+        self.load_features(collection.get("features") or [], version=hashlib.sha256(raw).hexdigest()[:12])
+
+    def resolve(self, lat: float, lon: float) -> Optional[ResolvedLocation]:
+        """
+        Administrative codes at a point.
+
+        Returns:
+            ResolvedLocation, or None if no boundaries are loaded or the
+            point is outside every district and chiefdom
+        """
+        if not self.loaded:
+            return None
+        district = self._districts.find(lon, lat)
+        chiefdom = self._chiefdoms.find(lon, lat)
+        if district is None and chiefdom is None:
+            return None
+        district_code = district.code if district else chiefdom.district_code
+        return ResolvedLocation(
+            province_code=(district or chiefdom).province_code,
+            district_code=district_code,
+            district_name=district.name if district else None,
+            chiefdom_code=chiefdom.code if chiefdom else None,
+            chiefdom_name=chiefdom.name if chiefdom else None,
+        )
+
+    def check_address(self, address: Dict[str, Any]) -> Tuple[Optional[ResolvedLocation], List[str]]:
+        """
+        Compare an address's codes with its GPS coordinates.
+
+        Args:
+            address: Farmer address with gps_latitude / gps_longitude
+
+        Returns:
+            Tuple of (resolved location, problems). No problems are reported
+            without coordinates or loaded boundaries.
+        """
+        lat, lon = address.get("gps_latitude"), address.get("gps_longitude")
+        if not self.loaded or lat is None or lon is None:
+            return None, []
+        resolved = self.resolve(float(lat), float(lon))
+        if resolved is None:
+            return None, ["GPS coordinates are outside all known district boundaries"]
+
+        problems = []
+        district_code = (address.get("district_code") or "").upper()
+        if district_code and resolved.district_code and district_code != resolved.district_code:
+            problems.append(
+                f"GPS coordinates lie in district {resolved.district_code}"
+                f"{f' ({resolved.district_name})' if resolved.district_name else ''}, not {district_code}"
+            )
+        chiefdom_code = (address.get("chiefdom_code") or "").upper()
+        if chiefdom_code and resolved.chiefdom_code and chiefdom_code != resolved.chiefdom_code:
+            problems.append(f"GPS coordinates lie in chiefdom {resolved.chiefdom_code}, not {chiefdom_code}")
+        return resolved, problems
+
+    @staticmethod
+    def missing_fields(address: Dict[str, Any], resolved: Optional[ResolvedLocation]) -> Dict[str, str]:
+        """
+        Address fields that are empty but known from the resolved location.
+
+        Returns:
+            Dict[str, str]: Field name → value to fill in
+        """
+        if resolved is None:
+            return {}
+        return {
+            name: value
+            for name, value in (
+                ("province_code", resolved.province_code),
+                ("district_code", resolved.district_code),
+                ("district_name", resolved.district_name),
+                ("chiefdom_code", resolved.chiefdom_code),
+                ("chiefdom_name", resolved.chiefdom_name),
+            )
+            if value and not address.get(name)
+        }
+
+    def clear(self) -> None:
+        """Forget the loaded boundaries (tests)"""
+        self.version = None
+        self._districts = None
+        self._chiefdoms = None
+
+
+# Global instance
+geo_boundaries = BoundaryResolver()
@@ -0,0 +1,336 @@
+# backend/app/services/geo_custom_service.py
+"""
+Geo Custom Service - user-defined provinces, districts and chiefdoms.
+
+Creating an entry costs a constant number of round trips and is safe
+under concurrent operators:
+
+- Codes come from per-parent sequences in the `counters` collection,
+  allocated with one atomic find_one_and_update($inc). A sequence that does
+  not exist yet starts after the entries already stored under its parent.
+- Duplicates are detected by unique indexes on the normalized name
+  (`name_key`, scoped to the parent), not by regex lookups.
+- The document is written with a single upsert on (parent, name_key):
+  an existing entry (also looked up by that index first, so resubmitting
+  a known name allocates nothing) is returned as-is, a new one gets the
+  allocated code.
+  A code that collides with legacy data (unique code index) is retried
+  with the next sequence value.
+
+Usage:
+    service = GeoCustomService(db)
+    doc, created = await service.create_district("Mansa", "LP", added_by=email)
+"""
+from datetime import datetime
+from typing import Awaitable, Callable, Optional, Tuple
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.services.geo_store import COUNTERS_COLLECTION
+
+
+logger = logging.getLogger(__name__)
+
+# Attempts per create before giving up on code collisions with legacy data
+MAX_CODE_ATTEMPTS = 5
+
+
+# =======================================================
+# Naming
+# =======================================================
+def normalize_geo_name(name: str) -> str:
+    """
+    Duplicate-detection key of a geographic name: whitespace collapsed and
+    case folded ("  Mansa   District" → "mansa district").
+    """
+    return " ".join((name or "").split()).casefold()
+
+
+def province_code_prefix(name: str) -> str:
+    """Initials of the first two words, padded with X to two characters"""
+    code = "".join(word[0].upper() for word in name.split()[:2])
+    return code if len(code) >= 2 else (code + "X").ljust(2, "X")
+
+
+def province_code(prefix: str, seq: int) -> str:
+    """The first province with a prefix gets it bare, later ones a number (LP, LP1, LP2...)"""
+    return prefix if seq <= 1 else f"{prefix}{seq - 1}"
+
+
+def district_code(province: str, seq: int) -> str:
+    return f"{province}{str(seq).zfill(2)}"
+
+
+def chiefdom_code(district: str, seq: int) -> str:
+    return f"{district}-{str(seq).zfill(3)}"
+
+
+# =======================================================
+# Service
+# =======================================================
+class GeoCustomService:
+    """Service for adding custom geographic entries"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.counters = db[COUNTERS_COLLECTION]
+
+    async def next_sequence(self, counter_id: str, floor: Callable[[], Awaitable[int]]) -> int:
+        """
+        Atomically allocate the next value of a sequence.
+
+        Args:
+            counter_id: counters document id
+            floor: Returns the number of entries that predate the sequence;
+                only called (once) when the sequence does not exist yet
+
+        Returns:
+            int: The allocated value (1-based)
+        """
+        doc = await self.counters.find_one_and_update(
+            {"_id": counter_id},
+            {"$inc": {"seq": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            start = await floor()
+            try:
+                await self.counters.update_one({"_id": counter_id}, {"$max": {"seq": start}}, upsert=True)
+            except DuplicateKeyError:
+                pass  # another request created it first
+            doc = await self.counters.find_one_and_update(
+                {"_id": counter_id},
+                {"$inc": {"seq": 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        return doc["seq"]
+
+    async def _create(
+        self,
+        collection: str,
+        scope: dict,
+        name_key: str,
+        code_field: str,
+        allocate: Callable[[], Awaitable[str]],
+        fields: Callable[[str], dict],
+    ) -> Tuple[dict, bool]:
+        """
+        Upsert an entry keyed on (scope, name_key).
+
+        Args:
+            collection: Collection name
+            scope: Parent filter ({} for provinces)
+            name_key: normalize_geo_name() of the name
+            code_field: Legacy code field ("province_id", ...)
+            allocate: Allocates a new code
+            fields: Builds the new document for a code
+
+        Returns:
+            Tuple[dict, bool]: The stored document and whether it was created
+
+        Raises:
+            RuntimeError: If no free code was found in MAX_CODE_ATTEMPTS
+        """
+        # Indexed lookup first, so resubmitting a known name burns no code
+        existing = await self.db[collection].find_one({**scope, "name_key": name_key})
+        if existing:
+            return existing, False
+
+        for _ in range(MAX_CODE_ATTEMPTS):
+            code = await allocate()
+            try:
+                doc = await self.db[collection].find_one_and_update(
+                    {**scope, "name_key": name_key},
+                    {"$setOnInsert": fields(code)},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+            except DuplicateKeyError:
+                # Code taken by a legacy entry, or the same name inserted
+                # concurrently (the next upsert then matches it)
+                logger.warning(f"⚠️  Geo code {code} in {collection} collided, retrying")
+                continue
+            return doc, doc.get(code_field) == code
+        raise RuntimeError(f"Could not allocate a free code in {collection}")
+
+    async def create_province(self, name: str, added_by: Optional[str] = None) -> Tuple[dict, bool]:
+        """
+        Add a province (or return the existing one with the same name).
+
+        Returns:
+            Tuple[dict, bool]: The province document and whether it was created
+        """
+        prefix = province_code_prefix(name)
+
+        async def allocate() -> str:
+            floor = lambda: self.db.provinces.count_documents({"province_id": {"$regex": f"^{prefix}[0-9]*$"}})
+            return province_code(prefix, await self.next_sequence(f"geo_code:province:{prefix}", floor))
+
+        return await self._create(
+            "provinces",
+            {},
+            normalize_geo_name(name),
+            "province_id",
+            allocate,
+            lambda code: {
+                "province_code": code,
+                "province_id": code,
+                "province_name": name,
+                "custom_added": True,
+                "added_by": added_by,
+                "created_at": datetime.utcnow(),
+            },
+        )
+
+    async def create_district(self, name: str, province: str, added_by: Optional[str] = None) -> Tuple[dict, bool]:
+        """
+        Add a district to a province (or return the existing one with the same name).
+
+        Returns:
+            Tuple[dict, bool]: The district document and whether it was created
+        """
+        province = province.upper()
+
+        async def allocate() -> str:
+            floor = lambda: self.db.districts.count_documents({"province_id": province})
+            return district_code(province, await self.next_sequence(f"geo_code:district:{province}", floor))
+
+        return await self._create(
+            "districts",
+            {"province_id": province},
+            normalize_geo_name(name),
+            "district_id",
+            allocate,
+            lambda code: {
+                "district_code": code,
+                "district_id": code,
+                "district_name": name,
+                "province_code": province,
+                "custom_added": True,
+                "added_by": added_by,
+                "created_at": datetime.utcnow(),
+            },
+        )
+
+    async def create_chiefdom(self, name: str, district: str, added_by: Optional[str] = None) -> Tuple[dict, bool]:
+        """
+        Add a chiefdom to a district (or return the existing one with the same name).
+
+        Returns:
+            Tuple[dict, bool]: The chiefdom document and whether it was created
+        """
+        district = district.upper()
+
+        async def allocate() -> str:
+            floor = lambda: self.db.chiefdoms.count_documents({"district_id": district})
+            return chiefdom_code(district, await self.next_sequence(f"geo_code:chiefdom:{district}", floor))
+
+        return await self._create(
+            "chiefdoms",
+            {"district_id": district},
+            normalize_geo_name(name),
+            "chiefdom_id",
+            allocate,
+            lambda code: {
+                "chiefdom_code": code,
+                "chiefdom_id": code,
+                "chiefdom_name": name,
+                "chief_name": name,
+                "district_code": district,
+                "custom_added": True,
+                "added_by": added_by,
+                "created_at": datetime.utcnow(),
+            },
+        )
+
+    async def backfill_name_keys(self) -> int:
+        """
+        Set name_key on entries that predate it, so the unique name indexes
+        also catch duplicates of seeded data, and upper-case legacy parent
+        codes (districts' province_id, chiefdoms' district_id) so the scoped
+        lookups and sequence floors of create_* see every entry.
+
+        Runs at startup before the indexes are ensured, so it enforces
+        uniqueness itself: of several entries with the same name under one
+        parent, the oldest keeps (or gets) the name_key and the others are
+        left without one (logged), which keeps the unique indexes buildable.
+        Cheap once done: only entries still needing a change are read.
+
+        Returns:
+            int: Number of documents updated
+        """
+        updated = 0
+        for collection, name_fields, parent_field in (
+            ("provinces", ("province_name",), None),
+            ("districts", ("district_name",), "province_id"),
+            ("chiefdoms", ("chiefdom_name", "chief_name"), "district_id"),
+        ):
+            updated += await self._backfill_collection(collection, name_fields, parent_field)
+        return updated
+
+    async def _backfill_collection(
+        self,
+        collection: str,
+        name_fields: Tuple[str, ...],
+        parent_field: Optional[str],
+    ) -> int:
+        """backfill_name_keys() for one collection"""
+        query = {"name_key": {"$exists": False}}
+        if parent_field:
+            query = {"$or": [query, {
+                parent_field: {"$type": "string"},
+                "$expr": {"$ne": [f"${parent_field}", {"$toUpper": f"${parent_field}"}]},
+            }]}
+        projection = {field: 1 for field in (*name_fields, "name_key", parent_field) if field}
+        pending = await self.db[collection].find(query, projection).sort("_id", 1).to_list(length=None)
+        if not pending:
+            return 0
+
+        def scope(doc: dict) -> Optional[str]:
+            parent = doc.get(parent_field) if parent_field else None
+            return parent.upper() if isinstance(parent, str) else parent
+
+        # (parent, name_key) → _id of the oldest entry holding it
+        owners = {}
+        cursor = self.db[collection].find(
+            {"name_key": {"$type": "string"}},
+            {"name_key": 1, **({parent_field: 1} if parent_field else {})},
+        ).sort("_id", 1)
+        async for doc in cursor:
+            owners.setdefault((scope(doc), doc["name_key"]), doc["_id"])
+
+        updated = 0
+        for doc in pending:
+            update = {}
+            parent = doc.get(parent_field) if parent_field else None
+            if isinstance(parent, str) and parent != parent.upper():
+                update["$set"] = {parent_field: parent.upper()}
+
+            name_key = doc.get("name_key")
+            if name_key is None:
+                name = next((doc[field] for field in name_fields if doc.get(field)), None)
+                if name:
+                    name_key = normalize_geo_name(name)
+                    if owners.setdefault((scope(doc), name_key), doc["_id"]) == doc["_id"]:
+                        update.setdefault("$set", {})["name_key"] = name_key
+                    else:
+                        logger.warning(f"⚠️  Duplicate geo name in {collection}: {name!r} ({doc['_id']}) left without name_key")
+            elif owners.get((scope(doc), name_key)) != doc["_id"]:
+                # Upper-casing the parent made it a duplicate of an older entry
+                update["$unset"] = {"name_key": ""}
+                logger.warning(f"⚠️  Duplicate geo name in {collection}: {name_key!r} ({doc['_id']}) name_key removed")
+
+            if not update:
+                continue
+            try:
+                await self.db[collection].update_one({"_id": doc["_id"]}, update)
+            except DuplicateKeyError:
+                # Same name created concurrently by another worker
+                logger.warning(f"⚠️  Geo name {name_key!r} in {collection} taken concurrently ({doc['_id']})")
+                continue
+            updated += 1
+        return updated
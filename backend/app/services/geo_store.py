@@ -0,0 +1,349 @@
+# backend/app/services/geo_store.py
+"""
+Geo Store - in-memory provinces, districts and chiefdoms.
+
+The geographic reference data changes a few times a year (custom entries
+added through /api/geo/custom), but every dropdown in the apps reads it.
+Each worker loads it once at startup into a GeoSnapshot - serialized
+documents indexed by code and by parent, plus the pre-rendered hierarchy
+body - and serves every /api/geo read from memory.
+
+Versioning:
+- The data version is a counter document in MongoDB
+  (counters/{_id: "geo_version"}). Writers call
+  `await geo_store.bump_version(db)`, which increments it and reloads this
+  worker; scripts that rewrite the collections call
+  `await bump_stored_geo_version(db)`.
+- Other workers compare their snapshot version with the counter, and their
+  document counts with the collections' (metadata counts, so edits that
+  forgot the counter are still noticed), at most every
+  GEO_STORE_VERSION_CHECK_SECONDS and reload when either moved.
+- Each snapshot carries a fingerprint of its content; HTTP version tokens
+  include it, so a reload with new data never matches an old ETag.
+- A reload builds a complete new snapshot and swaps it in with a single
+  assignment, so readers always see one consistent version.
+
+Usage:
+    snapshot = await geo_store.get(db)
+    districts = snapshot.districts_by_province.get("LP", [])
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import json
+import logging
+import math
+import time
+
+from fastapi.encoders import jsonable_encoder
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from app.config import settings
+from app.utils.etag import content_etag
+
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "counters"
+GEO_VERSION_ID = "geo_version"
+GEO_COLLECTIONS = ("provinces", "districts", "chiefdoms")
+
+
+# =======================================================
+# Serialization
+# =======================================================
+def serialize_geo_doc(doc: dict, exclude_id: bool = True) -> dict:
+    """
+    Serialize MongoDB geographic document to JSON-safe dict.
+
+    Args:
+        doc: MongoDB document
+        exclude_id: Whether to exclude _id field
+
+    Returns:
+        dict: Serialized document
+    """
+    if not doc:
+        return None
+
+    result = {}
+    for key, value in doc.items():
+        if exclude_id and key == "_id":
+            continue
+
+        # Handle ObjectId
+        if hasattr(value, '__class__') and value.__class__.__name__ == 'ObjectId':
+            result[key] = str(value)
+        # Handle NaN and Inf values (convert to None for JSON compliance)
+        elif isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+            result[key] = None
+        else:
+            result[key] = value
+
+    # Map database field names to API field names
+    if "province_id" in result and "province_code" not in result:
+        result["province_code"] = result.pop("province_id")
+    if "district_id" in result and "district_code" not in result:
+        result["district_code"] = result.pop("district_id")
+    if "chiefdom_id" in result and "chiefdom_code" not in result:
+        result["chiefdom_code"] = result.pop("chiefdom_id")
+
+    return result
+
+
+def serialize_chiefdom(doc: dict) -> dict:
+    """serialize_geo_doc() plus the legacy "chief_name" → "chiefdom_name" mapping"""
+    result = serialize_geo_doc(doc)
+    if "chiefdom_name" not in result and "chief_name" in result:
+        result["chiefdom_name"] = result.pop("chief_name")
+    return result
+
+
+def build_geo_hierarchy(provinces: List[dict], districts: List[dict], chiefdoms: List[dict]) -> dict:
+    """
+    Nest chiefdoms under districts under provinces in one pass over each list.
+
+    Children are grouped by parent id first (district ids compared
+    case-insensitively, as chiefdom documents are not consistently cased),
+    so the cost is linear in the number of documents. Input order is kept
+    within each level; documents without an id are skipped.
+
+    Args:
+        provinces: Province documents (sorted by name)
+        districts: District documents (sorted by name)
+        chiefdoms: Chiefdom documents (sorted by name)
+
+    Returns:
+        dict: {"provinces": [{..., "districts": [{..., "chiefdoms": [...]}]}]}
+    """
+    chiefdoms_by_district: Dict[str, List[dict]] = {}
+    for chiefdom in chiefdoms:
+        district_id = (chiefdom.get("district_id") or "").upper()
+        chiefdoms_by_district.setdefault(district_id, []).append(serialize_chiefdom(chiefdom))
+
+    districts_by_province: Dict[str, List[dict]] = {}
+    for district in districts:
+        district_id = district.get("district_id")
+        if not district_id:
+            continue
+        districts_by_province.setdefault(district.get("province_id"), []).append({
+            **serialize_geo_doc(district),
+            "chiefdoms": chiefdoms_by_district.get(district_id.upper(), []),
+        })
+
+    hierarchy = []
+    for province in provinces:
+        province_id = province.get("province_id")
+        if not province_id:
+            logger.warning(f"Province {province.get('province_name')} has no province_id")
+            continue
+        hierarchy.append({
+            **serialize_geo_doc(province),
+            "districts": districts_by_province.get(province_id, []),
+        })
+
+    return {"provinces": hierarchy}
+
+
+# =======================================================
+# Snapshot
+# =======================================================
+@dataclass
+class GeoSnapshot:
+    """
+    One consistent version of the geographic data, indexed for the API.
+
+    Lookups by code use the stored ids as-is (callers upper-case the
+    requested code); chiefdoms are grouped by upper-cased district id.
+    Treat every list and dict as read-only - they are shared by all requests.
+    """
+    version: int
+    loaded_at: datetime
+    provinces: List[dict] = field(default_factory=list)
+    districts: List[dict] = field(default_factory=list)
+    chiefdoms: List[dict] = field(default_factory=list)
+    provinces_by_code: Dict[str, dict] = field(default_factory=dict)
+    districts_by_code: Dict[str, dict] = field(default_factory=dict)
+    districts_by_province: Dict[str, List[dict]] = field(default_factory=dict)
+    chiefdoms_by_code: Dict[str, dict] = field(default_factory=dict)
+    chiefdoms_by_district: Dict[str, List[dict]] = field(default_factory=dict)
+    hierarchy_body: str = '{"provinces":[]}'
+    hierarchy_etag: str = ""
+    fingerprint: str = ""
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "provinces": len(self.provinces),
+            "districts": len(self.districts),
+            "chiefdoms": len(self.chiefdoms),
+        }
+
+
+def build_snapshot(version: int, provinces: List[dict], districts: List[dict], chiefdoms: List[dict]) -> GeoSnapshot:
+    """
+    Index raw province / district / chiefdom documents (each sorted by name).
+
+    Args:
+        version: Data version the documents were read at
+        provinces: Province documents
+        districts: District documents
+        chiefdoms: Chiefdom documents
+
+    Returns:
+        GeoSnapshot
+    """
+    snapshot = GeoSnapshot(version=version, loaded_at=datetime.utcnow())
+
+    for doc in provinces:
+        item = serialize_geo_doc(doc)
+        snapshot.provinces.append(item)
+        if doc.get("province_id"):
+            snapshot.provinces_by_code.setdefault(doc["province_id"], item)
+
+    for doc in districts:
+        item = serialize_geo_doc(doc)
+        snapshot.districts.append(item)
+        if doc.get("district_id"):
+            snapshot.districts_by_code.setdefault(doc["district_id"], item)
+        snapshot.districts_by_province.setdefault(doc.get("province_id"), []).append(item)
+
+    for doc in chiefdoms:
+        item = serialize_chiefdom(doc)
+        snapshot.chiefdoms.append(item)
+        if doc.get("chiefdom_id"):
+            snapshot.chiefdoms_by_code.setdefault(doc["chiefdom_id"], item)
+        snapshot.chiefdoms_by_district.setdefault((doc.get("district_id") or "").upper(), []).append(item)
+
+    hierarchy = build_geo_hierarchy(provinces, districts, chiefdoms)
+    snapshot.hierarchy_body = json.dumps(jsonable_encoder(hierarchy), separators=(",", ":"))
+    snapshot.hierarchy_etag = content_etag(snapshot.hierarchy_body.encode("utf-8"))
+    content = json.dumps(
+        jsonable_encoder([snapshot.provinces, snapshot.districts, snapshot.chiefdoms]),
+        separators=(",", ":"),
+    )
+    snapshot.fingerprint = content_etag(content.encode("utf-8")).strip('"')[:12]
+    return snapshot
+
+
+async def bump_stored_geo_version(db: AsyncIOMotorDatabase) -> int:
+    """
+    Increment the stored geo data version (every worker reloads within
+    GEO_STORE_VERSION_CHECK_SECONDS).
+
+    Returns:
+        int: The new version
+    """
+    doc = await db[COUNTERS_COLLECTION].find_one_and_update(
+        {"_id": GEO_VERSION_ID},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["seq"]
+
+
+# =======================================================
+# Store
+# =======================================================
+class GeoStore:
+    """
+    Process-wide holder of the current GeoSnapshot.
+    """
+
+    def __init__(
+        self,
+        check_interval_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.check_interval_seconds = (
+            settings.GEO_STORE_VERSION_CHECK_SECONDS if check_interval_seconds is None else check_interval_seconds
+        )
+        self._clock = clock
+        self._snapshot: Optional[GeoSnapshot] = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self) -> Optional[int]:
+        """Version of the loaded snapshot (None before the first load)"""
+        return self._snapshot.version if self._snapshot else None
+
+    def checked_snapshot(self) -> Optional[GeoSnapshot]:
+        """
+        Snapshot if it was compared with the stored data within the check
+        interval, else None (another worker may have changed it since).
+        """
+        if self._snapshot is None or self._clock() - self._checked_at >= self.check_interval_seconds:
+            return None
+        return self._snapshot
+
+    async def _stored_version(self, db: AsyncIOMotorDatabase) -> int:
+        doc = await db[COUNTERS_COLLECTION].find_one({"_id": GEO_VERSION_ID})
+        return int((doc or {}).get("seq", 0))
+
+    async def _changed(self, db: AsyncIOMotorDatabase, snapshot: GeoSnapshot) -> bool:
+        """Stored version or document counts differ from the snapshot's"""
+        if await self._stored_version(db) != snapshot.version:
+            return True
+        counts = {name: await db[name].estimated_document_count() for name in GEO_COLLECTIONS}
+        return counts != snapshot.counts()
+
+    async def load(self, db: AsyncIOMotorDatabase) -> GeoSnapshot:
+        """
+        Read all geographic data and swap in a new snapshot.
+
+        Returns:
+            GeoSnapshot: The snapshot now being served
+        """
+        version = await self._stored_version(db)
+        provinces = await db.provinces.find({}).sort("province_name", 1).to_list(length=None)
+        districts = await db.districts.find({}).sort("district_name", 1).to_list(length=None)
+        chiefdoms = await db.chiefdoms.find({}).sort("chiefdom_name", 1).to_list(length=None)
+
+        snapshot = build_snapshot(version, provinces, districts, chiefdoms)
+        # Concurrent loads may finish out of order; never go back a version
+        if self._snapshot is None or snapshot.version >= self._snapshot.version:
+            self._snapshot = snapshot
+        self._checked_at = self._clock()
+        logger.info(
+            f"🗺️  Geo store loaded v{snapshot.version}: {len(provinces)} provinces, "
+            f"{len(districts)} districts, {len(chiefdoms)} chiefdoms"
+        )
+        return self._snapshot
+
+    async def get(self, db: AsyncIOMotorDatabase) -> GeoSnapshot:
+        """
+        Current snapshot; loads it on first use and reloads it when the
+        stored version or document counts moved (checked at most every
+        check interval).
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.load(db)
+
+        now = self._clock()
+        if now - self._checked_at >= self.check_interval_seconds:
+            self._checked_at = now
+            if await self._changed(db, snapshot):
+                return await self.load(db)
+        return snapshot
+
+    async def bump_version(self, db: AsyncIOMotorDatabase) -> int:
+        """
+        Record a change to the geographic data and reload this worker.
+
+        Returns:
+            int: The new version
+        """
+        version = await bump_stored_geo_version(db)
+        await self.load(db)
+        return version
+
+    def clear(self) -> None:
+        """Forget the loaded snapshot (tests)"""
+        self._snapshot = None
+        self._checked_at = 0.0
+
+
+# Global instance
+geo_store = GeoStore()
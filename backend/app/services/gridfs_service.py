@@ -110,7 +110,26 @@ class GridFSService:
 
         except Exception as e:
             raise FileNotFoundError(f"Error downloading file {file_id}: {str(e)}")
-    
+
+    async def open_download_stream(self, file_id: str):
+        """
+        Open a file for chunked reading (large files such as reports)
+
+        Args:
+            file_id: GridFS file ID
+
+        Returns:
+            AsyncIOMotorGridOut: Read with readchunk(); exposes filename, length and metadata
+
+        Raises:
+            FileNotFoundError: If the id is invalid or no such file exists
+        """
+        bucket = await self.get_bucket()
+        try:
+            return await bucket.open_download_stream(ObjectId(file_id))
+        except Exception as e:
+            raise FileNotFoundError(f"Error opening file {file_id}: {str(e)}")
+
     async def delete_file(self, file_id: str) -> bool:
         """
         Delete file from GridFS
@@ -193,6 +212,8 @@ class GridFSService:
             'pdf': 'application/pdf',
             'doc': 'application/msword',
             'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            'csv': 'text/csv',
+            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         }
         return content_types.get(ext, 'application/octet-stream')
 
@@ -237,6 +258,30 @@ class SyncGridFSService:
         
         return str(file_id)
     
+    def upload_stream(
+        self,
+        source: BinaryIO,
+        filename: str,
+        file_type: str,
+        metadata: Optional[dict] = None
+    ) -> str:
+        """Upload a file object to GridFS chunk by chunk (sync), e.g. a generated report"""
+        file_metadata = {
+            "file_type": file_type,
+            "original_filename": filename,
+            "uploaded_at": datetime.utcnow(),
+            "content_type": self._get_content_type(filename),
+            **(metadata or {})
+        }
+
+        file_id = self.bucket.upload_from_stream(
+            filename,
+            source,
+            metadata=file_metadata
+        )
+
+        return str(file_id)
+
     def download_file(self, file_id: str) -> tuple[bytes, dict]:
         """Download file from GridFS (sync)"""
         try:
@@ -262,6 +307,15 @@ class SyncGridFSService:
         
         except Exception as e:
             raise FileNotFoundError(f"Error downloading file {file_id}: {str(e)}")
+
+    def delete_file(self, file_id: str) -> bool:
+        """Delete file from GridFS (sync); True if deleted"""
+        try:
+            self.bucket.delete(ObjectId(file_id))
+            return True
+        except Exception as e:
+            print(f"Error deleting file {file_id}: {str(e)}")
+            return False
     
     def _get_content_type(self, filename: str) -> str:
         """Get content type from filename"""
@@ -271,6 +325,8 @@ class SyncGridFSService:
             'jpeg': 'image/jpeg',
             'png': 'image/png',
             'pdf': 'application/pdf',
+            'csv': 'text/csv',
+            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         }
         return content_types.get(ext, 'application/octet-stream')
 
@@ -0,0 +1,208 @@
+# backend/app/services/log_writer.py
+"""
+Batched background writer for `system_logs`.
+
+log_event() used to await an insert_one per entry on the request's
+critical path. While the application is running, entries are instead
+appended to a bounded in-memory queue and written by a background task
+with unordered insert_many, whenever `batch_size` entries are waiting or
+`flush_interval` seconds have passed.
+
+Overflow policies when the queue is full:
+- "drop_oldest": discard the oldest queued entry and accept the new one
+  (never blocks a request)
+- "block": wait up to `enqueue_timeout` seconds for the flusher to make
+  room (backpressure), then drop the new entry
+
+Usage (see main.py lifespan):
+    await log_writer.start()
+    ...
+    await log_writer.stop()   # flushes everything still queued
+"""
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+import asyncio
+import logging
+
+from pymongo.errors import BulkWriteError
+
+from app.config import settings
+from app.database import get_database
+
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "block")
+
+
+def _default_collection():
+    """Resolve the system_logs collection on the global database"""
+    from app.services.logging_service import LOG_COLLECTION
+    return get_database()[LOG_COLLECTION]
+
+
+class BatchedLogWriter:
+    """
+    Bounded queue of log documents drained by a background flusher task.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "drop_oldest",
+        enqueue_timeout: float = 0.05,
+        collection_resolver: Callable[[], Any] = _default_collection,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of: {OVERFLOW_POLICIES}")
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.enqueue_timeout = enqueue_timeout
+        self._collection_resolver = collection_resolver
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.counters = {
+            "enqueued": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    # =======================================================
+    # Lifecycle
+    # =======================================================
+    @property
+    def is_running(self) -> bool:
+        """True while the background flusher accepts entries"""
+        return self._task is not None and not self._stopping
+
+    async def start(self) -> None:
+        """Start the background flusher (no-op if already running)"""
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"✅ Log writer started (batch={self.batch_size}, "
+            f"interval={self.flush_interval}s, queue={self.max_queue_size}, "
+            f"policy={self.overflow_policy})"
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop the flusher and write every entry still queued.
+
+        Args:
+            timeout: Maximum seconds to wait for the final flush
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logger.error(f"❌ Log writer did not finish flushing within {timeout}s")
+        self._task = None
+        logger.info(f"✅ Log writer stopped: {self.stats()}")
+
+    # =======================================================
+    # Producer Side
+    # =======================================================
+    async def submit(self, doc: Dict[str, Any]) -> bool:
+        """
+        Queue a log document for the next batch.
+
+        Args:
+            doc: Log document (as built by log_event)
+
+        Returns:
+            bool: True if queued, False if the entry was dropped
+        """
+        if len(self._queue) >= self.max_queue_size:
+            if self.overflow_policy == "drop_oldest":
+                self._queue.popleft()
+                self.counters["dropped"] += 1
+            else:
+                try:
+                    await asyncio.wait_for(self._wait_for_space(), timeout=self.enqueue_timeout)
+                except asyncio.TimeoutError:
+                    self.counters["dropped"] += 1
+                    return False
+
+        self._queue.append(doc)
+        self.counters["enqueued"] += 1
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _wait_for_space(self) -> None:
+        while len(self._queue) >= self.max_queue_size:
+            self._space.clear()
+            self._wakeup.set()
+            await self._space.wait()
+
+    # =======================================================
+    # Flusher
+    # =======================================================
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._stopping:
+                return
+
+    async def flush(self) -> None:
+        """Write every queued entry, in batches of at most batch_size"""
+        while self._queue:
+            batch: List[Dict[str, Any]] = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            self._space.set()
+            await self._write(batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        self.counters["batches"] += 1
+        try:
+            collection = self._collection_resolver()
+            await collection.insert_many(batch, ordered=False)
+            self.counters["flushed"] += len(batch)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            self.counters["flushed"] += inserted
+            self.counters["failed"] += len(batch) - inserted
+            logger.error(f"❌ Log batch partially failed: {len(batch) - inserted}/{len(batch)} entries")
+        except Exception as e:
+            # Entries are not re-queued: a persistent outage must not grow memory
+            self.counters["failed"] += len(batch)
+            logger.error(f"❌ Failed to write log batch of {len(batch)}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the current queue depth"""
+        return {**self.counters, "queued": len(self._queue), "running": self.is_running}
+
+
+# Global instance
+log_writer = BatchedLogWriter(
+    max_queue_size=settings.LOG_QUEUE_MAX_SIZE,
+    batch_size=settings.LOG_BATCH_SIZE,
+    flush_interval=settings.LOG_FLUSH_INTERVAL_SECONDS,
+    overflow_policy=settings.LOG_QUEUE_OVERFLOW_POLICY,
+)
@@ -1,10 +1,13 @@
 from typing import Any, Dict, Optional
 from datetime import datetime
+import json
+import re
 import uuid
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.database import get_database
+from app.services.log_writer import log_writer
 
 
 LOG_COLLECTION = "system_logs"
@@ -25,6 +28,11 @@ async def log_event(
 ) -> None:
     """Insert a structured log entry into MongoDB.
 
+    While the application is running the entry is handed to the batched
+    background writer (see log_writer.py) instead of being inserted inline.
+    Entries with an explicit `db` handle, or written outside the app
+    lifespan (scripts, Celery workers), are inserted immediately.
+
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         module: Logical module/component producing the log
@@ -56,6 +64,10 @@ async def log_event(
         "duration_ms": duration_ms,
     }
 
+    if db is None and log_writer.is_running:
+        await log_writer.submit(doc)
+        return
+
     try:
         # Get database - either passed in or from global instance
         if db is not None:
@@ -73,9 +85,17 @@ async def log_event(
         logger.error(f"Failed to write log entry: {e}")
 
 
+REDACTED_FIELDS = {"password", "token", "access_token", "refresh_token", "Authorization"}
+
+# "field": "value" pairs for redacted fields inside raw (possibly truncated) JSON text
+_REDACTED_PAIR = re.compile(
+    r'("(?:%s)"\s*:\s*)("(?:[^"\\]|\\.)*"?|[^,}\s]*)' % "|".join(sorted(REDACTED_FIELDS))
+)
+
+
 def sanitize_body(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Sanitize sensitive fields in request/response payloads."""
-    redactions = {"password", "token", "access_token", "refresh_token", "Authorization"}
+    redactions = REDACTED_FIELDS
     sanitized: Dict[str, Any] = {}
     for k, v in payload.items():
         if k in redactions:
@@ -83,3 +103,26 @@ def sanitize_body(payload: Dict[str, Any]) -> Dict[str, Any]:
         else:
             sanitized[k] = v
     return sanitized
+
+
+def sanitize_body_prefix(prefix: bytes, truncated: bool = False) -> Any:
+    """Sanitize a captured request body prefix for logging.
+
+    A complete JSON object body is parsed and passed through sanitize_body().
+    Anything else (truncated or non-JSON bodies) is logged as text with
+    sensitive "field": "value" pairs masked.
+    """
+    text = prefix.decode("utf-8", errors="replace")
+    if not text:
+        return {}
+    if not truncated:
+        try:
+            payload = json.loads(text)
+            if isinstance(payload, dict):
+                return sanitize_body(payload)
+        except ValueError:
+            pass
+    return {
+        "prefix": _REDACTED_PAIR.sub(r'\1"***REDACTED***"', text),
+        "truncated": truncated,
+    }
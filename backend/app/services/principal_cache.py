@@ -0,0 +1,136 @@
+# backend/app/services/principal_cache.py
+"""
+Principal Cache - avoids a MongoDB lookup on every authenticated request.
+
+get_current_user() resolves the JWT subject (user email or farmer_id) to a
+principal document. Resolved principals are cached:
+
+1. In-process LRU+TTL cache (per worker, always on)
+2. Optional Redis tier shared by all workers (PRINCIPAL_CACHE_REDIS_ENABLED)
+
+Writers that change what a principal looks like (activation status,
+deletion, password change) call `await principal_cache.invalidate(subject)`,
+which drops the entry from this worker and from Redis. Other workers keep
+their in-process copy for at most PRINCIPAL_CACHE_TTL_SECONDS, which bounds
+how long a deactivated account can keep using a still-valid token.
+
+Password hashes are never cached.
+"""
+from typing import Any, Dict, Optional
+import logging
+
+from bson import json_util
+
+from app.config import settings
+from app.utils.ttl_cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+# Fields stripped before a principal is cached
+_UNCACHED_FIELDS = ("password_hash",)
+
+_REDIS_KEY_PREFIX = "principal:"
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of authenticated principals keyed by token subject.
+    """
+
+    def __init__(self):
+        """Initialize cache tiers - Redis client is lazy loaded"""
+        self._local = TTLCache(
+            max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        )
+        self._redis = None
+
+    def _get_redis(self):
+        """Get or create the async Redis client (None when the tier is disabled)"""
+        if not settings.PRINCIPAL_CACHE_REDIS_ENABLED:
+            return None
+        if self._redis is None:
+            from redis.asyncio import Redis
+            self._redis = Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        return self._redis
+
+    async def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached principal.
+
+        Args:
+            subject: JWT subject (email or farmer_id)
+
+        Returns:
+            Optional[dict]: Copy of the cached principal, or None on a miss
+        """
+        principal = self._local.get(subject)
+        if principal is None:
+            redis = self._get_redis()
+            if redis is None:
+                return None
+            try:
+                raw = await redis.get(_REDIS_KEY_PREFIX + subject)
+            except Exception as e:
+                logger.warning(f"⚠️  Principal cache Redis read failed: {e}")
+                return None
+            if raw is None:
+                return None
+            principal = json_util.loads(raw)
+            self._local.set(subject, principal)
+        return dict(principal)
+
+    async def set(self, subject: str, principal: Dict[str, Any]) -> None:
+        """
+        Cache a principal (without secret fields) in both tiers.
+
+        Args:
+            subject: JWT subject (email or farmer_id)
+            principal: User document or constructed farmer principal
+        """
+        cached = {k: v for k, v in principal.items() if k not in _UNCACHED_FIELDS}
+        self._local.set(subject, cached)
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                _REDIS_KEY_PREFIX + subject,
+                json_util.dumps(cached),
+                ex=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Principal cache Redis write failed: {e}")
+
+    async def invalidate(self, subject: Optional[str]) -> None:
+        """
+        Drop a principal from both tiers.
+
+        Args:
+            subject: JWT subject (email or farmer_id); None is ignored
+        """
+        if not subject:
+            return
+        self._local.invalidate(subject)
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(_REDIS_KEY_PREFIX + subject)
+        except Exception as e:
+            logger.warning(f"⚠️  Principal cache Redis invalidation failed: {e}")
+
+    def clear_local(self) -> None:
+        """Drop every principal cached in this worker"""
+        self._local.clear()
+
+
+# Global instance
+principal_cache = PrincipalCache()
@@ -0,0 +1,321 @@
+# backend/app/services/registration_rollups.py
+"""
+Daily registration rollups.
+
+`registration_rollups` holds one document per (day, district, operator):
+
+    {"day": 2025-03-04T00:00:00, "district": "Mansa District",
+     "operator": "op@example.com", "count": 12, "updated_at": ...}
+
+Farmer writes keep it current with an upserted $inc (a farmer whose
+district or creator changes moves from one bucket to another). rebuild()
+recomputes every bucket from the farmers collection and records it in a
+marker document ({"_id": "rebuilt"}, no day, so never read as a bucket).
+The first trend query without that marker rebuilds lazily; run
+scripts/backfill_registration_rollups.py after deploying to avoid the wait,
+and whenever drift is suspected.
+
+Trend queries then read a day range from the (day, district, operator)
+index and bucket it by day, ISO week or month, instead of grouping raw
+farmers.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+
+from app.services.farmer_stats_service import UNKNOWN
+
+
+ROLLUP_COLLECTION = "registration_rollups"
+REBUILT_ID = "rebuilt"
+
+GRANULARITIES = ("day", "week", "month")
+GROUP_BY_FIELDS = ("district", "operator")
+
+# Fields a write path must load to compute its rollup change
+ROLLUP_PROJECTION = {
+    "created_at": 1,
+    "address.district_name": 1,
+    "created_by": 1,
+}
+
+_DAY_MS = 24 * 60 * 60 * 1000
+
+
+# =======================================================
+# Pure helpers (shared with the synchronous Celery tasks)
+# =======================================================
+def day_start(value: datetime) -> datetime:
+    """UTC midnight (naive, as stored by MongoDB) of the given timestamp."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime(value.year, value.month, value.day)
+
+
+def rollup_key(farmer: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """(day, district, operator) bucket of a farmer, or None if undated."""
+    if not farmer or not isinstance(farmer.get("created_at"), datetime):
+        return None
+    address = farmer.get("address") or {}
+    return {
+        "day": day_start(farmer["created_at"]),
+        "district": address.get("district_name") or UNKNOWN,
+        "operator": farmer.get("created_by") or UNKNOWN,
+    }
+
+
+def rollup_changes(
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Bucket increments for a farmer changing from `before` to `after`.
+
+    Use before=None for inserts and after=None for deletes.
+
+    Returns:
+        List of (bucket filter, +1/-1); empty if the bucket is unchanged
+    """
+    old_key, new_key = rollup_key(before), rollup_key(after)
+    if old_key == new_key:
+        return []
+    changes = []
+    if old_key:
+        changes.append((old_key, -1))
+    if new_key:
+        changes.append((new_key, 1))
+    return changes
+
+
+def merge_rollup_changes(
+    changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Net bucket increments of many (before, after) farmer changes.
+
+    Returns:
+        List of (bucket filter, increment), one per bucket; zero nets dropped
+    """
+    net: Dict[Tuple[Any, ...], int] = {}
+    keys: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for before, after in changes:
+        for key, inc in rollup_changes(before, after):
+            ident = (key["day"], key["district"], key["operator"])
+            keys[ident] = key
+            net[ident] = net.get(ident, 0) + inc
+    return [(keys[ident], inc) for ident, inc in net.items() if inc != 0]
+
+
+def rollup_update(inc: int) -> Dict[str, Any]:
+    """Upsert update applying an increment to one bucket."""
+    return {"$inc": {"count": inc}, "$set": {"updated_at": datetime.utcnow()}}
+
+
+def _or_unknown(field: str) -> Dict[str, Any]:
+    """Aggregation expression mapping a missing/null/empty field to UNKNOWN."""
+    return {"$cond": [{"$eq": [{"$ifNull": [f"${field}", ""]}, ""]}, UNKNOWN, f"${field}"]}
+
+
+def rebuild_pipeline() -> List[Dict[str, Any]]:
+    """Aggregation computing every bucket from the farmers collection."""
+    return [
+        {"$match": {"created_at": {"$type": "date"}}},
+        {
+            "$group": {
+                "_id": {
+                    "day": {
+                        "$dateFromParts": {
+                            "year": {"$year": "$created_at"},
+                            "month": {"$month": "$created_at"},
+                            "day": {"$dayOfMonth": "$created_at"},
+                        }
+                    },
+                    "district": _or_unknown("address.district_name"),
+                    "operator": _or_unknown("created_by"),
+                },
+                "count": {"$sum": 1},
+            }
+        },
+    ]
+
+
+def _period_expression(granularity: str) -> Any:
+    """Aggregation expression for the first day of the bucket containing $day."""
+    if granularity == "day":
+        return "$day"
+    if granularity == "week":
+        # ISO weeks start on Monday; $dayOfWeek is 1 (Sunday) .. 7 (Saturday)
+        days_since_monday = {"$mod": [{"$add": [{"$dayOfWeek": "$day"}, 5]}, 7]}
+        return {"$subtract": ["$day", {"$multiply": [days_since_monday, _DAY_MS]}]}
+    return {"$dateFromParts": {"year": {"$year": "$day"}, "month": {"$month": "$day"}, "day": 1}}
+
+
+def trend_pipeline(
+    start: date,
+    end: date,
+    granularity: str = "day",
+    group_by: Optional[str] = None,
+    district: Optional[str] = None,
+    operator: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Registrations per period between two days (both inclusive).
+
+    Args:
+        start: First day of the range
+        end: Last day of the range
+        granularity: day, week or month
+        group_by: Optional second dimension (district or operator)
+        district: Only count this district
+        operator: Only count farmers created by this operator
+
+    Raises:
+        ValueError: On an unknown granularity or group_by
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {GRANULARITIES}")
+    if group_by is not None and group_by not in GROUP_BY_FIELDS:
+        raise ValueError(f"group_by must be one of: {GROUP_BY_FIELDS}")
+
+    match: Dict[str, Any] = {
+        "day": {
+            "$gte": datetime.combine(start, time.min),
+            "$lt": datetime.combine(end + timedelta(days=1), time.min),
+        }
+    }
+    if district:
+        match["district"] = district
+    if operator:
+        match["operator"] = operator
+
+    group_id: Dict[str, Any] = {"period": _period_expression(granularity)}
+    if group_by:
+        group_id[group_by] = f"${group_by}"
+
+    return [
+        {"$match": match},
+        {"$group": {"_id": group_id, "registrations": {"$sum": "$count"}}},
+        {"$match": {"registrations": {"$ne": 0}}},
+        {"$sort": {"_id.period": 1, **({f"_id.{group_by}": 1} if group_by else {})}},
+    ]
+
+
+def format_trend_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one trend_pipeline() row: {"period": "YYYY-MM-DD", ..., "registrations"}"""
+    out = {"period": row["_id"]["period"].strftime("%Y-%m-%d")}
+    for field in GROUP_BY_FIELDS:
+        if field in row["_id"]:
+            out[field] = row["_id"][field]
+    out["registrations"] = row["registrations"]
+    return out
+
+
+# =======================================================
+# Async service
+# =======================================================
+class RegistrationRollupService:
+    """
+    Maintains and queries the registration_rollups collection.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[ROLLUP_COLLECTION]
+
+    async def apply(
+        self,
+        before: Optional[Dict[str, Any]],
+        after: Optional[Dict[str, Any]],
+    ) -> None:
+        """
+        Apply the change of one farmer from `before` to `after`.
+
+        Args:
+            before: Farmer before the write (None for inserts)
+            after: Farmer after the write (None for deletes)
+        """
+        for key, inc in rollup_changes(before, after):
+            await self.collection.update_one(key, rollup_update(inc), upsert=True)
+
+    async def apply_many(
+        self,
+        changes: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+    ) -> None:
+        """
+        Apply the changes of many farmers: one $inc per bucket, sent in a
+        single bulk_write.
+
+        Args:
+            changes: (before, after) pairs, as for apply()
+        """
+        updates = [
+            UpdateOne(key, rollup_update(inc), upsert=True)
+            for key, inc in merge_rollup_changes(changes)
+        ]
+        if updates:
+            await self.collection.bulk_write(updates, ordered=False)
+
+    async def trends(
+        self,
+        start: date,
+        end: date,
+        granularity: str = "day",
+        group_by: Optional[str] = None,
+        district: Optional[str] = None,
+        operator: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Registrations per period (see trend_pipeline()), rebuilding the
+        rollups first if they were never built.
+
+        Returns:
+            List of {"period", [district|operator], "registrations"}
+        """
+        if await self.collection.find_one({"_id": REBUILT_ID}, {"_id": 1}) is None:
+            await self.rebuild()
+        pipeline = trend_pipeline(start, end, granularity, group_by, district, operator)
+        rows = await self.collection.aggregate(pipeline).to_list(length=None)
+        return [format_trend_row(row) for row in rows]
+
+    async def rebuild(self, batch_size: int = 500) -> int:
+        """
+        Recompute every bucket from the farmers collection.
+
+        Buckets are replaced in place, then buckets not written since the
+        rebuild started (no farmers left) are deleted and the rebuild is
+        recorded in the marker document.
+
+        Args:
+            batch_size: Number of replacements sent per bulk_write
+
+        Returns:
+            int: Number of buckets written
+        """
+        started = datetime.utcnow()
+        written = 0
+        batch = []
+        async for row in self.db.farmers.aggregate(rebuild_pipeline()):
+            key = row["_id"]
+            batch.append(ReplaceOne(
+                key,
+                {**key, "count": row["count"], "updated_at": datetime.utcnow()},
+                upsert=True
+            ))
+            if len(batch) >= batch_size:
+                await self.collection.bulk_write(batch, ordered=False)
+                written += len(batch)
+                batch = []
+
+        if batch:
+            await self.collection.bulk_write(batch, ordered=False)
+            written += len(batch)
+
+        await self.collection.delete_many({"updated_at": {"$lt": started}})
+        await self.collection.update_one(
+            {"_id": REBUILT_ID},
+            {"$set": {"rebuilt_at": datetime.utcnow()}},
+            upsert=True
+        )
+        return written
@@ -0,0 +1,251 @@
+# backend/app/services/report_cache.py
+"""
+Report Cache - serves report and dashboard results until the data changes.
+
+Report endpoints aggregate whole collections. Their results are cached:
+
+1. In-process LRU cache (per worker, always on)
+2. Optional Redis tier shared by all workers (REPORT_CACHE_REDIS_ENABLED)
+
+Entries are keyed by endpoint, parameters and caller scope, and tagged
+with the collections they were computed from ("farmers", "operators",
+"users"). Each tag has a version number (kept in Redis when that tier is
+enabled, so every worker and the Celery tasks see the same versions).
+Writers call `await report_cache.invalidate_tags("farmers")`, which bumps
+the version; an entry computed under older versions is never served as
+fresh again.
+
+Entries also expire after REPORT_CACHE_TTL_SECONDS to pick up writes made
+outside the API. A stale entry is kept for REPORT_CACHE_STALE_SECONDS more
+and served, marked `stale`, only if recomputing it fails.
+
+Usage:
+    result, meta = await report_cache.get_or_compute(
+        "reports.dashboard", compute, tags=("farmers", "users"))
+    return {**result, **meta.as_fields()}
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+import hashlib
+import json
+import logging
+import time
+
+from bson import json_util
+
+from app.config import settings
+from app.utils.ttl_cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY_PREFIX = "report_cache:"
+
+# Collections a report can depend on
+FARMERS = "farmers"
+OPERATORS = "operators"
+USERS = "users"
+
+
+@dataclass
+class CacheMeta:
+    """How a report result was obtained"""
+    generated_at: datetime
+    stale: bool = False
+    cached: bool = False
+
+    def as_fields(self) -> Dict[str, Any]:
+        """Fields merged into the report response"""
+        return {"generated_at": self.generated_at, "stale": self.stale}
+
+
+def cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None, scope: Any = None) -> str:
+    """Stable key for an endpoint called with the given parameters and scope."""
+    material = json.dumps({"params": params or {}, "scope": scope}, sort_keys=True, default=str)
+    return f"{endpoint}:{hashlib.sha1(material.encode('utf-8')).hexdigest()[:20]}"
+
+
+class ReportCache:
+    """
+    Two-tier, tag-invalidated cache of report results.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        stale_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        redis_enabled: Optional[bool] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize cache tiers - Redis client is lazy loaded"""
+        self.ttl_seconds = settings.REPORT_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.stale_seconds = settings.REPORT_CACHE_STALE_SECONDS if stale_seconds is None else stale_seconds
+        self.redis_enabled = settings.REPORT_CACHE_REDIS_ENABLED if redis_enabled is None else redis_enabled
+        self._clock = clock
+        self._local = TTLCache(
+            max_entries=settings.REPORT_CACHE_MAX_ENTRIES if max_entries is None else max_entries,
+            ttl_seconds=self.ttl_seconds + self.stale_seconds,
+            clock=clock,
+        )
+        self._versions: Dict[str, int] = {}
+        self._redis = None
+
+    def _get_redis(self):
+        """Get or create the async Redis client (None when the tier is disabled)"""
+        if not self.redis_enabled:
+            return None
+        if self._redis is None:
+            from redis.asyncio import Redis
+            self._redis = Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=0.5,
+                socket_connect_timeout=0.5,
+            )
+        return self._redis
+
+    # =======================================================
+    # Tag Versions
+    # =======================================================
+    async def _tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = sorted(set(tags))
+        redis = self._get_redis()
+        if redis is not None and tags:
+            try:
+                values = await redis.mget([_REDIS_KEY_PREFIX + "tag:" + tag for tag in tags])
+                return {tag: int(value or 0) for tag, value in zip(tags, values)}
+            except Exception as e:
+                logger.warning(f"⚠️  Report cache Redis tag read failed: {e}")
+        return {tag: self._versions.get(tag, 0) for tag in tags}
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """
+        Mark every entry depending on any of `tags` as outdated.
+
+        Args:
+            tags: Collection tags (FARMERS, OPERATORS, USERS)
+        """
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(_REDIS_KEY_PREFIX + "tag:" + tag)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️  Report cache Redis invalidation failed: {e}")
+
+    # =======================================================
+    # Entries
+    # =======================================================
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry is not None:
+            return entry
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(_REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"⚠️  Report cache Redis read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        entry = json_util.loads(raw)
+        self._local.set(key, entry)
+        return entry
+
+    async def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        self._local.set(key, entry)
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                _REDIS_KEY_PREFIX + key,
+                json_util.dumps(entry),
+                ex=max(1, int(self.ttl_seconds + self.stale_seconds)),
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Report cache Redis write failed: {e}")
+
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        compute: Callable[[], Awaitable[Any]],
+        params: Optional[Dict[str, Any]] = None,
+        scope: Any = None,
+        tags: Iterable[str] = (),
+    ) -> Tuple[Any, CacheMeta]:
+        """
+        Return the cached result, or compute and cache it.
+
+        Args:
+            endpoint: Name of the report (part of the key)
+            compute: Coroutine function producing the result
+            params: Request parameters the result depends on
+            scope: Caller scope the result depends on (e.g. roles)
+            tags: Collections the result is computed from
+
+        Returns:
+            (result, CacheMeta)
+
+        Raises:
+            Exception: Whatever compute() raised, if no stale entry exists
+        """
+        key = cache_key(endpoint, params, scope)
+        versions = await self._tag_versions(tags)
+        entry = await self._load(key)
+        now = self._clock()
+
+        if entry is not None and entry["versions"] == versions and now - entry["generated_at"] < self.ttl_seconds:
+            return entry["value"], CacheMeta(_to_datetime(entry["generated_at"]), stale=False, cached=True)
+
+        try:
+            value = await compute()
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"⚠️  Serving stale '{endpoint}' report, recompute failed: {e}")
+            return entry["value"], CacheMeta(_to_datetime(entry["generated_at"]), stale=True, cached=True)
+
+        await self._store(key, {"value": value, "generated_at": now, "versions": versions})
+        return value, CacheMeta(_to_datetime(now))
+
+    def clear_local(self) -> None:
+        """Drop every entry cached in this worker"""
+        self._local.clear()
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def invalidate_tags_sync(*tags: str) -> None:
+    """
+    Bump tag versions from synchronous code (Celery tasks).
+
+    Only the Redis tier is shared with the API workers; without it their
+    entries expire after REPORT_CACHE_TTL_SECONDS.
+    """
+    if not settings.REPORT_CACHE_REDIS_ENABLED:
+        return
+    try:
+        from redis import Redis
+        client = Redis.from_url(settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+        pipe = client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(_REDIS_KEY_PREFIX + "tag:" + tag)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️  Report cache Redis invalidation failed: {e}")
+
+
+# Global instance
+report_cache = ReportCache()
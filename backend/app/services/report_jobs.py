@@ -0,0 +1,148 @@
+# backend/app/services/report_jobs.py
+"""
+Background report jobs.
+
+Large exports run in Celery (app.tasks.report_tasks) instead of inside an
+API worker. A job document in `report_jobs` tracks each request:
+
+    queued → running → done (file_id of the output in the cem_files bucket)
+                     ↘ failed (error)
+
+Identical requests (same report, format and filters) share one job while
+it is in flight: `active_key` holds the request fingerprint only while the
+job is queued or running, and a unique partial index on it makes
+submit() return the existing job instead of queueing a duplicate.
+
+The worker refreshes `heartbeat_at` when it claims a job and after every
+batch. A job left queued/running by a killed worker stops beating; once its
+heartbeat is older than REPORT_JOB_STALE_SECONDS, the next identical
+submit() fails it, releases its key and queues a fresh job.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import uuid
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.models.report_job import ReportJobCreate
+
+
+logger = logging.getLogger(__name__)
+
+REPORT_JOBS_COLLECTION = "report_jobs"
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("done", "failed")
+
+
+def job_fingerprint(report: str, fmt: str, filters: Dict[str, Any]) -> str:
+    """Identical requests produce the same fingerprint."""
+    material = json.dumps(
+        {"report": report, "format": fmt, "filters": filters},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+
+class ReportJobService:
+    """
+    Creates and reads report job documents.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, stale_seconds: Optional[int] = None):
+        self.db = db
+        self.collection = db[REPORT_JOBS_COLLECTION]
+        self.stale_seconds = settings.REPORT_JOB_STALE_SECONDS if stale_seconds is None else stale_seconds
+
+    async def submit(
+        self,
+        request: ReportJobCreate,
+        requested_by: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Create a queued job, or return the identical job already in flight
+        (an in-flight job whose heartbeat went stale is failed first).
+
+        Args:
+            request: Report, format and filters
+            requested_by: Email of the requesting admin
+
+        Returns:
+            (job document, created) - created is False for a duplicate
+        """
+        filters = request.filters.model_dump()
+        key = job_fingerprint(request.report, request.format, filters)
+        await self._fail_stale(key)
+
+        job_id = uuid.uuid4().hex
+        now = datetime.utcnow()
+        doc = {
+            "_id": job_id,
+            "report": request.report,
+            "format": request.format,
+            "filters": filters,
+            "status": "queued",
+            "rows": 0,
+            "requested_by": requested_by,
+            "created_at": now,
+            "heartbeat_at": now,
+        }
+
+        # Two concurrent upserts can race on the unique index; the loser
+        # retries and finds the winner's job
+        for attempt in range(2):
+            try:
+                job = await self.collection.find_one_and_update(
+                    {"active_key": key},
+                    {"$setOnInsert": doc},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                return job, job["_id"] == job_id
+            except DuplicateKeyError:
+                if attempt:
+                    raise
+
+    async def _fail_stale(self, key: str) -> None:
+        """Fail the in-flight job holding `key` if its worker stopped beating"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        result = await self.collection.update_one(
+            {
+                "active_key": key,
+                "$or": [
+                    {"heartbeat_at": {"$lt": cutoff}},
+                    {"heartbeat_at": {"$exists": False}, "created_at": {"$lt": cutoff}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": f"No progress for {self.stale_seconds}s (worker lost)",
+                    "finished_at": datetime.utcnow(),
+                },
+                "$unset": {"active_key": ""},
+            },
+        )
+        if result.modified_count:
+            logger.warning(f"⚠️  Failed stale report job for key {key[:12]}")
+
+    async def mark_failed(self, job_id: str, error: str) -> None:
+        """Fail a job (e.g. when it could not be queued) and release its key"""
+        await self.collection.update_one(
+            {"_id": job_id},
+            {
+                "$set": {"status": "failed", "error": error, "finished_at": datetime.utcnow()},
+                "$unset": {"active_key": ""},
+            },
+        )
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a job document by id"""
+        return await self.collection.find_one({"_id": job_id})
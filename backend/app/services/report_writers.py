@@ -0,0 +1,142 @@
+# backend/app/services/report_writers.py
+"""
+File writers for background report jobs.
+
+Each writer consumes rows batch by batch and writes them to a binary file
+object, so a report is never materialized in memory as a whole:
+
+    with tempfile.SpooledTemporaryFile() as fh:
+        rows = write_report("csv", fh, columns, batches, title="Farmers")
+
+CSV uses the standard library, XLSX uses openpyxl in write-only mode and
+PDF draws a paginated table with reportlab.
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional
+
+Batches = Iterable[List[Dict[str, Any]]]
+Progress = Optional[Callable[[int], None]]
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+
+# PDF pages are too narrow for every column; at most this many are printed
+PDF_MAX_COLUMNS = 8
+
+
+def write_csv(fh: BinaryIO, columns: List[str], batches: Batches, progress: Progress = None, **_) -> int:
+    """Write a CSV file (UTF-8, header line first). Returns the row count."""
+    text = io.TextIOWrapper(fh, encoding="utf-8", newline="", write_through=True)
+    writer = csv.DictWriter(text, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for rows in batches:
+        writer.writerows(rows)
+        count += len(rows)
+        if progress:
+            progress(count)
+    text.detach()  # leave fh open for the caller
+    return count
+
+
+def write_xlsx(fh: BinaryIO, columns: List[str], batches: Batches, progress: Progress = None,
+               title: str = "Report", **_) -> int:
+    """Write an XLSX workbook with one sheet. Returns the row count."""
+    from openpyxl import Workbook  # Optional dependency, only needed by XLSX jobs
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append(columns)
+    count = 0
+    for rows in batches:
+        for row in rows:
+            sheet.append([row.get(column) for column in columns])
+        count += len(rows)
+        if progress:
+            progress(count)
+    workbook.save(fh)
+    return count
+
+
+def write_pdf(fh: BinaryIO, columns: List[str], batches: Batches, progress: Progress = None,
+              title: str = "Report", **_) -> int:
+    """Write a landscape A4 table, repeating the header on every page. Returns the row count."""
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+    columns = columns[:PDF_MAX_COLUMNS]
+    width, height = landscape(A4)
+    margin, line_height, font_size = 28, 13, 7
+    column_width = (width - 2 * margin) / len(columns)
+    max_chars = max(4, int(column_width / (font_size * 0.5)))
+
+    c = pdf_canvas.Canvas(fh, pagesize=(width, height))
+    page = 0
+
+    def start_page() -> float:
+        nonlocal page
+        page += 1
+        c.setFont("Helvetica-Bold", 11)
+        c.drawString(margin, height - margin, title)
+        c.setFont("Helvetica", 7)
+        c.drawRightString(width - margin, height - margin,
+                          f"Generated {datetime.utcnow():%Y-%m-%d %H:%M} UTC - page {page}")
+        y = height - margin - 2 * line_height
+        c.setFont("Helvetica-Bold", font_size)
+        for i, column in enumerate(columns):
+            c.drawString(margin + i * column_width, y, column.replace("_", " ").title()[:max_chars])
+        c.setFont("Helvetica", font_size)
+        return y - line_height
+
+    y = start_page()
+    count = 0
+    for rows in batches:
+        for row in rows:
+            if y < margin:
+                c.showPage()
+                y = start_page()
+            for i, column in enumerate(columns):
+                value = row.get(column)
+                c.drawString(margin + i * column_width, y, ("" if value is None else str(value))[:max_chars])
+            y -= line_height
+        count += len(rows)
+        if progress:
+            progress(count)
+    c.save()
+    return count
+
+
+WRITERS = {
+    "csv": write_csv,
+    "xlsx": write_xlsx,
+    "pdf": write_pdf,
+}
+
+
+def write_report(fmt: str, fh: BinaryIO, columns: List[str], batches: Batches,
+                 progress: Progress = None, title: str = "Report") -> int:
+    """
+    Write rows in the given format.
+
+    Args:
+        fmt: csv, xlsx or pdf
+        fh: Binary file object to write to
+        columns: Column order
+        batches: Iterable of row batches (dicts keyed by column)
+        progress: Called with the running row count after each batch
+        title: Sheet / document title
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        ValueError: On an unknown format
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported report format: {fmt}")
+    return WRITERS[fmt](fh, columns, batches, progress=progress, title=title)
@@ -0,0 +1,246 @@
+# backend/app/services/stats_service.py
+"""
+Shared statistics engine for the dashboard and report endpoints.
+
+dashboard/stats, farmers/stats/overview and reports/dashboard each used
+to await one count_documents per metric, serially. Metrics are now
+described with StatsQuery, which compiles every metric for a collection
+into a single `$facet` aggregation. The per-collection aggregations (and
+the farmer_stats document read) run concurrently, and the results come
+back as one typed SystemStats object.
+
+Usage:
+    stats = await StatsService(db).collect({FARMER_COUNTS, USERS})
+    stats.farmers_total, stats.users_total
+
+Note: stages inside $facet cannot use indexes. Give a StatsQuery on a
+large collection an index-backed `scope` (the leading $match) so only the
+relevant slice reaches the facets.
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.models.stats import DistrictCount, RecentFarmer, SystemStats
+from app.services.farmer_stats_service import FarmerStatsService
+
+
+# Metrics an endpoint can request from StatsService.collect()
+FARMER_COUNTS = "farmer_counts"            # total, by status, by district
+FARMERS_THIS_MONTH = "farmers_this_month"
+RECENT_FARMERS = "recent_farmers"
+USERS = "users"
+OPERATORS = "operators"
+
+ALL_METRICS = frozenset({FARMER_COUNTS, FARMERS_THIS_MONTH, RECENT_FARMERS, USERS, OPERATORS})
+
+RECENT_FARMERS_LIMIT = 5
+TOP_DISTRICTS_LIMIT = 10
+
+RECENT_FARMER_PROJECTION = {
+    "_id": 0,
+    "farmer_id": 1,
+    "personal_info.first_name": 1,
+    "personal_info.last_name": 1,
+    "address.district_name": 1,
+    "created_at": 1,
+}
+
+
+# =======================================================
+# Query Builder
+# =======================================================
+class StatsQuery:
+    """
+    Named metrics over one collection, compiled into a single aggregation:
+    [{$match: scope}?, {$facet: {name: sub-pipeline, ...}}]
+
+    Args:
+        collection: Collection name
+        scope: Optional filter applied before the facets (index-eligible)
+    """
+
+    def __init__(self, collection: str, scope: Optional[Dict[str, Any]] = None):
+        self.collection = collection
+        self.scope = scope or {}
+        self._facets: Dict[str, List[Dict[str, Any]]] = {}
+        self._kinds: Dict[str, str] = {}
+
+    def _add(self, name: str, kind: str, stages: List[Dict[str, Any]], match: Optional[Dict[str, Any]]):
+        if name in self._facets:
+            raise ValueError(f"Duplicate metric name: {name}")
+        self._facets[name] = ([{"$match": match}] if match else []) + stages
+        self._kinds[name] = kind
+        return self
+
+    def count(self, name: str, match: Optional[Dict[str, Any]] = None) -> "StatsQuery":
+        """Number of documents (optionally matching `match`) → int"""
+        return self._add(name, "count", [{"$count": "count"}], match)
+
+    def group_count(
+        self,
+        name: str,
+        field: str,
+        match: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> "StatsQuery":
+        """Counts per value of `field`, largest first → [{"value", "count"}]"""
+        stages = [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]
+        if limit:
+            stages.append({"$limit": limit})
+        return self._add(name, "group", stages, match)
+
+    def top(
+        self,
+        name: str,
+        sort: Dict[str, int],
+        limit: int,
+        projection: Optional[Dict[str, Any]] = None,
+        match: Optional[Dict[str, Any]] = None,
+    ) -> "StatsQuery":
+        """First `limit` documents in `sort` order → [doc]"""
+        stages = [{"$sort": sort}, {"$limit": limit}]
+        if projection:
+            stages.append({"$project": projection})
+        return self._add(name, "docs", stages, match)
+
+    @property
+    def empty(self) -> bool:
+        return not self._facets
+
+    def pipeline(self) -> List[Dict[str, Any]]:
+        """The aggregation pipeline computing every metric"""
+        stages = [{"$match": self.scope}] if self.scope else []
+        stages.append({"$facet": self._facets})
+        return stages
+
+    def parse(self, row: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Turn the single $facet output document into {name: value}"""
+        row = row or {}
+        results: Dict[str, Any] = {}
+        for name, kind in self._kinds.items():
+            values = row.get(name) or []
+            if kind == "count":
+                results[name] = values[0]["count"] if values else 0
+            elif kind == "group":
+                results[name] = [{"value": v["_id"], "count": v["count"]} for v in values]
+            else:
+                results[name] = values
+        return results
+
+    async def run(self, db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+        """Execute the aggregation (one round trip)"""
+        if self.empty:
+            return {}
+        rows = await db[self.collection].aggregate(self.pipeline()).to_list(length=1)
+        return self.parse(rows[0] if rows else None)
+
+
+async def run_stats_queries(
+    db: AsyncIOMotorDatabase,
+    queries: Iterable[StatsQuery],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run one StatsQuery per collection concurrently.
+
+    Returns:
+        Mapping of collection name → {metric name: value}
+    """
+    queries = [q for q in queries if not q.empty]
+    collections = [q.collection for q in queries]
+    if len(set(collections)) != len(collections):
+        raise ValueError("Combine metrics for the same collection into one StatsQuery")
+    results = await asyncio.gather(*(q.run(db) for q in queries))
+    return dict(zip(collections, results))
+
+
+# =======================================================
+# Stats Service
+# =======================================================
+class StatsService:
+    """
+    Collects the statistics behind the dashboard and report endpoints.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    async def collect(self, metrics: Iterable[str]) -> SystemStats:
+        """
+        Compute the requested metrics with one round trip per collection.
+
+        Args:
+            metrics: Subset of ALL_METRICS
+
+        Returns:
+            SystemStats: Requested metrics filled in, the rest at defaults
+
+        Raises:
+            ValueError: If an unknown metric is requested
+        """
+        metrics = set(metrics)
+        unknown = metrics - ALL_METRICS
+        if unknown:
+            raise ValueError(f"Unknown metrics: {sorted(unknown)}")
+
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+        # Farmer totals come from farmer_stats; the farmers facet only sees
+        # this month's registrations (created_at index)
+        farmers = StatsQuery("farmers", scope={"created_at": {"$gte": month_start}})
+        if FARMERS_THIS_MONTH in metrics:
+            farmers.count("this_month")
+        if RECENT_FARMERS in metrics:
+            farmers.top("recent", {"created_at": -1}, RECENT_FARMERS_LIMIT, RECENT_FARMER_PROJECTION)
+
+        users = StatsQuery("users")
+        if USERS in metrics:
+            users.count("total")
+
+        operators = StatsQuery("operators")
+        if OPERATORS in metrics:
+            operators.count("total")
+
+        farmer_counts, results = await asyncio.gather(
+            self._farmer_counts() if FARMER_COUNTS in metrics else _none(),
+            run_stats_queries(self.db, [farmers, users, operators]),
+        )
+
+        stats = SystemStats(generated_at=datetime.utcnow())
+        if farmer_counts is not None:
+            districts = sorted(farmer_counts["by_district"].items(), key=lambda item: item[1], reverse=True)
+            stats.farmers_total = farmer_counts["total"]
+            stats.farmers_by_status = farmer_counts["by_status"]
+            stats.farmers_by_district = [
+                DistrictCount(district=district, count=count)
+                for district, count in districts[:TOP_DISTRICTS_LIMIT]
+            ]
+
+        farmer_results = results.get("farmers", {})
+        stats.farmers_this_month = farmer_results.get("this_month", 0)
+        if RECENT_FARMERS in metrics:
+            recent = farmer_results.get("recent", [])
+            if len(recent) < RECENT_FARMERS_LIMIT:
+                # Fewer registrations this month than the list shows
+                recent = await self._recent_farmers()
+            stats.recent_farmers = [RecentFarmer.from_mongo(doc) for doc in recent]
+
+        stats.users_total = results.get("users", {}).get("total", 0)
+        stats.operators_total = results.get("operators", {}).get("total", 0)
+        return stats
+
+    async def _farmer_counts(self) -> Dict[str, Any]:
+        return await FarmerStatsService(self.db).get()
+
+    async def _recent_farmers(self) -> List[Dict[str, Any]]:
+        cursor = self.db.farmers.find({}, RECENT_FARMER_PROJECTION).sort("created_at", -1)
+        return await cursor.limit(RECENT_FARMERS_LIMIT).to_list(RECENT_FARMERS_LIMIT)
+
+
+async def _none() -> None:
+    return None
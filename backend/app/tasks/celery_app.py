@@ -2,6 +2,8 @@
 import os
 from celery import Celery
 
+from app.config import settings
+
 # Retrieve Redis URL from environment variable or default
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
@@ -21,9 +23,19 @@ celery_app.conf.update(
     imports=[
         'app.tasks.sync_tasks',
         'app.tasks.id_card_task',
+        'app.tasks.stats_tasks',
+        'app.tasks.report_tasks',
     ]
 )
 
+# Periodic jobs (run with `celery -A app.tasks.celery_app beat`)
+celery_app.conf.beat_schedule = {
+    "reconcile-farmer-stats": {
+        "task": "app.tasks.stats_tasks.reconcile_farmer_stats",
+        "schedule": settings.FARMER_STATS_RECONCILE_INTERVAL_SECONDS,
+    },
+}
+
 # Optional: route tasks to specific queues for better load management
 celery_app.conf.task_routes = {
     "app.tasks.id_card_task.generate_id_card": {"queue": "celery"},
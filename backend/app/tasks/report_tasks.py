@@ -0,0 +1,122 @@
+# backend/app/tasks/report_tasks.py
+"""
+Background report generation.
+
+generate_report(job_id) renders a queued report job (see
+app.services.report_jobs) batch by batch into a spooled temporary file,
+uploads it to the cem_files GridFS bucket and records the file id on the
+job. Progress (rows written so far) is saved after every batch so the API
+can report it while the job runs.
+"""
+from datetime import datetime
+import logging
+import tempfile
+
+from celery import shared_task
+from pymongo import ReturnDocument
+
+from app.services.farmer_export import (
+    FARMER_DETAIL_COLUMNS,
+    build_export_filter,
+    iter_farmer_detail_batches_sync,
+)
+from app.services.gridfs_service import sync_gridfs_service
+from app.services.report_jobs import REPORT_JOBS_COLLECTION
+from app.services.report_writers import write_report
+from app.tasks.sync_tasks import get_db_sync
+
+
+logger = logging.getLogger(__name__)
+
+# Reports kept in memory up to this size before spilling to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# report name → (title, columns, batches(db, filters))
+REPORT_SOURCES = {
+    "farmers_details": (
+        "Farmers Details",
+        FARMER_DETAIL_COLUMNS,
+        lambda db, filters: iter_farmer_detail_batches_sync(db, build_export_filter(**filters)),
+    ),
+}
+
+
+@shared_task(name="app.tasks.report_tasks.generate_report")
+def generate_report(job_id: str):
+    """
+    Generate the output file of a queued report job.
+
+    Args:
+        job_id: report_jobs document id
+
+    Returns:
+        dict: Final job status, row count and GridFS file id
+    """
+    db = get_db_sync()
+    jobs = db[REPORT_JOBS_COLLECTION]
+
+    # Claim the job; a redelivered task finds it already running/finished
+    job = jobs.find_one_and_update(
+        {"_id": job_id, "status": "queued"},
+        {"$set": {"status": "running", "started_at": datetime.utcnow(), "heartbeat_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not job:
+        return {"job_id": job_id, "status": "skipped"}
+
+    fmt = job["format"]
+    try:
+        title, columns, batches = REPORT_SOURCES[job["report"]]
+
+        def progress(rows: int) -> None:
+            jobs.update_one(
+                {"_id": job_id, "status": "running"},
+                {"$set": {"rows": rows, "heartbeat_at": datetime.utcnow()}},
+            )
+
+        filename = f"{job['report']}_{datetime.utcnow():%Y%m%d_%H%M%S}.{fmt}"
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as fh:
+            rows = write_report(
+                fmt, fh, columns, batches(db, job.get("filters") or {}),
+                progress=progress, title=title,
+            )
+            fh.seek(0)
+            file_id = sync_gridfs_service.upload_stream(
+                fh,
+                filename=filename,
+                file_type="report",
+                metadata={"job_id": job_id, "report": job["report"], "rows": rows},
+            )
+    except Exception as e:
+        logger.error(f"❌ Report job {job_id} failed: {e}")
+        jobs.update_one(
+            {"_id": job_id, "status": "running"},
+            {
+                "$set": {"status": "failed", "error": str(e), "finished_at": datetime.utcnow()},
+                "$unset": {"active_key": ""},
+            },
+        )
+        return {"job_id": job_id, "status": "failed"}
+
+    # Only a job still running is ours: a stale one was failed by submit(),
+    # and nothing will ever point at its file
+    result = jobs.update_one(
+        {"_id": job_id, "status": "running"},
+        {
+            "$set": {
+                "status": "done",
+                "rows": rows,
+                "file_id": file_id,
+                "filename": filename,
+                "finished_at": datetime.utcnow(),
+            },
+            "$unset": {"active_key": ""},
+        },
+    )
+    if not result.modified_count:
+        logger.warning(f"⚠️  Report job {job_id} was failed as stale while running; discarding {filename}")
+        sync_gridfs_service.delete_file(file_id)
+        return {"job_id": job_id, "status": "discarded"}
+
+    logger.info(f"✅ Report job {job_id} done: {rows} rows → {filename}")
+    return {"job_id": job_id, "status": "done", "rows": rows, "file_id": file_id}
@@ -0,0 +1,33 @@
+# backend/app/tasks/stats_tasks.py
+"""
+Periodic maintenance of materialized statistics.
+
+The farmer_stats document is kept current by $inc on every farmer write;
+reconcile_farmer_stats rebuilds it from the farmers collection so that
+drift from writes made outside the API (seed scripts, manual fixes) does
+not accumulate. Scheduled by celery beat (see celery_app.beat_schedule).
+"""
+from celery import shared_task
+
+from app.services.farmer_stats_service import (
+    STATS_COLLECTION,
+    STATS_ID,
+    reconcile_pipeline,
+    stats_document_from_facets,
+)
+from app.tasks.sync_tasks import get_db_sync
+
+
+@shared_task(name="app.tasks.stats_tasks.reconcile_farmer_stats")
+def reconcile_farmer_stats():
+    """
+    Rebuild the farmer_stats document from scratch.
+
+    Returns:
+        dict: Total farmers counted and number of districts
+    """
+    db = get_db_sync()
+    result = list(db.farmers.aggregate(reconcile_pipeline()))
+    doc = stats_document_from_facets(result[0] if result else None)
+    db[STATS_COLLECTION].replace_one({"_id": STATS_ID}, doc, upsert=True)
+    return {"total": doc["total"], "districts": len(doc["by_district"])}
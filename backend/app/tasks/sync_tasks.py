@@ -4,6 +4,11 @@ from datetime import datetime
 from uuid import uuid4
 from app.config import settings
 from app.services.farmer_service import FarmerService
+from app.services.farmer_stats_service import STATS_COLLECTION, STATS_ID, stats_delta, stats_update
+from app.services.registration_rollups import ROLLUP_COLLECTION, rollup_changes, rollup_update
+from app.services.report_cache import FARMERS, invalidate_tags_sync
+from app.utils.location_utils import build_location
+from app.utils.search_utils import build_search_fields
 
 
 MONGODB_URL = settings.MONGODB_URL or "mongodb://mongo:27017"
@@ -65,7 +70,16 @@ def process_sync_batch(self, user_email, records):
             # 4. Update existing record
             rec["updated_at"] = now
             rec["last_modified_by"] = user_email
-            farmers_coll.update_one({"_id": existing["_id"]}, {"$set": rec})
+            rec["search"] = build_search_fields({**existing, **rec})
+            update = {"$set": rec}
+            if "address" in rec:
+                location = build_location(rec["address"])
+                if location:
+                    rec["location"] = location
+                elif "location" in existing:
+                    update["$unset"] = {"location": ""}
+            farmers_coll.update_one({"_id": existing["_id"]}, update)
+            _apply_stats(db, existing, {**existing, **rec})
             out_results.append({
                 "temp_id": temp_id,
                 "farmer_id": existing.get("farmer_id"),
@@ -77,7 +91,12 @@ def process_sync_batch(self, user_email, records):
             rec["farmer_id"] = rec.get("farmer_id") or ("ZM" + uuid4().hex[:8].upper())
             rec["created_at"] = now
             rec["created_by"] = user_email
+            rec["search"] = build_search_fields(rec)
+            location = build_location(rec.get("address"))
+            if location:
+                rec["location"] = location
             farmers_coll.insert_one(rec)
+            _apply_stats(db, None, rec)
             out_results.append({
                 "temp_id": temp_id,
                 "farmer_id": rec["farmer_id"],
@@ -85,4 +104,16 @@ def process_sync_batch(self, user_email, records):
                 "errors": []
             })
 
+    if any(r["status"] != "error" for r in out_results):
+        invalidate_tags_sync(FARMERS)
+
     return {"job_id": self.request.id, "results": out_results}
+
+
+def _apply_stats(db, before, after):
+    """Keep farmer_stats and registration_rollups in step with a synced record."""
+    delta = stats_delta(before, after)
+    if delta:
+        db[STATS_COLLECTION].update_one({"_id": STATS_ID}, stats_update(delta), upsert=True)
+    for key, inc in rollup_changes(before, after):
+        db[ROLLUP_COLLECTION].update_one(key, rollup_update(inc), upsert=True)
@@ -0,0 +1,123 @@
+# backend/app/utils/location_utils.py
+"""
+GeoJSON locations for farmer proximity queries.
+
+Farmer GPS is captured as loose `address.gps_latitude` / `gps_longitude`
+floats. Every farmer with valid coordinates also carries a derived GeoJSON
+point, covered by the `location_2dsphere` index:
+
+    "location": {"type": "Point", "coordinates": [28.89, -11.20]}  # [lon, lat]
+
+The point is rebuilt whenever the address is written (create, update,
+offline sync) and backfilled for older documents with
+scripts/backfill_farmer_locations.py.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def build_location(address: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Build the GeoJSON point of an address.
+
+    Args:
+        address: Farmer address sub-document
+
+    Returns:
+        GeoJSON Point, or None if the address has no valid coordinates
+    """
+    if not isinstance(address, dict):
+        return None
+    lat = address.get("gps_latitude")
+    lon = address.get("gps_longitude")
+    if not _is_coordinate(lat, 90) or not _is_coordinate(lon, 180):
+        return None
+    return {"type": "Point", "coordinates": [float(lon), float(lat)]}
+
+
+def _is_coordinate(value: Any, limit: float) -> bool:
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+        and -limit <= value <= limit
+    )
+
+
+def within_radius_stage(
+    lat: float,
+    lon: float,
+    radius_m: float,
+    query: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    $geoNear stage for farmers within `radius_m` metres, nearest first.
+
+    Args:
+        lat: Centre latitude
+        lon: Centre longitude
+        radius_m: Maximum distance in metres
+        query: Additional filter (scope, status) applied by the same stage
+
+    Returns:
+        Aggregation stage adding `distance_m` to every farmer
+    """
+    stage = {
+        "near": {"type": "Point", "coordinates": [lon, lat]},
+        "distanceField": "distance_m",
+        "maxDistance": radius_m,
+        "key": "location",
+        "spherical": True,
+    }
+    if query:
+        stage["query"] = query
+    return {"$geoNear": stage}
+
+
+def polygon_geometry(points: Sequence[Sequence[float]]) -> Dict[str, Any]:
+    """
+    GeoJSON polygon from a ring of [lon, lat] points (closed if needed).
+
+    Consecutive repeats of a point are dropped (MongoDB rejects rings with
+    duplicate vertices).
+
+    Raises:
+        ValueError: If the ring has fewer than 3 distinct points or a
+            coordinate is out of range
+    """
+    ring: List[List[float]] = []
+    for point in points:
+        if len(point) != 2 or not _is_coordinate(point[0], 180) or not _is_coordinate(point[1], 90):
+            raise ValueError(f"Invalid [longitude, latitude] point: {list(point)}")
+        vertex = [float(point[0]), float(point[1])]
+        if not ring or ring[-1] != vertex:
+            ring.append(vertex)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    if len({tuple(vertex) for vertex in ring}) < 3:
+        raise ValueError("A polygon needs at least 3 distinct points")
+    ring.append(list(ring[0]))
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def bbox_geometry(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> Dict[str, Any]:
+    """
+    GeoJSON polygon of a longitude/latitude bounding box.
+
+    Raises:
+        ValueError: If the box is empty or out of range
+    """
+    if min_lon >= max_lon or min_lat >= max_lat:
+        raise ValueError("Bounding box must have min_lon < max_lon and min_lat < max_lat")
+    return polygon_geometry([
+        [min_lon, min_lat],
+        [max_lon, min_lat],
+        [max_lon, max_lat],
+        [min_lon, max_lat],
+    ])
+
+
+def within_geometry_match(geometry: Dict[str, Any]) -> Dict[str, Any]:
+    """Filter for farmers whose location lies inside a GeoJSON polygon"""
+    return {"location": {"$geoWithin": {"$geometry": geometry}}}
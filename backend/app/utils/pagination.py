@@ -0,0 +1,138 @@
+# backend/app/utils/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token encoding the (created_at, _id) of the
+last document on the previous page (legacy records with string, numeric or
+missing created_at are paged too, after all dated records). The next page is fetched with a range
+filter on the (created_at desc, _id desc) ordering instead of .skip(), so
+every page costs the same index seek no matter how deep it is.
+
+Usage:
+    query = apply_keyset(query, decode_cursor(cursor))
+    docs = await coll.find(query).sort(KEYSET_SORT).limit(limit).to_list(limit)
+    next_cursor = next_cursor_from(docs, limit)
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+
+# Sort order every keyset query must use (newest first, _id as tie-breaker)
+KEYSET_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+# Legacy created_at values sort after every date in KEYSET_SORT, in BSON
+# type order: strings, then numbers, then null / missing. A cursor may sit
+# in any of these runs; everything in a later run comes after it.
+_LEGACY_RUNS = (
+    ("s", {"$type": "string"}),
+    ("n", {"$type": "number"}),
+    ("z", None),  # matches null and missing
+)
+
+
+def _cursor_kind(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return "t"
+    if isinstance(value, str):
+        return "s"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return "n"
+    if value is None:
+        return "z"
+    return None
+
+
+def encode_cursor(created_at: Any, object_id: ObjectId) -> str:
+    """
+    Encode a (created_at, _id) position as an opaque cursor string.
+
+    created_at is normally a datetime; legacy string, numeric and null
+    values are encoded too, so paging continues through legacy records.
+    """
+    kind = _cursor_kind(created_at)
+    if kind is None:
+        raise ValueError(f"Unsupported created_at type: {type(created_at).__name__}")
+    if kind == "t":
+        payload = {"t": created_at.isoformat(), "id": str(object_id)}
+    else:
+        payload = {"k": kind, "v": created_at, "id": str(object_id)}
+    payload = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, ObjectId]]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Returns:
+        (created_at, _id) tuple, or None when no cursor was given
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if "t" in payload:
+            return datetime.fromisoformat(payload["t"]), ObjectId(payload["id"])
+        value = payload["v"]
+        if _cursor_kind(value) != payload["k"]:
+            raise ValueError("cursor kind mismatch")
+        return value, ObjectId(payload["id"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def apply_keyset(
+    query: Dict[str, Any],
+    position: Optional[Tuple[Any, ObjectId]],
+) -> Dict[str, Any]:
+    """
+    Restrict a filter to documents strictly after `position` in KEYSET_SORT.
+
+    Range filters on created_at only match values of the same BSON type, so
+    the runs of legacy values that sort after the position's type are
+    added explicitly; each branch is an index range.
+
+    The existing filter is AND-ed (not merged) so a caller-supplied $or is
+    preserved.
+    """
+    if position is None:
+        return query
+    created_at, object_id = position
+    kind = _cursor_kind(created_at)
+    branches = [{"created_at": created_at, "_id": {"$lt": object_id}}]
+    if kind != "z":
+        branches.insert(0, {"created_at": {"$lt": created_at}})
+    kinds = [run_kind for run_kind, _ in _LEGACY_RUNS]
+    later = kinds[kinds.index(kind) + 1:] if kind in kinds else kinds
+    branches += [{"created_at": match} for run_kind, match in _LEGACY_RUNS if run_kind in later]
+    keyset = {"$or": branches}
+    if not query:
+        return keyset
+    return {"$and": [query, keyset]}
+
+
+def next_cursor_from(docs: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """
+    Build the cursor for the page after `docs`.
+
+    Returns None when the page was not full (no more results) or when the
+    last document's created_at has a type no legacy record is known to use.
+    """
+    if not docs or len(docs) < limit:
+        return None
+    last = docs[-1]
+    created_at = last.get("created_at")
+    if _cursor_kind(created_at) is None or "_id" not in last:
+        return None
+    return encode_cursor(created_at, last["_id"])
@@ -0,0 +1,148 @@
+# backend/app/utils/search_utils.py
+"""
+Normalized search keys for farmer lookup.
+
+Instead of running unanchored, case-insensitive $regex over raw fields,
+every farmer document carries a precomputed `search` sub-document:
+
+    {
+        "tokens": ["john", "zimba"],        # lowercased name tokens
+        "phone_digits": "977000000",        # national number, digits only
+        "farmer_id": "ZM1A2B3C4D",          # uppercase ID
+        "keys": ["john", "zimba", "977000000", "zm1a2b3c4d"]
+    }
+
+`search.keys` is covered by a multikey index, so anchored prefix queries
+(`^term`) are served by an index range scan regardless of collection size.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+
+_TOKEN_SPLIT = re.compile(r"[^\w]+", re.UNICODE)
+_NON_DIGITS = re.compile(r"\D")
+
+# Zambian numbers are stored as +260XXXXXXXXX or 0XXXXXXXXX; both reduce to
+# the same 9-digit national significant number.
+_PHONE_PREFIXES = ("260", "0")
+
+# Maximum number of query terms honoured (protects against huge $all lists)
+MAX_QUERY_TERMS = 5
+
+# Shorter terms are ignored: a 1-2 character prefix matches a large share
+# of the collection and would make the relevance sort scale with it
+MIN_TERM_LENGTH = 3
+
+# Matches scored and ranked per search (the index-ordered candidates
+# beyond it are not considered; refine the query to reach them)
+SEARCH_CANDIDATE_LIMIT = 1000
+
+
+def normalize_phone(value: Optional[str], partial: bool = False) -> str:
+    """
+    Reduce a phone number to its digits-only national number.
+
+    Args:
+        value: Phone number in any format
+        partial: Treat value as a typed prefix (strip the country/trunk
+            prefix even when fewer than 9 digits follow)
+    """
+    digits = _NON_DIGITS.sub("", value or "")
+    for prefix in _PHONE_PREFIXES:
+        remainder = digits[len(prefix):]
+        if digits.startswith(prefix) and (len(remainder) >= 9 or (partial and remainder)):
+            return remainder
+    return digits
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Split free text into lowercased word tokens."""
+    return [t for t in _TOKEN_SPLIT.split((value or "").lower()) if t]
+
+
+def build_search_fields(farmer: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the `search` sub-document for a farmer document.
+
+    Handles both the nested personal_info structure and legacy flat fields.
+
+    Args:
+        farmer: Farmer document (or partial document) as stored in MongoDB
+
+    Returns:
+        dict: Value for the farmer's `search` field
+    """
+    personal_info = farmer.get("personal_info") or {}
+    first_name = personal_info.get("first_name") or farmer.get("first_name") or ""
+    last_name = personal_info.get("last_name") or farmer.get("last_name") or ""
+    phone = personal_info.get("phone_primary") or farmer.get("phone_primary") or ""
+    farmer_id = (farmer.get("farmer_id") or "").upper()
+
+    tokens = []
+    for token in tokenize(first_name) + tokenize(last_name):
+        if token not in tokens:
+            tokens.append(token)
+
+    phone_digits = normalize_phone(phone)
+
+    keys = list(tokens)
+    if phone_digits:
+        keys.append(phone_digits)
+    if farmer_id:
+        keys.append(farmer_id.lower())
+
+    return {
+        "tokens": tokens,
+        "phone_digits": phone_digits,
+        "farmer_id": farmer_id,
+        "keys": keys,
+    }
+
+
+def normalize_query(search: Optional[str]) -> List[str]:
+    """
+    Turn raw user input into normalized search terms.
+
+    Digit-only terms (phone numbers) are reduced the same way stored phones
+    are, so "+260977000", "0977000" and "977000" all match the same keys.
+    Terms shorter than MIN_TERM_LENGTH are dropped. Terms are regex-escaped
+    by the caller before being anchored.
+    """
+    terms = []
+    for token in tokenize(search):
+        term = normalize_phone(token, partial=True) if token.isdigit() else token
+        if len(term) >= MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def build_search_match(terms: List[str]) -> Dict[str, Any]:
+    """
+    Build an index-served $match filter: every term must prefix some key.
+
+    Args:
+        terms: Output of normalize_query()
+
+    Returns:
+        dict: MongoDB filter on `search.keys`
+    """
+    clauses = [{"search.keys": re.compile(f"^{re.escape(term)}")} for term in terms]
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def build_relevance_score(terms: List[str]) -> Dict[str, Any]:
+    """
+    Aggregation expression ranking matches: exact farmer ID first, then
+    exact phone, then the number of terms that equal a whole key.
+    """
+    upper_terms = [t.upper() for t in terms]
+    return {
+        "$add": [
+            {"$cond": [{"$in": ["$search.farmer_id", upper_terms]}, 100, 0]},
+            {"$cond": [{"$in": ["$search.phone_digits", terms]}, 50, 0]},
+            {"$size": {"$setIntersection": [{"$ifNull": ["$search.keys", []]}, terms]}},
+        ]
+    }
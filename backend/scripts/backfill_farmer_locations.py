@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Backfill GeoJSON locations on farmers with GPS coordinates, then create the
+2dsphere index used by the proximity endpoints.
+Usage: python scripts/backfill_farmer_locations.py
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.indexes import ensure_indexes
+from app.services.farmer_service import FarmerService
+
+
+async def backfill_farmer_locations():
+    """Populate farmers.location for every farmer with coordinates that lacks it."""
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    missing = await db.farmers.count_documents({
+        "location": {"$exists": False},
+        "address.gps_latitude": {"$type": "number"},
+        "address.gps_longitude": {"$type": "number"},
+    })
+    print(f"📍 Farmers with GPS but no location: {missing}")
+    
+    updated = await FarmerService(db).backfill_locations()
+    print(f"✅ Backfilled locations on {updated} farmers")
+    
+    await ensure_indexes(db)
+    print("✅ Indexes ensured")
+    
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_farmer_locations())
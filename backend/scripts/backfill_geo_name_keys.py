@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Backfill normalized name keys (and upper-case parent codes) on provinces,
+districts and chiefdoms, then create the unique name indexes that custom geo
+entries rely on. The API also does this at startup; the script is for
+running it without a restart.
+Usage: python scripts/backfill_geo_name_keys.py
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.indexes import ensure_indexes
+from app.services.geo_custom_service import GeoCustomService
+
+
+async def backfill_geo_name_keys():
+    """Populate name_key on every geographic entry that lacks it."""
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    updated = await GeoCustomService(db).backfill_name_keys()
+    print(f"✅ Backfilled name keys on {updated} geographic entries")
+    
+    await ensure_indexes(db)
+    print("✅ Indexes ensured")
+    
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_geo_name_keys())
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Rebuild the registration_rollups collection from the farmers collection.
+Run once after deploying the rollups, and whenever drift is suspected.
+Usage: python scripts/backfill_registration_rollups.py
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.indexes import ensure_indexes
+from app.services.registration_rollups import RegistrationRollupService
+
+
+async def backfill_registration_rollups():
+    """Recompute every (day, district, operator) registration bucket."""
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+
+    await ensure_indexes(db)
+    print("✅ Indexes ensured")
+
+    written = await RegistrationRollupService(db).rebuild()
+    print(f"✅ Rebuilt {written} registration rollup buckets")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_registration_rollups())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Backfill normalized search keys on legacy farmer documents.
+Usage: python scripts/backfill_search_keys.py
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.config import settings
+from app.indexes import ensure_indexes
+from app.services.farmer_service import FarmerService
+
+
+async def backfill_search_keys():
+    """Populate farmers.search for every farmer that lacks it."""
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.MONGODB_DB_NAME]
+    
+    missing = await db.farmers.count_documents({"search.keys": {"$exists": False}})
+    print(f"🔎 Farmers without search keys: {missing}")
+    
+    updated = await FarmerService(db).backfill_search_keys()
+    print(f"✅ Backfilled search keys on {updated} farmers")
+    
+    await ensure_indexes(db)
+    print("✅ Indexes ensured")
+    
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_search_keys())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request overhead of the HTTP middleware stack.
+
+Compares the former four `@app.middleware("http")` layers from main.py
+(request id, request logging, preflight, cache control - each a
+BaseHTTPMiddleware) against the single RequestPipelineMiddleware, on an
+app with one trivial JSON endpoint and no database.
+
+Usage: python scripts/bench_middleware.py [--requests 5000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.responses import Response
+
+from app.middleware.request_pipeline import RequestPipelineMiddleware
+
+
+bench_logger = logging.getLogger("bench")
+
+
+def preflight_headers(request_headers) -> dict:
+    return {
+        "Access-Control-Allow-Origin": request_headers.get("origin") or "*",
+        "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,PATCH,OPTIONS",
+        "Access-Control-Allow-Headers": request_headers.get("access-control-request-headers", "*"),
+        "Access-Control-Allow-Credentials": "true",
+        "Access-Control-Max-Age": "3600",
+    }
+
+
+def add_endpoint(app: FastAPI) -> FastAPI:
+    @app.get("/api/ping")
+    async def ping():
+        return {"status": "ok"}
+    return app
+
+
+def build_legacy_app() -> FastAPI:
+    """The four BaseHTTPMiddleware layers as they were registered in main.py"""
+    app = add_endpoint(FastAPI())
+
+    @app.middleware("http")
+    async def add_request_id(request: Request, call_next):
+        request_id = str(uuid.uuid4())[:8]
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        request_id = getattr(request.state, "request_id", "unknown")
+        start_time = time.time()
+        bench_logger.info(f"[{request_id}] 📨 {request.method} {request.url.path}")
+        response = await call_next(request)
+        duration = (time.time() - start_time) * 1000
+        bench_logger.info(f"[{request_id}] ✅ {response.status_code} | {duration:.2f}ms")
+        return response
+
+    @app.middleware("http")
+    async def preflight_middleware(request: Request, call_next):
+        if request.method == "OPTIONS":
+            return Response(status_code=200, content=b"", headers=preflight_headers(request.headers))
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def cache_control_middleware(request: Request, call_next):
+        response = await call_next(request)
+        if request.url.path.startswith("/api/"):
+            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+            response.headers["Pragma"] = "no-cache"
+            response.headers["Vary"] = response.headers.get("Vary", "Origin, Authorization")
+        return response
+
+    return app
+
+
+def build_pipeline_app() -> FastAPI:
+    app = add_endpoint(FastAPI())
+    app.add_middleware(RequestPipelineMiddleware, preflight_headers=preflight_headers)
+    return app
+
+
+def build_bare_app() -> FastAPI:
+    return add_endpoint(FastAPI())
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    """Return mean microseconds per request"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):  # warm-up
+            await client.get("/api/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/api/ping")
+        elapsed = time.perf_counter() - start
+    return elapsed / requests * 1e6
+
+
+async def visible_headers(app: FastAPI) -> dict:
+    """Headers the stack adds to an API response and to an OPTIONS request"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        get = await client.get("/api/ping")
+        options = await client.options("/api/ping")
+    names = ("cache-control", "pragma", "vary", "access-control-allow-origin")
+    return {
+        "get": {n: get.headers.get(n) for n in names} | {"x-request-id": "x-request-id" in get.headers},
+        "options": (options.status_code, "x-request-id" in options.headers),
+    }
+
+
+async def main(requests: int):
+    # Keep log formatting cost out of the comparison
+    logging.getLogger("app.main").setLevel(logging.WARNING)
+    bench_logger.setLevel(logging.WARNING)
+
+    legacy_headers = await visible_headers(build_legacy_app())
+    pipeline_headers = await visible_headers(build_pipeline_app())
+    legacy_headers["options"] = (legacy_headers["options"][0], True)  # legacy preflight had no request id
+    assert legacy_headers == pipeline_headers, (legacy_headers, pipeline_headers)
+
+    bare = await run(build_bare_app(), requests)
+    legacy = await run(build_legacy_app(), requests)
+    pipeline = await run(build_pipeline_app(), requests)
+
+    print(f"📊 {requests} GET /api/ping requests (httpx ASGI transport)")
+    print(f"   No middleware:             {bare:8.1f} µs/request")
+    print(f"   4 x BaseHTTPMiddleware:    {legacy:8.1f} µs/request  (+{legacy - bare:.1f} µs)")
+    print(f"   RequestPipelineMiddleware: {pipeline:8.1f} µs/request  (+{pipeline - bare:.1f} µs)")
+    print(f"✅ Overhead saved per request: {legacy - pipeline:.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
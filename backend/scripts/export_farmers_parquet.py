@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Export the farmers collection to a Parquet file for analytics.
+
+Rows are read from a batched cursor and written one row group per batch,
+so memory stays flat for any collection size. Requires pyarrow.
+
+Usage:
+    python scripts/export_farmers_parquet.py farmers.parquet
+    python scripts/export_farmers_parquet.py out.parquet --columns farmer_id,address_district_name \\
+        --status approved --since 2024-01-01 --until 2025-01-01
+    python scripts/export_farmers_parquet.py --list-columns
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import MongoClient
+from app.config import settings
+from app.services.farmer_columnar import (
+    COLUMN_SPECS,
+    PARQUET_COMPRESSIONS,
+    batched_rows,
+    columnar_cursor,
+    resolve_columns,
+    write_parquet,
+)
+from app.services.farmer_export import build_export_filter
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export farmers to Parquet")
+    parser.add_argument("output", nargs="?", help="Output .parquet path")
+    parser.add_argument("--columns", help="Comma-separated column names (default: all)")
+    parser.add_argument("--list-columns", action="store_true", help="Print the available columns and exit")
+    parser.add_argument("--province", help="Province name")
+    parser.add_argument("--district", help="District name")
+    parser.add_argument("--status", help="Registration status")
+    parser.add_argument("--operator", help="Registering operator email")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Registered on/after (ISO date)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Registered before (ISO date)")
+    parser.add_argument("--batch-size", type=int, default=settings.REPORT_EXPORT_BATCH_SIZE,
+                        help="Rows per cursor batch / row group")
+    parser.add_argument("--compression", choices=PARQUET_COMPRESSIONS, default="zstd")
+    return parser.parse_args()
+
+
+def export_farmers_parquet(args) -> int:
+    """Write the selected farmers to args.output. Returns the row count."""
+    columns = resolve_columns(args.columns.split(",") if args.columns else None)
+    query = build_export_filter(
+        args.province, args.district, args.status, args.since, args.until, created_by=args.operator
+    )
+
+    client = MongoClient(settings.MONGODB_URL)
+    try:
+        db = client[settings.MONGODB_DB_NAME]
+        cursor = columnar_cursor(db.farmers, query, columns, args.batch_size)
+        with open(args.output, "wb") as fh:
+            return write_parquet(fh, columns, batched_rows(cursor, columns, args.batch_size), args.compression)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.list_columns:
+        for name, (path, kind) in COLUMN_SPECS.items():
+            print(f"{name:42} {kind:10} {path}")
+        sys.exit(0)
+    if not args.output:
+        sys.exit("output path is required")
+
+    started = time.perf_counter()
+    try:
+        rows = export_farmers_parquet(args)
+    except (ImportError, ValueError) as e:
+        sys.exit(f"❌ {e}")
+    size_mb = os.path.getsize(args.output) / (1024 * 1024)
+    print(f"✅ Exported {rows} farmers to {args.output} ({size_mb:.2f} MB) in {time.perf_counter() - started:.1f}s")
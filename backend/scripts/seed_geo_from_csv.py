@@ -1,11 +1,17 @@
 import os
+import sys
 import pandas as pd
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 load_dotenv()
 
+from app.services.geo_store import bump_stored_geo_version
+
 MONGO_URI = os.getenv("MONGODB_URL") or os.getenv("MONGODB_URI")
 DB_NAME = "zambian_farmer_db"
 
@@ -66,8 +72,11 @@ async def seed_geo_data():
             upsert=True,
         )
 
+    # Running API workers reload their in-memory geo data on the new version
+    version = await bump_stored_geo_version(db)
+
     # --- Summary ---
-    print("✅ Geo data seeded successfully.")
+    print(f"✅ Geo data seeded successfully (geo version {version}).")
     print(f"   Provinces: {await db.provinces.count_documents({})}")
     print(f"   Districts: {await db.districts.count_documents({})}")
     print(f"   Chiefdoms: {await db.chiefdoms.count_documents({})}")
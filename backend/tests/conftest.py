@@ -11,6 +11,10 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.config import settings
 from app.database import get_db
+from app.dependencies.operator_scope import invalidate_operator_scope
+from app.services.geo_store import geo_store
+from app.services.principal_cache import principal_cache
+from app.services.report_cache import report_cache
 from app.utils.security import create_access_token, hash_password
 
 
@@ -69,6 +73,12 @@ async def async_client(test_db) -> AsyncGenerator[AsyncClient, None]:
     """Create async HTTP client for testing."""
     # Override the database dependency
     app.dependency_overrides[get_db] = override_get_db
+    # Each test starts from a clean database, so drop principals/scopes/
+    # reports / geo data cached by earlier tests
+    principal_cache.clear_local()
+    invalidate_operator_scope()
+    report_cache.clear_local()
+    geo_store.clear()
     
     async with AsyncClient(
         transport=ASGITransport(app=app),
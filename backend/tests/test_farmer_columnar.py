@@ -0,0 +1,119 @@
+"""
+Tests for the columnar (Parquet / Arrow) farmer export.
+"""
+import io
+from datetime import datetime
+
+import pytest
+
+from app.services.farmer_columnar import (
+    COLUMN_SPECS,
+    ArrowStreamEncoder,
+    batched_rows,
+    columnar_projection,
+    flatten_farmer,
+    resolve_columns,
+    write_parquet,
+)
+
+
+FARMER = {
+    "farmer_id": "ZM0001",
+    "created_at": datetime(2024, 3, 1, 8, 30),
+    "personal_info": {"first_name": "Mary", "last_name": "Banda"},
+    "address": {"district_name": "Mansa", "gps_latitude": "-11.2"},
+    "farm_info": {"farm_size_hectares": 2, "crops_grown": ["maize", "beans"], "years_farming": "7"},
+    "household_info": {"household_size": 5},
+}
+
+
+class TestColumnSelection:
+    """Test column validation and projection."""
+
+    def test_default_selects_every_column(self):
+        assert resolve_columns(None) == list(COLUMN_SPECS)
+        assert resolve_columns(["", " "]) == list(COLUMN_SPECS)
+
+    def test_selection_keeps_order_and_drops_duplicates(self):
+        assert resolve_columns(["address_district_name", " farmer_id", "farmer_id"]) == [
+            "address_district_name",
+            "farmer_id",
+        ]
+
+    def test_unknown_column_rejected(self):
+        with pytest.raises(ValueError, match="bogus"):
+            resolve_columns(["farmer_id", "bogus"])
+
+    def test_projection_uses_document_paths(self):
+        assert columnar_projection(["farmer_id", "farm_info_crops_grown"]) == {
+            "_id": 0,
+            "farmer_id": 1,
+            "farm_info.crops_grown": 1,
+        }
+
+
+class TestFlattenFarmer:
+    """Test flattening and type coercion."""
+
+    def test_values_are_coerced_to_column_types(self):
+        columns = [
+            "farmer_id",
+            "address_gps_latitude",
+            "farm_info_farm_size_hectares",
+            "farm_info_years_farming",
+            "farm_info_crops_grown",
+            "created_at",
+        ]
+        assert flatten_farmer(FARMER, columns) == {
+            "farmer_id": "ZM0001",
+            "address_gps_latitude": -11.2,
+            "farm_info_farm_size_hectares": 2.0,
+            "farm_info_years_farming": 7,
+            "farm_info_crops_grown": ["maize", "beans"],
+            "created_at": datetime(2024, 3, 1, 8, 30),
+        }
+
+    def test_missing_and_invalid_values_are_null(self):
+        farmer = {"farm_info": {"years_farming": "many"}, "household_info": None}
+        row = flatten_farmer(farmer, ["farm_info_years_farming", "household_info_household_size", "updated_at"])
+        assert row == {"farm_info_years_farming": None, "household_info_household_size": None, "updated_at": None}
+
+    def test_bool_strings_are_parsed(self):
+        values = [True, "false", "No", "0", "yes", "Y", 1, 0, "maybe", 2]
+        rows = [flatten_farmer({"farm_info": {"has_irrigation": v}}, ["farm_info_has_irrigation"]) for v in values]
+        assert [row["farm_info_has_irrigation"] for row in rows] == [
+            True, False, False, False, True, True, True, False, None, None,
+        ]
+
+    def test_batching(self):
+        sizes = [len(batch) for batch in batched_rows([FARMER] * 7, ["farmer_id"], batch_size=3)]
+        assert sizes == [3, 3, 1]
+
+
+class TestColumnarWriters:
+    """Test Parquet row groups and the Arrow IPC stream (requires pyarrow)."""
+
+    def test_parquet_row_group_per_batch(self):
+        pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        columns = resolve_columns(None)
+        fh = io.BytesIO()
+        assert write_parquet(fh, columns, batched_rows([FARMER] * 5, columns, batch_size=2)) == 5
+        fh.seek(0)
+        parquet = pq.ParquetFile(fh)
+        assert parquet.metadata.num_rows == 5
+        assert parquet.metadata.num_row_groups == 3
+        assert parquet.read().column("address_district_name").to_pylist() == ["Mansa"] * 5
+
+    def test_arrow_stream_round_trip(self):
+        pa = pytest.importorskip("pyarrow")
+
+        columns = ["farmer_id", "farm_info_crops_grown"]
+        encoder = ArrowStreamEncoder(columns)
+        parts = [encoder.start()]
+        parts += [encoder.encode(rows) for rows in batched_rows([FARMER] * 3, columns, batch_size=2)]
+        parts.append(encoder.finish())
+        table = pa.ipc.open_stream(b"".join(parts)).read_all()
+        assert table.num_rows == 3
+        assert table.column("farm_info_crops_grown").to_pylist()[0] == ["maize", "beans"]
@@ -0,0 +1,73 @@
+"""
+Tests for the farmer details export helpers.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+from app.services.farmer_export import (
+    FARMER_DETAIL_COLUMNS,
+    build_export_filter,
+    format_farmer_detail,
+    rows_to_csv,
+    rows_to_ndjson,
+)
+
+
+FARMER = {
+    "farmer_id": "ZM1A2B3C4D",
+    "personal_info": {"first_name": "Mwila", "last_name": "Banda", "nrc": "123456/78/1"},
+    "address": {"province_name": "Luapula Province", "district_name": "Mansa District"},
+    "farm_info": {"farm_size_hectares": 2.5, "crops_grown": ["Maize", "Cassava"]},
+    "registration_status": "approved",
+    "created_by": "op@example.com",
+    "created_at": datetime(2025, 3, 4, 10, 30),
+}
+
+
+class TestExportFilter:
+    """Test filter construction."""
+
+    def test_empty(self):
+        assert build_export_filter() == {}
+
+    def test_all_filters(self):
+        start, end = datetime(2025, 1, 1), datetime(2025, 2, 1)
+        assert build_export_filter("Luapula Province", "Mansa District", "approved", start, end) == {
+            "address.province_name": "Luapula Province",
+            "address.district_name": "Mansa District",
+            "registration_status": "approved",
+            "created_at": {"$gte": start, "$lt": end},
+        }
+
+
+class TestFormatting:
+    """Test row formatting and encoding."""
+
+    def test_format_row(self):
+        row = format_farmer_detail(FARMER)
+        assert list(row) == FARMER_DETAIL_COLUMNS
+        assert row["full_name"] == "Mwila Banda"
+        assert row["crops"] == "Maize, Cassava"
+        assert row["registration_date"] == "2025-03-04"
+
+    def test_format_sparse_document(self):
+        row = format_farmer_detail({"farm_info": None, "personal_info": None})
+        assert row["full_name"] == "N/A"
+        assert row["crops"] == "None"
+        assert row["total_land_size"] == 0
+        assert row["registration_date"] == ""
+
+    def test_csv_round_trip(self):
+        rows = [format_farmer_detail(FARMER)]
+        body = rows_to_csv([], header=True) + rows_to_csv(rows)
+        parsed = list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+        assert parsed[0]["crops"] == "Maize, Cassava"
+        assert parsed[0]["farmer_id"] == "ZM1A2B3C4D"
+
+    def test_ndjson_one_line_per_row(self):
+        rows = [format_farmer_detail(FARMER), format_farmer_detail({})]
+        lines = rows_to_ndjson(rows).decode("utf-8").splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])["district"] == "Mansa District"
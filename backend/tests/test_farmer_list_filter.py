@@ -0,0 +1,47 @@
+"""
+Tests for the filter shared by farmer list, count and combined queries.
+"""
+from app.services.farmer_service import FarmerService, LIST_ITEM_PROJECTION
+from app.utils.search_utils import SEARCH_CANDIDATE_LIMIT
+
+
+class TestFarmerListFilter:
+    """Test the shared list/count filter builder."""
+
+    def test_no_filters_is_empty(self):
+        query, terms = FarmerService._build_list_filter()
+        assert query == {}
+        assert terms == []
+
+    def test_operator_scope_is_or(self):
+        query, _ = FarmerService._build_list_filter(
+            allowed_districts=["Mansa"], created_by="op@example.com", district="Ignored"
+        )
+        assert query == {"$or": [
+            {"address.district_name": {"$in": ["Mansa"]}},
+            {"created_by": "op@example.com"},
+        ]}
+
+    def test_district_without_scope(self):
+        query, _ = FarmerService._build_list_filter(status="verified", district="Mansa")
+        assert query == {"registration_status": "verified", "address.district_name": "Mansa"}
+
+    def test_exact_id_overrides_search(self):
+        query, terms = FarmerService._build_list_filter(farmer_id_exact="ZM1A2B3C4D", search="john")
+        assert query == {"farmer_id": "ZM1A2B3C4D"}
+        assert terms == []
+
+    def test_search_returns_terms(self):
+        query, terms = FarmerService._build_list_filter(search="John Zimba")
+        assert terms == ["john", "zimba"]
+        assert len(query["$and"]) == 2
+
+    def test_search_pipeline_bounds_candidates_before_scoring(self):
+        stages = FarmerService._items_pipeline({"search.keys": "x"}, ["john"], None, 0, 10)
+        assert stages[1] == {"$limit": SEARCH_CANDIDATE_LIMIT}
+        assert "$addFields" in stages[2]
+
+    def test_items_pipeline_skips_only_without_cursor(self):
+        stages = FarmerService._items_pipeline({}, [], None, 20, 10)
+        assert {"$skip": 20} in stages
+        assert stages[-1] == {"$project": LIST_ITEM_PROJECTION}
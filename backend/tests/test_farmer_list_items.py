@@ -0,0 +1,45 @@
+"""
+Tests for building farmer list items from projected documents.
+"""
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.services.farmer_service import FarmerService, LIST_ITEM_PROJECTION
+
+
+class TestFarmerListItems:
+    """Test list item construction and the list projection."""
+
+    def test_projection_excludes_heavy_subdocuments(self):
+        for heavy in ("household_info", "farm_info", "documents", "identification_documents"):
+            assert not any(key.split(".")[0] == heavy for key in LIST_ITEM_PROJECTION)
+
+    def test_nested_document(self):
+        oid = ObjectId()
+        item = FarmerService._to_list_item({
+            "_id": oid,
+            "farmer_id": "ZM1A2B3C4D",
+            "registration_status": "verified",
+            "created_at": datetime(2025, 1, 1),
+            "personal_info": {"first_name": "John", "last_name": "Zimba", "phone_primary": "0977000000"},
+            "address": {"district_name": "Mansa District", "village": "Chisenga"},
+        })
+        assert item.id == str(oid)
+        assert item.district_name == "Mansa District"
+        assert item.is_active is True
+
+    def test_legacy_flat_document(self):
+        oid = ObjectId()
+        item = FarmerService._to_list_item({
+            "_id": oid,
+            "first_name": "Mary",
+            "last_name": "Banda",
+            "phone_primary": "0966000000",
+            "created_at": "",
+            "address": {"district": "Kawambwa"},
+        })
+        assert item.farmer_id == f"LEGACY_{str(oid)[-8:].upper()}"
+        assert (item.first_name, item.last_name) == ("Mary", "Banda")
+        assert item.district_name == "Kawambwa"
+        assert item.registration_status == "registered"
@@ -0,0 +1,99 @@
+"""
+Tests for the materialized farmer statistics helpers.
+"""
+from app.services.farmer_stats_service import (
+    decode_key,
+    decode_stats,
+    encode_key,
+    merge_stats_deltas,
+    stats_delta,
+    stats_document_from_facets,
+)
+
+
+def farmer(status="pending", district="Mansa", province="Luapula", created_by="op@example.com"):
+    return {
+        "registration_status": status,
+        "address": {"district_name": district, "province_name": province},
+        "created_by": created_by,
+    }
+
+
+class TestKeyEncoding:
+    """Test that bucket values become safe field names."""
+
+    def test_round_trip(self):
+        for value in ["St. Mary's", "$weird", "100%", "a.b$c%2E"]:
+            encoded = encode_key(value)
+            assert "." not in encoded and "$" not in encoded
+            assert decode_key(encoded) == value
+
+    def test_missing_values_are_unknown(self):
+        assert encode_key(None) == "unknown"
+        assert encode_key("") == "unknown"
+
+
+class TestStatsDelta:
+    """Test the $inc computed for each kind of write."""
+
+    def test_insert(self):
+        delta = stats_delta(None, farmer())
+        assert delta == {
+            "total": 1,
+            "by_status.pending": 1,
+            "by_district.Mansa": 1,
+            "by_province.Luapula": 1,
+            "by_operator.op@example%2Ecom": 1,
+        }
+
+    def test_delete_is_negated_insert(self):
+        inserted = stats_delta(None, farmer())
+        deleted = stats_delta(farmer(), None)
+        assert deleted == {path: -value for path, value in inserted.items()}
+
+    def test_status_change_only_moves_status(self):
+        delta = stats_delta(farmer(status="pending"), farmer(status="approved"))
+        assert delta == {"by_status.pending": -1, "by_status.approved": 1}
+
+    def test_unrelated_update_is_empty(self):
+        assert stats_delta(farmer(), farmer()) == {}
+
+    def test_missing_address(self):
+        delta = stats_delta(None, {"registration_status": "pending"})
+        assert delta["by_district.unknown"] == 1
+        assert delta["by_operator.unknown"] == 1
+
+    def test_merged_deltas_sum_and_drop_zeros(self):
+        fill = stats_delta(farmer(district=None), farmer(district="Mansa"))
+        undo = stats_delta(farmer(district="Mansa"), farmer(district=None))
+        assert merge_stats_deltas([fill, fill]) == {"by_district.unknown": -2, "by_district.Mansa": 2}
+        assert merge_stats_deltas([fill, undo]) == {}
+
+
+class TestReconcile:
+    """Test building and decoding the stats document."""
+
+    def test_document_from_facets(self):
+        doc = stats_document_from_facets({
+            "total": [{"count": 3}],
+            "by_status": [{"_id": "pending", "count": 2}, {"_id": "approved", "count": 1}],
+            "by_district": [{"_id": "St. Mary's", "count": 2}, {"_id": None, "count": 1}],
+            "by_province": [{"_id": "Luapula", "count": 3}],
+            "by_operator": [{"_id": None, "count": 1}, {"_id": "", "count": 2}],
+        })
+        assert doc["_id"] == "global"
+        assert doc["total"] == 3
+        assert doc["by_district"] == {"St%2E Mary's": 2, "unknown": 1}
+        assert doc["by_operator"] == {"unknown": 3}
+
+        decoded = decode_stats(doc)
+        assert decoded["by_district"] == {"St. Mary's": 2, "unknown": 1}
+
+    def test_empty_collection(self):
+        doc = stats_document_from_facets({"total": []})
+        assert doc["total"] == 0
+        assert doc["by_status"] == {}
+
+    def test_zero_buckets_are_hidden(self):
+        decoded = decode_stats({"total": 1, "by_status": {"pending": 0, "approved": 1}})
+        assert decoded["by_status"] == {"approved": 1}
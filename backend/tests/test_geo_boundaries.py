@@ -0,0 +1,104 @@
+"""
+Tests for the GPS → district / chiefdom boundary resolver.
+"""
+import random
+
+import pytest
+
+from app.services.geo_boundaries import BoundaryGrid, BoundaryResolver, parse_boundaries, point_in_ring
+
+
+def square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+FEATURES = [
+    # Two districts side by side; LP05 has a hole (an enclave of LP06)
+    {
+        "properties": {"district_id": "lp05", "district_name": "Kawambwa District", "province_id": "LP"},
+        "geometry": {"type": "Polygon", "coordinates": [square(28.0, -11.0, 29.0, -10.0), square(28.4, -10.6, 28.6, -10.4)]},
+    },
+    {
+        "properties": {"district_code": "LP06", "district_name": "Mansa District", "province_code": "LP"},
+        "geometry": {"type": "MultiPolygon", "coordinates": [
+            [square(29.0, -11.0, 30.0, -10.0)],
+            [square(28.4, -10.6, 28.6, -10.4)],
+        ]},
+    },
+    {
+        "properties": {"chiefdom_id": "LP05-002", "chief_name": "Chief Chama", "district_id": "LP05"},
+        "geometry": {"type": "Polygon", "coordinates": [square(28.0, -11.0, 28.3, -10.7)]},
+    },
+    {"properties": {"district_code": "XX01"}, "geometry": None},
+]
+
+
+@pytest.fixture
+def resolver():
+    resolver = BoundaryResolver(cell_degrees=0.1)
+    resolver.load_features(FEATURES, version="v1")
+    return resolver
+
+
+class TestGeometry:
+    """Test parsing and point-in-polygon."""
+
+    def test_point_in_ring(self):
+        ring = [tuple(p) for p in square(0, 0, 1, 1)]
+        assert point_in_ring(0.5, 0.5, ring)
+        assert not point_in_ring(1.5, 0.5, ring)
+
+    def test_parse_levels_and_codes(self):
+        districts, chiefdoms = parse_boundaries(FEATURES)
+        assert [d.code for d in districts] == ["LP05", "LP06"]
+        assert chiefdoms[0].name == "Chief Chama"
+        assert chiefdoms[0].district_code == "LP05"
+
+    def test_grid_agrees_with_brute_force(self):
+        districts, _ = parse_boundaries(FEATURES)
+        grid = BoundaryGrid(districts, 0.07)
+        rng = random.Random(7)
+        for _ in range(2000):
+            x, y = rng.uniform(27.5, 30.5), rng.uniform(-11.5, -9.5)
+            expected = next((d for d in districts if d.contains(x, y)), None)
+            assert grid.find(x, y) is expected
+
+
+class TestResolver:
+    """Test resolving, checking and filling addresses."""
+
+    def test_resolve(self, resolver):
+        resolved = resolver.resolve(lat=-10.9, lon=28.1)
+        assert (resolved.district_code, resolved.chiefdom_code) == ("LP05", "LP05-002")
+        assert resolved.province_code == "LP"
+        # Inside LP05's hole: the LP06 enclave
+        assert resolver.resolve(lat=-10.5, lon=28.5).district_code == "LP06"
+        assert resolver.resolve(lat=-5.0, lon=28.5) is None
+
+    def test_check_address(self, resolver):
+        gps = {"gps_latitude": -10.9, "gps_longitude": 28.1}
+        assert resolver.check_address({**gps, "district_code": "lp05"})[1] == []
+        _, problems = resolver.check_address({**gps, "district_code": "LP06", "chiefdom_code": "LP06-001"})
+        assert problems == [
+            "GPS coordinates lie in district LP05 (Kawambwa District), not LP06",
+            "GPS coordinates lie in chiefdom LP05-002, not LP06-001",
+        ]
+        assert resolver.check_address({"gps_latitude": -5.0, "gps_longitude": 28.5})[1] == [
+            "GPS coordinates are outside all known district boundaries"
+        ]
+        assert resolver.check_address({"district_code": "LP06"}) == (None, [])
+
+    def test_missing_fields(self, resolver):
+        address = {"gps_latitude": -10.9, "gps_longitude": 28.1, "district_code": "LP05", "chiefdom_code": ""}
+        resolved, _ = resolver.check_address(address)
+        assert resolver.missing_fields(address, resolved) == {
+            "province_code": "LP",
+            "district_name": "Kawambwa District",
+            "chiefdom_code": "LP05-002",
+            "chiefdom_name": "Chief Chama",
+        }
+
+    def test_nothing_loaded(self):
+        resolver = BoundaryResolver(cell_degrees=0.1)
+        assert resolver.resolve(lat=-10.9, lon=28.1) is None
+        assert resolver.check_address({"gps_latitude": -10.9, "gps_longitude": 28.1}) == (None, [])
@@ -0,0 +1,163 @@
+"""
+Tests for custom geographic entry naming and code allocation.
+"""
+import pytest
+
+from app.services.geo_custom_service import (
+    GeoCustomService,
+    chiefdom_code,
+    district_code,
+    normalize_geo_name,
+    province_code,
+    province_code_prefix,
+)
+
+
+class FakeCounters:
+    """find_one_and_update / update_one on {_id, seq} documents"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        doc = self.docs.get(query["_id"])
+        if doc is None and not upsert:
+            return None
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"], "seq": 0})
+        doc["seq"] += update["$inc"]["seq"]
+        return dict(doc)
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"], "seq": 0})
+        doc["seq"] = max(doc["seq"], update["$max"]["seq"])
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs = sorted(self.docs, key=lambda d: d[field], reverse=direction < 0)
+        return self
+
+    async def to_list(self, length=None):
+        return [dict(d) for d in self.docs]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield dict(doc)
+
+
+class FakeGeoCollection:
+    """Backfill reads: entries with a string name_key, or every entry (service filters)"""
+
+    def __init__(self, docs=None):
+        self.docs = [dict(d) for d in docs or []]
+
+    def find(self, query, projection=None):
+        if query == {"name_key": {"$type": "string"}}:
+            return FakeCursor([d for d in self.docs if isinstance(d.get("name_key"), str)])
+        return FakeCursor(self.docs)
+
+    async def update_one(self, query, update):
+        doc = next(d for d in self.docs if d["_id"] == query["_id"])
+        doc.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+
+    def by_id(self, _id):
+        return next(d for d in self.docs if d["_id"] == _id)
+
+
+class FakeDb:
+    def __init__(self, provinces=None, districts=None, chiefdoms=None):
+        self.counters = FakeCounters()
+        self.provinces = FakeGeoCollection(provinces)
+        self.districts = FakeGeoCollection(districts)
+        self.chiefdoms = FakeGeoCollection(chiefdoms)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+class TestNaming:
+    """Test name normalization and code formats."""
+
+    def test_normalize_geo_name(self):
+        assert normalize_geo_name("  Mansa   District ") == "mansa district"
+        assert normalize_geo_name("MANSA district") == normalize_geo_name("Mansa District")
+
+    def test_codes(self):
+        assert province_code_prefix("Luapula Province") == "LP"
+        assert province_code_prefix("Luapula") == "LX"
+        assert [province_code("LP", seq) for seq in (1, 2, 3)] == ["LP", "LP1", "LP2"]
+        assert district_code("LP", 6) == "LP06"
+        assert chiefdom_code("LP05", 4) == "LP05-004"
+
+
+class TestNextSequence:
+    """Test atomic sequence allocation."""
+
+    @pytest.mark.asyncio
+    async def test_new_sequence_starts_after_existing_entries(self):
+        service = GeoCustomService(FakeDb())
+        floor_calls = []
+
+        async def floor():
+            floor_calls.append(1)
+            return 4
+
+        assert await service.next_sequence("geo_code:district:LP", floor) == 5
+        assert await service.next_sequence("geo_code:district:LP", floor) == 6
+        assert len(floor_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_sequences_are_independent(self):
+        service = GeoCustomService(FakeDb())
+
+        async def floor():
+            return 0
+
+        assert await service.next_sequence("geo_code:district:LP", floor) == 1
+        assert await service.next_sequence("geo_code:district:CP", floor) == 1
+
+
+class TestBackfillNameKeys:
+    """Test name_key / parent code backfill of seeded entries."""
+
+    @pytest.mark.asyncio
+    async def test_sets_keys_and_upper_cases_parents(self):
+        db = FakeDb(
+            provinces=[{"_id": 1, "province_name": " Luapula  Province"}],
+            chiefdoms=[{"_id": 1, "chief_name": "Chama", "district_id": "lp05"}],
+        )
+        assert await GeoCustomService(db).backfill_name_keys() == 2
+        assert db.provinces.by_id(1)["name_key"] == "luapula province"
+        assert db.chiefdoms.by_id(1) == {"_id": 1, "chief_name": "Chama", "district_id": "LP05", "name_key": "chama"}
+        assert await GeoCustomService(db).backfill_name_keys() == 0
+
+    @pytest.mark.asyncio
+    async def test_later_duplicates_get_no_key(self):
+        db = FakeDb(districts=[
+            {"_id": 1, "district_name": "Mansa", "province_id": "LP"},
+            {"_id": 2, "district_name": "MANSA ", "province_id": "lp"},
+            {"_id": 3, "district_name": "Mansa", "province_id": "CP"},
+        ])
+        await GeoCustomService(db).backfill_name_keys()
+        assert db.districts.by_id(1)["name_key"] == "mansa"
+        assert "name_key" not in db.districts.by_id(2)
+        assert db.districts.by_id(2)["province_id"] == "LP"
+        assert db.districts.by_id(3)["name_key"] == "mansa"
+
+    @pytest.mark.asyncio
+    async def test_existing_key_duplicated_by_parent_case_is_removed(self):
+        db = FakeDb(chiefdoms=[
+            {"_id": 1, "chiefdom_name": "Chama", "district_id": "LP05", "name_key": "chama"},
+            {"_id": 2, "chiefdom_name": "Chama", "district_id": "lp05", "name_key": "chama"},
+        ])
+        await GeoCustomService(db).backfill_name_keys()
+        assert db.chiefdoms.by_id(1)["name_key"] == "chama"
+        assert db.chiefdoms.by_id(2) == {"_id": 2, "chiefdom_name": "Chama", "district_id": "LP05"}
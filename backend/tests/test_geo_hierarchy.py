@@ -0,0 +1,62 @@
+"""
+Tests for the geographic hierarchy builder and content-hash ETags.
+"""
+from app.services.geo_store import build_geo_hierarchy
+from app.utils.etag import content_etag, etag_matches
+
+
+PROVINCES = [
+    {"_id": 1, "province_id": "CP", "province_name": "Central Province"},
+    {"_id": 2, "province_id": "LP", "province_name": "Luapula Province"},
+    {"_id": 3, "province_name": "No Code Province"},
+]
+DISTRICTS = [
+    {"_id": 4, "district_id": "CP01", "district_name": "Kabwe District", "province_id": "CP"},
+    {"_id": 5, "district_id": "LP05", "district_name": "Kawambwa District", "province_id": "LP"},
+    {"_id": 6, "district_id": "LP06", "district_name": "Mansa District", "province_id": "LP"},
+    {"_id": 7, "district_name": "No Code District", "province_id": "LP"},
+]
+CHIEFDOMS = [
+    {"_id": 8, "chiefdom_id": "LP05-002", "chief_name": "Chief Chama", "district_id": "lp05"},
+    {"_id": 9, "chiefdom_id": "LP05-003", "chiefdom_name": "Chief Nkuba", "district_id": "LP05"},
+    {"_id": 10, "chiefdom_id": "XX01-001", "chiefdom_name": "Orphan", "district_id": "XX01"},
+]
+
+
+class TestBuildGeoHierarchy:
+    """Test the one-pass hierarchy builder."""
+
+    def test_nesting_and_order(self):
+        provinces = build_geo_hierarchy(PROVINCES, DISTRICTS, CHIEFDOMS)["provinces"]
+        assert [p["province_code"] for p in provinces] == ["CP", "LP"]
+        luapula = provinces[1]
+        assert [d["district_code"] for d in luapula["districts"]] == ["LP05", "LP06"]
+        assert luapula["districts"][1]["chiefdoms"] == []
+
+    def test_chiefdoms_match_districts_case_insensitively(self):
+        luapula = build_geo_hierarchy(PROVINCES, DISTRICTS, CHIEFDOMS)["provinces"][1]
+        chiefdoms = luapula["districts"][0]["chiefdoms"]
+        assert [c["chiefdom_code"] for c in chiefdoms] == ["LP05-002", "LP05-003"]
+        # Legacy chief_name is exposed as chiefdom_name; _id is dropped
+        assert chiefdoms[0]["chiefdom_name"] == "Chief Chama"
+        assert "_id" not in chiefdoms[0]
+
+    def test_empty_input(self):
+        assert build_geo_hierarchy([], [], []) == {"provinces": []}
+
+
+class TestEtag:
+    """Test ETag generation and If-None-Match matching."""
+
+    def test_etag_follows_content(self):
+        assert content_etag(b"a") == content_etag(b"a")
+        assert content_etag(b"a") != content_etag(b"b")
+        assert content_etag(b"a").startswith('"')
+
+    def test_if_none_match(self):
+        etag = content_etag(b"body")
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
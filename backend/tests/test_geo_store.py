@@ -0,0 +1,136 @@
+"""
+Tests for the in-memory geographic reference store.
+"""
+import pytest
+
+from app.services.geo_store import GeoStore, build_snapshot
+
+
+PROVINCES = [{"_id": 1, "province_id": "LP", "province_name": "Luapula Province"}]
+DISTRICTS = [
+    {"_id": 2, "district_id": "LP05", "district_name": "Kawambwa District", "province_id": "LP"},
+    {"_id": 3, "district_id": "LP06", "district_name": "Mansa District", "province_id": "LP"},
+]
+CHIEFDOMS = [{"_id": 4, "chiefdom_id": "LP05-002", "chief_name": "Chief Chama", "district_id": "lp05"}]
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, *_):
+        return self
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = docs or []
+        self.reads = 0
+
+    def find(self, *_):
+        self.reads += 1
+        return FakeCursor(self.docs)
+
+    async def find_one(self, query):
+        return next((d for d in self.docs if d["_id"] == query["_id"]), None)
+
+    async def estimated_document_count(self):
+        return len(self.docs)
+
+
+class FakeDb:
+    """Just enough of a motor database for GeoStore"""
+
+    def __init__(self):
+        self.provinces = FakeCollection(PROVINCES)
+        self.districts = FakeCollection(DISTRICTS)
+        self.chiefdoms = FakeCollection(CHIEFDOMS)
+        self.counters = FakeCollection()
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBuildSnapshot:
+    """Test the indexes of a snapshot."""
+
+    def test_indexes_by_code_and_parent(self):
+        snapshot = build_snapshot(7, PROVINCES, DISTRICTS, CHIEFDOMS)
+        assert snapshot.version == 7
+        assert snapshot.provinces_by_code["LP"]["province_name"] == "Luapula Province"
+        assert [d["district_code"] for d in snapshot.districts_by_province["LP"]] == ["LP05", "LP06"]
+        assert snapshot.districts_by_code["LP06"]["district_name"] == "Mansa District"
+        # Chiefdoms are grouped by upper-cased district id, legacy names mapped
+        assert snapshot.chiefdoms_by_district["LP05"][0]["chiefdom_name"] == "Chief Chama"
+        assert snapshot.chiefdoms_by_code["LP05-002"]["district_code"] == "lp05"
+        assert snapshot.counts() == {"provinces": 1, "districts": 2, "chiefdoms": 1}
+
+    def test_hierarchy_is_prerendered(self):
+        snapshot = build_snapshot(0, PROVINCES, DISTRICTS, CHIEFDOMS)
+        assert snapshot.hierarchy_body.startswith('{"provinces":[{')
+        assert snapshot.hierarchy_etag == build_snapshot(1, PROVINCES, DISTRICTS, CHIEFDOMS).hierarchy_etag
+        assert snapshot.hierarchy_etag != build_snapshot(0, PROVINCES, DISTRICTS[:1], CHIEFDOMS).hierarchy_etag
+
+
+class TestGeoStore:
+    """Test loading and version-driven reloads."""
+
+    @pytest.mark.asyncio
+    async def test_loads_once_and_serves_from_memory(self):
+        db, clock = FakeDb(), FakeClock()
+        store = GeoStore(check_interval_seconds=30, clock=clock)
+        first = await store.get(db)
+        clock.now += 10
+        assert await store.get(db) is first
+        assert db.districts.reads == 1
+        assert store.version == 0
+
+    @pytest.mark.asyncio
+    async def test_reloads_when_stored_version_moves(self):
+        db, clock = FakeDb(), FakeClock()
+        store = GeoStore(check_interval_seconds=30, clock=clock)
+        first = await store.get(db)
+        db.counters.docs = [{"_id": "geo_version", "seq": 2}]
+
+        clock.now += 10  # not checked yet
+        assert await store.get(db) is first
+        clock.now += 30
+        reloaded = await store.get(db)
+        assert reloaded is not first
+        assert reloaded.version == 2
+        assert db.districts.reads == 2
+
+    @pytest.mark.asyncio
+    async def test_checked_snapshot_expires_with_check_interval(self):
+        db, clock = FakeDb(), FakeClock()
+        store = GeoStore(check_interval_seconds=30, clock=clock)
+        assert store.checked_snapshot() is None
+        first = await store.get(db)
+        assert store.checked_snapshot() is first
+        clock.now += 30  # another worker may have bumped it since
+        assert store.checked_snapshot() is None
+        await store.get(db)
+        assert store.checked_snapshot() is first
+
+    @pytest.mark.asyncio
+    async def test_reloads_when_counts_move_without_version_bump(self):
+        db, clock = FakeDb(), FakeClock()
+        store = GeoStore(check_interval_seconds=30, clock=clock)
+        first = await store.get(db)
+        db.districts.docs = db.districts.docs[:1]  # reseeded without bumping
+        clock.now += 30
+        reloaded = await store.get(db)
+        assert reloaded is not first
+        assert reloaded.version == first.version
+        assert reloaded.fingerprint != first.fingerprint
@@ -0,0 +1,61 @@
+"""
+Tests for the declarative index registry and drift detection.
+"""
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.indexes import INDEX_REGISTRY, diff_indexes
+
+
+class TestIndexRegistry:
+    """Test registry contents and drift comparison."""
+
+    def test_registry_covers_hot_lookups(self):
+        """farmer_id, nrc_hash, emails and operator_id must be unique."""
+        def unique_keys(collection):
+            return {
+                tuple(m.document["key"].keys())
+                for m in INDEX_REGISTRY[collection]
+                if m.document.get("unique")
+            }
+
+        assert ("farmer_id",) in unique_keys("farmers")
+        assert ("nrc_hash",) in unique_keys("farmers")
+        assert ("email",) in unique_keys("users")
+        assert ("email",) in unique_keys("operators")
+        assert ("operator_id",) in unique_keys("operators")
+
+    def test_no_drift_when_live_matches(self):
+        declared = [
+            IndexModel([("a", ASCENDING)], name="a_unique", unique=True),
+            IndexModel([("b", ASCENDING), ("c", DESCENDING)], name="b_c"),
+        ]
+        live = {
+            "_id_": {"v": 2, "key": [("_id", 1)]},
+            "a_unique": {"v": 2, "key": [("a", 1)], "unique": True},
+            "b_c": {"v": 2, "key": [("b", 1), ("c", -1)]},
+        }
+        assert diff_indexes(declared, live) == {"missing": [], "unexpected": [], "mismatched": []}
+
+    def test_reports_missing_unexpected_and_mismatched(self):
+        declared = [
+            IndexModel([("a", ASCENDING)], name="a_unique", unique=True),
+            IndexModel([("b", ASCENDING)], name="b"),
+        ]
+        live = {
+            "_id_": {"v": 2, "key": [("_id", 1)]},
+            "a_unique": {"v": 2, "key": [("a", 1)]},
+            "legacy_idx": {"v": 2, "key": [("z", 1)]},
+        }
+        assert diff_indexes(declared, live) == {
+            "missing": ["b"],
+            "unexpected": ["legacy_idx"],
+            "mismatched": ["a_unique"],
+        }
+
+    def test_2dsphere_index_matches_server_defaults(self):
+        declared = [m for m in INDEX_REGISTRY["farmers"] if m.document["name"] == "location_2dsphere"]
+        live = {
+            "_id_": {"v": 2, "key": [("_id", 1)]},
+            "location_2dsphere": {"v": 2, "key": [("location", "2dsphere")], "2dsphereIndexVersion": 3},
+        }
+        assert diff_indexes(declared, live) == {"missing": [], "unexpected": [], "mismatched": []}
@@ -0,0 +1,105 @@
+"""
+Tests for farmer GeoJSON locations and proximity query building.
+"""
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+from app.services.farmer_service import FarmerService
+from app.utils.location_utils import (
+    bbox_geometry,
+    build_location,
+    polygon_geometry,
+    within_geometry_match,
+    within_radius_stage,
+)
+
+
+class TestBuildLocation:
+    """Test GeoJSON points derived from address GPS fields."""
+
+    def test_point_is_lon_lat(self):
+        location = build_location({"gps_latitude": -11.2, "gps_longitude": 28.89})
+        assert location == {"type": "Point", "coordinates": [28.89, -11.2]}
+
+    @pytest.mark.parametrize("address", [
+        None,
+        {},
+        {"gps_latitude": -11.2},
+        {"gps_latitude": None, "gps_longitude": 28.89},
+        {"gps_latitude": "-11.2", "gps_longitude": "28.89"},
+        {"gps_latitude": float("nan"), "gps_longitude": 28.89},
+        {"gps_latitude": -95.0, "gps_longitude": 28.89},
+        {"gps_latitude": True, "gps_longitude": 28.89},
+    ])
+    def test_missing_or_invalid_coordinates(self, address):
+        assert build_location(address) is None
+
+
+class TestGeometries:
+    """Test polygon / bounding box validation and query stages."""
+
+    def test_polygon_is_closed(self):
+        geometry = polygon_geometry([[28.8, -11.3], [29.0, -11.3], [28.9, -11.1]])
+        ring = geometry["coordinates"][0]
+        assert geometry["type"] == "Polygon"
+        assert len(ring) == 4 and ring[0] == ring[-1]
+
+    def test_invalid_polygons(self):
+        with pytest.raises(ValueError):
+            polygon_geometry([[28.8, -11.3], [29.0, -11.3], [28.8, -11.3]])
+        with pytest.raises(ValueError):
+            polygon_geometry([[28.8, -11.3], [29.0, -11.3], [200.0, -11.1]])
+        # Four points, two of them distinct
+        with pytest.raises(ValueError):
+            polygon_geometry([[28.8, -11.3], [28.8, -11.3], [29.0, -11.3], [29.0, -11.3]])
+
+    def test_repeated_points_are_dropped(self):
+        ring = polygon_geometry([
+            [28.8, -11.3], [28.8, -11.3], [29.0, -11.3], [28.9, -11.1], [28.9, -11.1], [28.8, -11.3],
+        ])["coordinates"][0]
+        assert ring == [[28.8, -11.3], [29.0, -11.3], [28.9, -11.1], [28.8, -11.3]]
+
+    def test_bbox(self):
+        ring = bbox_geometry(28.7, -11.4, 29.1, -11.0)["coordinates"][0]
+        assert ring == [[28.7, -11.4], [29.1, -11.4], [29.1, -11.0], [28.7, -11.0], [28.7, -11.4]]
+        with pytest.raises(ValueError):
+            bbox_geometry(29.1, -11.4, 28.7, -11.0)
+
+    def test_query_stages(self):
+        stage = within_radius_stage(-11.2, 28.89, 5000, {"registration_status": "verified"})["$geoNear"]
+        assert stage["near"]["coordinates"] == [28.89, -11.2]
+        assert stage["maxDistance"] == 5000
+        assert stage["query"] == {"registration_status": "verified"}
+        assert "query" not in within_radius_stage(-11.2, 28.89, 5000)["$geoNear"]
+        geometry = bbox_geometry(28.7, -11.4, 29.1, -11.0)
+        assert within_geometry_match(geometry) == {"location": {"$geoWithin": {"$geometry": geometry}}}
+
+
+class TestGeoItem:
+    """Test proximity result items."""
+
+    def test_geo_item_from_projected_farmer(self):
+        item = FarmerService._to_geo_item({
+            "_id": ObjectId(),
+            "farmer_id": "ZM1A2B3C4D",
+            "created_at": datetime(2025, 1, 1),
+            "personal_info": {"first_name": "John", "last_name": "Zimba", "phone_primary": "0977000000"},
+            "address": {"district_name": "Mansa", "village": "Chisenga"},
+            "location": {"type": "Point", "coordinates": [28.89, -11.2]},
+            "distance_m": 1234.5,
+        })
+        assert (item.latitude, item.longitude, item.distance_m) == (-11.2, 28.89, 1234.5)
+        assert item.district_name == "Mansa"
+
+
+class TestAreaQueryErrors:
+    """Test that geometries MongoDB rejects surface as HTTP 400."""
+
+    def test_operation_failure_maps_to_400(self):
+        error = OperationFailure("Loop is not valid", code=2, details={"errmsg": "Loop is not valid: edges cross"})
+        exception = FarmerService._invalid_area(error)
+        assert exception.status_code == 400
+        assert "edges cross" in exception.detail
@@ -0,0 +1,108 @@
+"""
+Tests for the batched system log writer.
+"""
+import asyncio
+
+import pytest
+
+from app.services.log_writer import BatchedLogWriter
+
+
+class RecordingCollection:
+    """Collects insert_many batches in memory."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def insert_many(self, docs, ordered=True):
+        assert ordered is False
+        self.batches.append(list(docs))
+
+
+class FailingCollection:
+    async def insert_many(self, docs, ordered=True):
+        raise RuntimeError("database unavailable")
+
+
+def make_writer(collection, **kwargs):
+    return BatchedLogWriter(collection_resolver=lambda: collection, **kwargs)
+
+
+class TestBatchedLogWriter:
+    """Test batching, overflow policies and shutdown flush."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_by_count(self):
+        collection = RecordingCollection()
+        writer = make_writer(collection, batch_size=3, flush_interval=60)
+        await writer.start()
+        for i in range(3):
+            await writer.submit({"n": i})
+        await asyncio.sleep(0.01)
+        assert [len(b) for b in collection.batches] == [3]
+        await writer.stop()
+        assert writer.counters["flushed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_flushes_by_time(self):
+        collection = RecordingCollection()
+        writer = make_writer(collection, batch_size=100, flush_interval=0.01)
+        await writer.start()
+        await writer.submit({"n": 1})
+        await asyncio.sleep(0.05)
+        assert collection.batches == [[{"n": 1}]]
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_remaining_entries(self):
+        collection = RecordingCollection()
+        writer = make_writer(collection, batch_size=2, flush_interval=60)
+        await writer.start()
+        for i in range(5):
+            await writer.submit({"n": i})
+        await writer.stop()
+        assert sum(len(b) for b in collection.batches) == 5
+        assert all(len(b) <= 2 for b in collection.batches)
+        assert writer.stats()["queued"] == 0
+        assert writer.is_running is False
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_when_full(self):
+        collection = RecordingCollection()
+        writer = make_writer(collection, max_queue_size=2, batch_size=10, flush_interval=60)
+        await writer.start()
+        for i in range(4):
+            assert await writer.submit({"n": i}) is True
+        await writer.stop()
+        assert collection.batches == [[{"n": 2}, {"n": 3}]]
+        assert writer.counters["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_block_policy_drops_new_entry_after_timeout(self):
+        writer = make_writer(
+            FailingCollection(),
+            max_queue_size=1,
+            batch_size=10,
+            flush_interval=60,
+            overflow_policy="block",
+            enqueue_timeout=0.01,
+        )
+        # Not started: nothing drains the queue
+        writer._wakeup = asyncio.Event()
+        writer._space = asyncio.Event()
+        assert await writer.submit({"n": 1}) is True
+        assert await writer.submit({"n": 2}) is False
+        assert writer.counters["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_counted(self):
+        writer = make_writer(FailingCollection(), batch_size=10, flush_interval=60)
+        await writer.start()
+        await writer.submit({"n": 1})
+        await writer.stop()
+        assert writer.counters["failed"] == 1
+        assert writer.counters["flushed"] == 0
+
+    def test_rejects_unknown_policy(self):
+        with pytest.raises(ValueError):
+            BatchedLogWriter(overflow_policy="drop_newest")
@@ -0,0 +1,83 @@
+"""
+Tests for the pure ASGI request logging middleware.
+"""
+import json
+
+import pytest
+
+from app.middleware import logging_middleware
+from app.middleware.logging_middleware import LoggingMiddleware
+from app.services.logging_service import sanitize_body_prefix
+
+
+class TestSanitizeBodyPrefix:
+    """Test redaction of captured body prefixes."""
+
+    def test_complete_json_is_sanitized(self):
+        body = json.dumps({"email": "a@test.com", "password": "secret"}).encode()
+        assert sanitize_body_prefix(body) == {"email": "a@test.com", "password": "***REDACTED***"}
+
+    def test_truncated_prefix_is_masked(self):
+        sanitized = sanitize_body_prefix(b'{"email": "a@test.com", "password": "sec', truncated=True)
+        assert "sec" not in sanitized["prefix"]
+        assert sanitized["truncated"] is True
+
+    def test_empty_body(self):
+        assert sanitize_body_prefix(b"") == {}
+
+
+class TestLoggingMiddleware:
+    """Test that bodies stream through untouched and only a prefix is logged."""
+
+    @pytest.mark.asyncio
+    async def test_body_streams_through_and_prefix_is_captured(self, monkeypatch):
+        events = []
+
+        async def fake_log_event(**kwargs):
+            events.append(kwargs)
+
+        monkeypatch.setattr(logging_middleware, "log_event", fake_log_event)
+
+        chunks = [b'{"name": "', b"x" * 50, b'"}']
+        received = []
+
+        async def app(scope, receive, send):
+            while True:
+                message = await receive()
+                received.append(message["body"])
+                if not message.get("more_body"):
+                    break
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        messages = [
+            {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+            for i, chunk in enumerate(chunks)
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = LoggingMiddleware(app, sample_bytes=16, sample_rate=1.0)
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/farmers",
+            "headers": [(b"content-type", b"application/json")],
+            "client": ("127.0.0.1", 1234),
+        }
+        await middleware(scope, receive, send)
+
+        assert received == chunks
+        assert sent[0]["status"] == 201
+        request_log = next(e for e in events if e["action"] == "request")
+        response_log = next(e for e in events if e["action"] == "response")
+        assert request_log["details"]["body"]["truncated"] is True
+        assert len(request_log["details"]["body"]["prefix"]) == 16
+        assert response_log["details"]["status_code"] == 201
+        assert response_log["duration_ms"] >= 0
@@ -0,0 +1,55 @@
+"""
+Tests for the single-aggregation operator performance report.
+"""
+from datetime import datetime
+
+from app.routes.reports import format_operator_performance, operator_performance_pipeline
+
+
+CUTOFF = datetime(2025, 1, 1)
+
+
+class TestOperatorPerformancePipeline:
+    """Test the pipeline shape and row formatting."""
+
+    def test_no_window_starts_with_group(self):
+        pipeline = operator_performance_pipeline(CUTOFF)
+        assert "$group" in pipeline[0]
+        lookups = [stage["$lookup"]["from"] for stage in pipeline if "$lookup" in stage]
+        assert lookups == ["operators", "users"]
+
+    def test_window_adds_match(self):
+        start, end = datetime(2024, 1, 1), datetime(2024, 7, 1)
+        pipeline = operator_performance_pipeline(CUTOFF, start, end)
+        assert pipeline[0] == {"$match": {"created_at": {"$gte": start, "$lt": end}}}
+
+        pipeline = operator_performance_pipeline(CUTOFF, start_date=start)
+        assert pipeline[0] == {"$match": {"created_at": {"$gte": start}}}
+
+    def test_operator_row(self):
+        row = {
+            "_id": "op@example.com",
+            "total_farmers": 5,
+            "recent_farmers": 2,
+            "operator": {"full_name": "Op One", "email": "op@example.com"},
+            "user": {"email": "op@example.com"},
+        }
+        assert format_operator_performance(row) == {
+            "operator_id": "op@example.com",
+            "operator_name": "Op One",
+            "email": "op@example.com",
+            "total_farmers": 5,
+            "recent_farmers_30d": 2,
+        }
+
+    def test_admin_user_row(self):
+        row = {"_id": "admin@example.com", "total_farmers": 1, "recent_farmers": 0, "user": {"email": "admin@example.com"}}
+        out = format_operator_performance(row)
+        assert out["operator_name"] == "Admin User"
+        assert out["email"] == "admin@example.com"
+
+    def test_unknown_creator_falls_back_to_email(self):
+        row = {"_id": "gone@example.com", "total_farmers": 1, "recent_farmers": 1}
+        out = format_operator_performance(row)
+        assert out["operator_name"] == "gone@example.com"
+        assert out["email"] == "gone@example.com"
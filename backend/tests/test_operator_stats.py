@@ -0,0 +1,69 @@
+"""
+Tests for the batched per-operator statistics used by GET /api/operators.
+"""
+from datetime import datetime
+
+from app.routes.operators import assemble_operator_stats, operator_stats_pipeline
+
+
+CUTOFF = datetime(2025, 1, 1)
+
+OPERATORS = [
+    {"operator_id": "OP1", "assigned_districts": ["Mansa", "Kawambwa"]},
+    {"operator_id": "OP2", "assigned_districts": ["Mansa"]},
+    {"operator_id": "OP3", "assigned_districts": []},
+]
+
+
+def row(district, creator, farmers, recent, land):
+    return {"_id": {"district": district, "creator": creator}, "farmers": farmers, "recent": recent, "total_land": land}
+
+
+class TestOperatorStatsPipeline:
+    """Test the single aggregation for a page of operators."""
+
+    def test_matches_districts_and_creators_once(self):
+        pipeline = operator_stats_pipeline(OPERATORS, CUTOFF)
+        assert len(pipeline) == 2
+        assert pipeline[0]["$match"]["$or"] == [
+            {"address.district_name": {"$in": ["Kawambwa", "Mansa"]}},
+            {"created_by": {"$in": ["OP3"]}},
+        ]
+
+    def test_no_operators_needs_no_query(self):
+        assert operator_stats_pipeline([], CUTOFF) == []
+
+
+class TestAssembleOperatorStats:
+    """Test per-operator sums over the grouped rows."""
+
+    def test_district_and_creator_scopes(self):
+        rows = [
+            row("Mansa", None, 4, 1, 10.0),
+            row("Mansa", "OP3", 1, 1, 2.0),
+            row("Kawambwa", None, 2, 0, 6.0),
+            row(None, "OP3", 3, 2, 3.0),
+        ]
+        stats = assemble_operator_stats(OPERATORS, rows)
+        assert stats["OP1"] == {
+            "farmer_count": 7,
+            "recent_registrations_30d": 2,
+            "total_land_hectares": 18.0,
+            "avg_land_hectares": 18.0 / 7,
+        }
+        assert stats["OP2"]["farmer_count"] == 5
+        assert stats["OP3"] == {
+            "farmer_count": 4,
+            "recent_registrations_30d": 3,
+            "total_land_hectares": 5.0,
+            "avg_land_hectares": 1.25,
+        }
+
+    def test_operator_without_farmers(self):
+        stats = assemble_operator_stats([{"operator_id": "OP9", "assigned_districts": None}], [])
+        assert stats["OP9"] == {
+            "farmer_count": 0,
+            "recent_registrations_30d": 0,
+            "total_land_hectares": 0,
+            "avg_land_hectares": 0,
+        }
@@ -0,0 +1,63 @@
+"""
+Tests for keyset cursor pagination helpers.
+"""
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.utils.pagination import (
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    next_cursor_from,
+)
+
+
+class TestKeysetCursor:
+    """Test cursor encoding and keyset filters."""
+
+    def test_cursor_round_trip(self):
+        created_at = datetime(2025, 11, 17, 12, 0, 0, 123000)
+        oid = ObjectId()
+        assert decode_cursor(encode_cursor(created_at, oid)) == (created_at, oid)
+
+    def test_invalid_cursor_raises(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_apply_keyset_preserves_existing_or(self):
+        query = {"$or": [{"created_by": "OP1"}, {"address.district_name": {"$in": ["Mansa"]}}]}
+        position = (datetime(2025, 1, 1), ObjectId())
+        combined = apply_keyset(query, position)
+        assert combined["$and"][0] == query
+        assert "$or" in combined["$and"][1]
+        assert apply_keyset(query, None) is query
+
+    def test_next_cursor_only_for_full_pages(self):
+        docs = [{"_id": ObjectId(), "created_at": datetime(2025, 1, 1)} for _ in range(3)]
+        assert next_cursor_from(docs, 5) is None
+        assert decode_cursor(next_cursor_from(docs, 3)) == (docs[-1]["created_at"], docs[-1]["_id"])
+        assert next_cursor_from([{"_id": ObjectId(), "created_at": True}], 1) is None
+
+    @pytest.mark.parametrize("created_at", ["2024-01-01", "", 7, None])
+    def test_legacy_created_at_cursor_round_trip(self, created_at):
+        doc = {"_id": ObjectId(), "created_at": created_at}
+        assert decode_cursor(next_cursor_from([doc], 1)) == (created_at, doc["_id"])
+        # Missing created_at pages like null
+        missing = {"_id": ObjectId()}
+        assert decode_cursor(next_cursor_from([missing], 1)) == (None, missing["_id"])
+
+    def test_keyset_continues_into_legacy_values(self):
+        oid = ObjectId()
+        after_date = apply_keyset({}, (datetime(2025, 1, 1), oid))["$or"]
+        assert {"created_at": {"$type": "string"}} in after_date
+        assert {"created_at": {"$type": "number"}} in after_date
+        assert {"created_at": None} in after_date
+
+        after_string = apply_keyset({}, ("2024-01-01", oid))["$or"]
+        assert after_string[0] == {"created_at": {"$lt": "2024-01-01"}}
+        assert {"created_at": {"$type": "string"}} not in after_string
+        assert {"created_at": None} in after_string
+
+        assert apply_keyset({}, (None, oid)) == {"$or": [{"created_at": None, "_id": {"$lt": oid}}]}
@@ -0,0 +1,33 @@
+"""
+Tests for the authenticated principal cache (in-process tier).
+"""
+import pytest
+
+from app.services.principal_cache import PrincipalCache
+
+
+class TestPrincipalCache:
+    """Test caching, secret stripping and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_password_hash_is_never_cached(self):
+        cache = PrincipalCache()
+        await cache.set("admin@test.com", {"email": "admin@test.com", "password_hash": "secret"})
+        cached = await cache.get("admin@test.com")
+        assert cached == {"email": "admin@test.com"}
+
+    @pytest.mark.asyncio
+    async def test_get_returns_a_copy(self):
+        cache = PrincipalCache()
+        await cache.set("ZM1A2B3C4D", {"farmer_id": "ZM1A2B3C4D", "roles": ["FARMER"]})
+        (await cache.get("ZM1A2B3C4D")).pop("roles")
+        cached = await cache.get("ZM1A2B3C4D")
+        assert cached["roles"] == ["FARMER"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        cache = PrincipalCache()
+        await cache.set("op@test.com", {"email": "op@test.com"})
+        await cache.invalidate("op@test.com")
+        await cache.invalidate(None)
+        assert await cache.get("op@test.com") is None
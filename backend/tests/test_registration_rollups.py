@@ -0,0 +1,100 @@
+"""
+Tests for the registration rollup helpers.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.services.registration_rollups import (
+    day_start,
+    format_trend_row,
+    merge_rollup_changes,
+    rollup_changes,
+    rollup_key,
+    trend_pipeline,
+)
+
+
+FARMER = {
+    "created_at": datetime(2025, 3, 4, 17, 45),
+    "address": {"district_name": "Mansa District"},
+    "created_by": "op@example.com",
+}
+
+
+class TestRollupKey:
+    """Test bucket computation."""
+
+    def test_key(self):
+        assert rollup_key(FARMER) == {
+            "day": datetime(2025, 3, 4),
+            "district": "Mansa District",
+            "operator": "op@example.com",
+        }
+
+    def test_missing_fields(self):
+        key = rollup_key({"created_at": datetime(2025, 3, 4), "created_by": ""})
+        assert key["district"] == "unknown"
+        assert key["operator"] == "unknown"
+
+    def test_undated_farmer_has_no_bucket(self):
+        assert rollup_key({"address": {}}) is None
+        assert rollup_key(None) is None
+
+    def test_aware_timestamps_use_utc_day(self):
+        lusaka = timezone(timedelta(hours=2))
+        assert day_start(datetime(2025, 3, 5, 1, 0, tzinfo=lusaka)) == datetime(2025, 3, 4)
+
+
+class TestRollupChanges:
+    """Test increments for inserts, updates and deletes."""
+
+    def test_insert_and_delete(self):
+        key = rollup_key(FARMER)
+        assert rollup_changes(None, FARMER) == [(key, 1)]
+        assert rollup_changes(FARMER, None) == [(key, -1)]
+
+    def test_unrelated_update(self):
+        assert rollup_changes(FARMER, {**FARMER, "registration_status": "approved"}) == []
+
+    def test_district_move(self):
+        moved = {**FARMER, "address": {"district_name": "Kawambwa District"}}
+        changes = rollup_changes(FARMER, moved)
+        assert [inc for _, inc in changes] == [-1, 1]
+        assert changes[1][0]["district"] == "Kawambwa District"
+
+    def test_merged_changes_net_per_bucket(self):
+        unknown = {**FARMER, "address": {}}
+        moved = {**FARMER, "address": {"district_name": "Kawambwa District"}}
+        merged = merge_rollup_changes([(unknown, moved), (unknown, moved), (FARMER, FARMER)])
+        assert sorted((key["district"], inc) for key, inc in merged) == [("Kawambwa District", 2), ("unknown", -2)]
+        assert merge_rollup_changes([(None, FARMER), (FARMER, None)]) == []
+
+
+class TestTrendPipeline:
+    """Test range query construction."""
+
+    def test_range_is_inclusive(self):
+        match = trend_pipeline(date(2025, 1, 1), date(2025, 1, 31))[0]["$match"]
+        assert match["day"] == {"$gte": datetime(2025, 1, 1), "$lt": datetime(2025, 2, 1)}
+
+    def test_filters_and_group_by(self):
+        pipeline = trend_pipeline(
+            date(2025, 1, 1), date(2025, 1, 31), "month", group_by="operator", district="Mansa District"
+        )
+        assert pipeline[0]["$match"]["district"] == "Mansa District"
+        assert "operator" in pipeline[1]["$group"]["_id"]
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            trend_pipeline(date(2025, 1, 1), date(2025, 1, 2), "year")
+        with pytest.raises(ValueError):
+            trend_pipeline(date(2025, 1, 1), date(2025, 1, 2), group_by="status")
+
+    def test_format_row(self):
+        row = {"_id": {"period": datetime(2025, 3, 3), "district": "Mansa District"}, "registrations": 7}
+        assert format_trend_row(row) == {
+            "period": "2025-03-03",
+            "district": "Mansa District",
+            "registrations": 7,
+        }
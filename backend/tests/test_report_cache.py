@@ -0,0 +1,96 @@
+"""
+Tests for the tag-invalidated report cache (in-process tier).
+"""
+import pytest
+
+from app.services.report_cache import FARMERS, USERS, ReportCache, cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Counter:
+    """compute() stand-in that counts calls and can be made to fail"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.calls += 1
+        return {"total": self.calls}
+
+
+def make_cache(clock):
+    return ReportCache(ttl_seconds=60, stale_seconds=600, max_entries=16, redis_enabled=False, clock=clock)
+
+
+class TestCacheKey:
+    """Test key derivation."""
+
+    def test_key_depends_on_params_and_scope(self):
+        base = cache_key("reports.x", {"days": 14}, "ADMIN")
+        assert base == cache_key("reports.x", {"days": 14}, "ADMIN")
+        assert base != cache_key("reports.x", {"days": 30}, "ADMIN")
+        assert base != cache_key("reports.x", {"days": 14}, "OPERATOR")
+        assert base.startswith("reports.x:")
+
+
+class TestReportCache:
+    """Test hits, tag invalidation, expiry and stale serving."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_cached(self):
+        clock, compute = FakeClock(), Counter()
+        cache = make_cache(clock)
+        first, meta = await cache.get_or_compute("r", compute, tags=(FARMERS,))
+        second, meta2 = await cache.get_or_compute("r", compute, tags=(FARMERS,))
+        assert first == second == {"total": 1}
+        assert not meta.cached and meta2.cached
+        assert meta.generated_at == meta2.generated_at
+        assert meta2.as_fields()["stale"] is False
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation(self):
+        clock, compute = FakeClock(), Counter()
+        cache = make_cache(clock)
+        await cache.get_or_compute("r", compute, tags=(FARMERS,))
+        await cache.invalidate_tags(USERS)
+        assert (await cache.get_or_compute("r", compute, tags=(FARMERS,)))[0] == {"total": 1}
+        await cache.invalidate_tags(FARMERS)
+        assert (await cache.get_or_compute("r", compute, tags=(FARMERS,)))[0] == {"total": 2}
+
+    @pytest.mark.asyncio
+    async def test_entries_expire(self):
+        clock, compute = FakeClock(), Counter()
+        cache = make_cache(clock)
+        await cache.get_or_compute("r", compute)
+        clock.now += 60
+        result, meta = await cache.get_or_compute("r", compute)
+        assert result == {"total": 2}
+        assert not meta.cached
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_when_recompute_fails(self):
+        clock, compute = FakeClock(), Counter()
+        cache = make_cache(clock)
+        await cache.get_or_compute("r", compute, tags=(FARMERS,))
+        await cache.invalidate_tags(FARMERS)
+        compute.fail = True
+        result, meta = await cache.get_or_compute("r", compute, tags=(FARMERS,))
+        assert result == {"total": 1}
+        assert meta.stale
+
+    @pytest.mark.asyncio
+    async def test_failure_without_entry_raises(self):
+        compute = Counter()
+        compute.fail = True
+        with pytest.raises(RuntimeError):
+            await make_cache(FakeClock()).get_or_compute("r", compute)
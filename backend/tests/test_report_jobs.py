@@ -0,0 +1,147 @@
+"""
+Tests for background report jobs: request fingerprints and file writers.
+"""
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.report_jobs import REPORT_JOBS_COLLECTION, job_fingerprint
+from app.tasks import report_tasks
+from app.services.report_writers import write_report
+
+
+COLUMNS = ["farmer_id", "full_name", "district"]
+
+
+def batches(total, size):
+    rows = [{"farmer_id": f"ZM{i:04d}", "full_name": f"Farmer {i}", "district": "Mansa"} for i in range(total)]
+    for start in range(0, total, size):
+        yield rows[start:start + size]
+
+
+class TestJobFingerprint:
+    """Test de-duplication keys."""
+
+    def test_identical_requests_match(self):
+        filters = {"district": "Mansa", "status": None}
+        assert job_fingerprint("farmers_details", "csv", filters) == job_fingerprint(
+            "farmers_details", "csv", {"status": None, "district": "Mansa"}
+        )
+
+    def test_format_and_filters_differ(self):
+        base = job_fingerprint("farmers_details", "csv", {"district": "Mansa"})
+        assert base != job_fingerprint("farmers_details", "pdf", {"district": "Mansa"})
+        assert base != job_fingerprint("farmers_details", "csv", {"district": "Kasama"})
+
+
+class TestReportWriters:
+    """Test CSV / PDF / XLSX output."""
+
+    def test_csv_rows_and_progress(self):
+        fh, seen = io.BytesIO(), []
+        count = write_report("csv", fh, COLUMNS, batches(25, 10), progress=seen.append)
+        lines = fh.getvalue().decode("utf-8").splitlines()
+        assert count == 25
+        assert seen == [10, 20, 25]
+        assert lines[0] == "farmer_id,full_name,district"
+        assert lines[1] == "ZM0000,Farmer 0,Mansa"
+        assert len(lines) == 26
+        assert not fh.closed
+
+    def test_pdf_paginates(self):
+        fh = io.BytesIO()
+        count = write_report("pdf", fh, COLUMNS, batches(120, 50), title="Farmers")
+        assert count == 120
+        assert fh.getvalue().startswith(b"%PDF")
+
+    def test_xlsx(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        fh = io.BytesIO()
+        assert write_report("xlsx", fh, COLUMNS, batches(3, 2), title="Farmers") == 3
+        fh.seek(0)
+        sheet = openpyxl.load_workbook(fh).active
+        assert [cell.value for cell in sheet[1]] == COLUMNS
+        assert sheet.max_row == 4
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            write_report("docx", io.BytesIO(), COLUMNS, batches(1, 1))
+
+
+class FakeJobs:
+    """find_one_and_update / update_one on job documents keyed by _id and status"""
+
+    def __init__(self, job):
+        self.job = job
+
+    def _matches(self, query):
+        return all(self.job.get(field) == value for field, value in query.items())
+
+    def find_one_and_update(self, query, update, return_document=None):
+        if not self._matches(query):
+            return None
+        self.job.update(update["$set"])
+        return dict(self.job)
+
+    def update_one(self, query, update):
+        if not self._matches(query):
+            return SimpleNamespace(modified_count=0)
+        self.job.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            self.job.pop(field, None)
+        return SimpleNamespace(modified_count=1)
+
+
+class FakeGridFS:
+    def __init__(self):
+        self.files, self.deleted = {}, []
+
+    def upload_stream(self, source, filename, file_type, metadata=None):
+        file_id = f"file{len(self.files)}"
+        self.files[file_id] = source.read()
+        return file_id
+
+    def delete_file(self, file_id):
+        self.deleted.append(file_id)
+        return self.files.pop(file_id, None) is not None
+
+
+class TestGenerateReport:
+    """Test the Celery task against a job reclaimed as stale."""
+
+    @pytest.fixture
+    def run(self, monkeypatch):
+        def run(job, on_batch=None):
+            jobs, gridfs = FakeJobs(job), FakeGridFS()
+
+            def source(db, filters):
+                for batch in batches(4, 2):
+                    if on_batch:
+                        on_batch(jobs.job)
+                    yield batch
+
+            monkeypatch.setattr(report_tasks, "get_db_sync", lambda: {REPORT_JOBS_COLLECTION: jobs})
+            monkeypatch.setattr(report_tasks, "sync_gridfs_service", gridfs)
+            monkeypatch.setitem(report_tasks.REPORT_SOURCES, "test", ("Test", COLUMNS, source))
+            return report_tasks.generate_report.run(job["_id"]), jobs.job, gridfs
+        return run
+
+    def job(self):
+        return {"_id": "j1", "report": "test", "format": "csv", "filters": {}, "status": "queued", "active_key": "k"}
+
+    def test_done(self, run):
+        result, job, gridfs = run(self.job())
+        assert result["status"] == "done"
+        assert job["status"] == "done" and "active_key" not in job
+        assert list(gridfs.files) == [job["file_id"]]
+
+    def test_job_failed_as_stale_while_running_discards_file(self, run):
+        def fail_as_stale(job):
+            job.update(status="failed", error="No progress")
+            job.pop("active_key", None)
+
+        result, job, gridfs = run(self.job(), on_batch=fail_as_stale)
+        assert result["status"] == "discarded"
+        assert job["status"] == "failed" and "file_id" not in job
+        assert gridfs.files == {} and gridfs.deleted == ["file0"]
@@ -0,0 +1,153 @@
+"""
+Tests for the single-pass request pipeline middleware.
+"""
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.cache_policy import CachePolicy, CachePolicyRegistry
+from app.middleware.request_pipeline import RequestPipelineMiddleware
+
+
+def preflight_headers(request_headers):
+    return {"Access-Control-Allow-Origin": request_headers.get("origin") or "*"}
+
+
+def make_client(policies=None):
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.get("/api/items/{item_id}")
+    async def get_item(item_id: str):
+        app.state.calls += 1
+        if item_id == "missing":
+            raise HTTPException(status_code=404, detail="Item not found")
+        return {"item_id": item_id}
+
+    @app.get("/api/echo-id")
+    async def echo_id(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/static.txt")
+    async def static_file():
+        return {"ok": True}
+
+    @app.options("/api/echo-id")
+    async def options_handler():
+        return {"handled_by": "app"}
+
+    app.add_middleware(
+        RequestPipelineMiddleware,
+        preflight_headers=preflight_headers,
+        policies=policies or CachePolicyRegistry(),
+    )
+    return TestClient(app)
+
+
+class TestRequestPipeline:
+    """Test request ids, cache headers and the preflight short-circuit."""
+
+    def test_request_id_is_shared_with_handler(self):
+        response = make_client().get("/api/echo-id")
+        assert response.headers["X-Request-ID"] == response.json()["request_id"]
+        assert len(response.headers["X-Request-ID"]) == 8
+
+    def test_api_responses_are_not_cacheable(self):
+        response = make_client().get("/api/echo-id")
+        assert response.headers["Cache-Control"] == "no-store, no-cache, must-revalidate, max-age=0"
+        assert response.headers["Pragma"] == "no-cache"
+        assert response.headers["Vary"] == "Origin, Authorization"
+
+    def test_non_api_responses_keep_their_headers(self):
+        response = make_client().get("/static.txt")
+        assert "Cache-Control" not in response.headers
+        assert "X-Request-ID" in response.headers
+
+    def test_plain_options_is_short_circuited(self):
+        response = make_client().options("/api/echo-id")
+        assert response.status_code == 200
+        assert response.content == b""
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+        assert "X-Request-ID" in response.headers
+
+    def test_cors_preflight_is_passed_through(self):
+        response = make_client().options(
+            "/api/echo-id",
+            headers={"Origin": "http://localhost:5173", "Access-Control-Request-Method": "GET"},
+        )
+        assert response.json() == {"handled_by": "app"}
+
+
+class TestCachePolicies:
+    """Test per-route cache policies, ETags and 304 responses."""
+
+    def test_policy_template_matching(self):
+        registry = CachePolicyRegistry()
+        policy = CachePolicy(max_age=60)
+        registry.register("/api/items/{item_id}", policy)
+        registry.register("/api/geo/{path:path}", policy)
+        assert registry.match("GET", "/api/items/a") is policy
+        assert registry.match("GET", "/api/items/a/b") is None
+        assert registry.match("GET", "/api/geo/districts/LP05") is policy
+        assert registry.match("POST", "/api/items/a") is None
+
+    def test_none_policy_excludes_path(self):
+        registry = CachePolicyRegistry()
+        registry.register("/api/geo/version", None)
+        registry.register("/api/geo/{path:path}", CachePolicy(max_age=60))
+        assert registry.match("GET", "/api/geo/version") is None
+        assert registry.match("GET", "/api/geo/districts") is not None
+
+    def test_cache_control_header(self):
+        assert CachePolicy().cache_control() == "private, no-cache"
+        policy = CachePolicy(max_age=300, stale_while_revalidate=3600, private=False)
+        assert policy.cache_control() == "public, max-age=300, stale-while-revalidate=3600"
+
+    def test_content_etag_and_304(self):
+        registry = CachePolicyRegistry()
+        registry.register("/api/items/{item_id}", CachePolicy(max_age=60))
+        client = make_client(registry)
+
+        response = client.get("/api/items/a")
+        assert response.headers["Cache-Control"] == "private, max-age=60"
+        assert "Pragma" not in response.headers
+        etag = response.headers["ETag"]
+
+        revalidated = client.get("/api/items/a", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["ETag"] == etag
+        assert client.get("/api/items/b", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_version_etag_skips_handler(self):
+        registry = CachePolicyRegistry()
+        registry.register("/api/items/{item_id}", CachePolicy(max_age=60, version=lambda: "v1"))
+        client = make_client(registry)
+
+        response = client.get("/api/items/a")
+        assert response.headers["ETag"] == 'W/"v1"'
+        revalidated = client.get("/api/items/a", headers={"If-None-Match": 'W/"v1"'})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["Cache-Control"] == "private, max-age=60"
+        assert client.app.state.calls == 1
+
+    def test_unknown_version_runs_handler(self):
+        versions = [None]
+        registry = CachePolicyRegistry()
+        registry.register("/api/items/{item_id}", CachePolicy(max_age=60, version=lambda: versions[-1]))
+        client = make_client(registry)
+
+        # Not verified (e.g. stale check): no short-circuit, content ETag
+        response = client.get("/api/items/a", headers={"If-None-Match": 'W/"v1"'})
+        assert response.status_code == 200
+        assert not response.headers["ETag"].startswith("W/")
+        versions.append("v2")
+        assert client.get("/api/items/a", headers={"If-None-Match": 'W/"v1"'}).status_code == 200
+        assert client.app.state.calls == 2
+
+    def test_errors_stay_uncacheable(self):
+        registry = CachePolicyRegistry()
+        registry.register("/api/items/{item_id}", CachePolicy(max_age=60))
+        response = make_client(registry).get("/api/items/missing")
+        assert response.status_code == 404
+        assert response.headers["Cache-Control"] == "no-store, no-cache, must-revalidate, max-age=0"
+        assert "ETag" not in response.headers
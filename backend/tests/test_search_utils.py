@@ -0,0 +1,47 @@
+"""
+Tests for normalized farmer search keys.
+"""
+from app.utils.search_utils import (
+    build_search_fields,
+    build_search_match,
+    normalize_phone,
+    normalize_query,
+)
+
+
+class TestSearchKeys:
+    """Test search key normalization."""
+
+    def test_build_search_fields_nested(self):
+        fields = build_search_fields({
+            "farmer_id": "zm1a2b3c4d",
+            "personal_info": {
+                "first_name": "John Paul",
+                "last_name": "Zimba",
+                "phone_primary": "+260977000000",
+            },
+        })
+        assert fields["tokens"] == ["john", "paul", "zimba"]
+        assert fields["phone_digits"] == "977000000"
+        assert fields["farmer_id"] == "ZM1A2B3C4D"
+        assert "zm1a2b3c4d" in fields["keys"]
+
+    def test_build_search_fields_legacy_flat(self):
+        fields = build_search_fields({"first_name": "Mary", "phone_primary": "0966111222"})
+        assert fields["tokens"] == ["mary"]
+        assert fields["phone_digits"] == "966111222"
+
+    def test_phone_formats_normalize_together(self):
+        assert normalize_phone("+260977000000") == normalize_phone("0977000000") == "977000000"
+        assert normalize_query("0977") == normalize_query("+260977") == ["977"]
+
+    def test_short_terms_are_dropped(self):
+        assert normalize_query("j jo john 97") == ["john"]
+        assert normalize_query("a b") == []
+
+    def test_query_is_regex_escaped_and_anchored(self):
+        match = build_search_match(normalize_query("joh.*"))
+        assert match["search.keys"].pattern == "^joh"
+        assert build_search_match(["a+b"])["search.keys"].pattern == r"^a\+b"
+        multi = build_search_match(["john", "banda"])
+        assert [c["search.keys"].pattern for c in multi["$and"]] == ["^john", "^banda"]
@@ -0,0 +1,87 @@
+"""
+Tests for the $facet statistics query builder.
+"""
+import pytest
+
+from app.models.stats import RecentFarmer, SystemStats
+from app.services.stats_service import StatsQuery, StatsService
+
+
+class TestStatsQuery:
+    """Test pipeline compilation and result parsing."""
+
+    def test_pipeline_has_one_facet_per_metric(self):
+        query = (
+            StatsQuery("farmers", scope={"created_at": {"$gte": 0}})
+            .count("total")
+            .count("pending", match={"registration_status": "pending"})
+            .group_count("by_district", "address.district_name", limit=3)
+            .top("recent", {"created_at": -1}, 5, {"farmer_id": 1})
+        )
+        pipeline = query.pipeline()
+        assert pipeline[0] == {"$match": {"created_at": {"$gte": 0}}}
+        facets = pipeline[1]["$facet"]
+        assert set(facets) == {"total", "pending", "by_district", "recent"}
+        assert facets["pending"][0] == {"$match": {"registration_status": "pending"}}
+        assert facets["by_district"][-1] == {"$limit": 3}
+        assert facets["recent"] == [
+            {"$sort": {"created_at": -1}},
+            {"$limit": 5},
+            {"$project": {"farmer_id": 1}},
+        ]
+
+    def test_no_scope_means_no_match_stage(self):
+        assert StatsQuery("users").count("total").pipeline() == [
+            {"$facet": {"total": [{"$count": "count"}]}}
+        ]
+
+    def test_parse(self):
+        query = StatsQuery("farmers").count("total").group_count("by_status", "registration_status").top(
+            "recent", {"created_at": -1}, 2
+        )
+        parsed = query.parse({
+            "total": [{"count": 7}],
+            "by_status": [{"_id": "pending", "count": 4}, {"_id": "approved", "count": 3}],
+            "recent": [{"farmer_id": "ZM1"}],
+        })
+        assert parsed == {
+            "total": 7,
+            "by_status": [{"value": "pending", "count": 4}, {"value": "approved", "count": 3}],
+            "recent": [{"farmer_id": "ZM1"}],
+        }
+
+    def test_parse_empty_collection(self):
+        query = StatsQuery("farmers").count("total").group_count("by_status", "registration_status")
+        assert query.parse({"total": [], "by_status": []}) == {"total": 0, "by_status": []}
+        assert query.parse(None) == {"total": 0, "by_status": []}
+
+    def test_duplicate_metric_rejected(self):
+        with pytest.raises(ValueError):
+            StatsQuery("users").count("total").count("total")
+
+    @pytest.mark.asyncio
+    async def test_unknown_metric_rejected(self):
+        with pytest.raises(ValueError):
+            await StatsService(db=None).collect({"bogus"})
+
+
+class TestSystemStats:
+    """Test the typed stats object."""
+
+    def test_status_count_defaults_to_zero(self):
+        stats = SystemStats(farmers_by_status={"pending": 2}, generated_at="2025-01-01T00:00:00")
+        assert stats.status_count("pending") == 2
+        assert stats.status_count("approved") == 0
+
+    def test_recent_farmer_tolerates_missing_fields(self):
+        farmer = RecentFarmer.from_mongo({"personal_info": None, "address": {"district_name": None}})
+        assert farmer.farmer_id == "N/A"
+        assert farmer.name == "Unknown"
+        assert farmer.district == "N/A"
+
+    def test_recent_farmer_tolerates_legacy_created_at(self):
+        assert RecentFarmer.from_mongo({"created_at": ""}).created_at is None
+        assert RecentFarmer.from_mongo({"created_at": "not a date"}).created_at is None
+        assert RecentFarmer.from_mongo({"created_at": 1700000000}).created_at is None
+        parsed = RecentFarmer.from_mongo({"created_at": "2025-01-15T08:30:00Z"}).created_at
+        assert (parsed.year, parsed.month, parsed.day) == (2025, 1, 15)
@@ -0,0 +1,59 @@
+"""
+Tests for the bounded TTL cache.
+"""
+import pytest
+
+from app.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test expiry, LRU eviction and invalidation."""
+
+    def test_get_set(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=10)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert "a" in cache
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(max_entries=2, ttl_seconds=10, clock=clock)
+        cache.set("a", 1)
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(max_entries=2, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_invalidate_and_clear(self):
+        cache = TTLCache(max_entries=4, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        cache.invalidate("not-there")
+        assert "a" not in cache
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_rejects_empty_capacity(self):
+        with pytest.raises(ValueError):
+            TTLCache(max_entries=0)